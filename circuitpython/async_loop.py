@@ -0,0 +1,216 @@
+# SPDX-FileCopyrightText: 2025 Takuya Urakawa (@hsgw 5z6p.com)
+# SPDX-License-Identifier: MIT
+
+"""
+asyncio版メインループ
+エンコーダ・スイッチ・入力処理・モードの定期処理・HID出力・表示を別タスクに分け、キューでつなぐ
+表示の更新は入力とHIDのキューが空のときだけ行うので、入力処理が描画を待つことはない
+
+必要なライブラリ (libフォルダにコピー):
+- asyncio (フォルダ)
+- adafruit_ticks.mpy
+"""
+
+import asyncio
+import time
+
+from logger import log
+from mode_manager import SWITCH_EVENTS
+
+
+class Queue:
+    """asyncio.Event で待ち合わせる簡易キュー (CircuitPythonのasyncioにはQueueがない)"""
+
+    def __init__(self):
+        self.items = []
+        self.event = asyncio.Event()
+
+    def put(self, item):
+        self.items.append(item)
+        self.event.set()
+
+    async def get(self):
+        while not self.items:
+            self.event.clear()
+            await self.event.wait()
+        return self.items.pop(0)
+
+    def __len__(self):
+        return len(self.items)
+
+
+class QueuedKeyboard:
+    """
+    キーボードへの送信をHIDキューに積むプロキシ
+    モードからは通常の Keyboard と同じように使える
+    """
+
+    def __init__(self, keyboard):
+        self.keyboard = keyboard
+        self.queue = Queue()
+
+    def send(self, *keycodes):
+        # Keyboard.send は押下と解放の2レポートなので、HIDタスクが1レポートずつ送信間隔を待てるように分けて積む
+        self.queue.put(('press', keycodes))
+        self.queue.put(('release_all', ()))
+
+    def press(self, *keycodes):
+        self.queue.put(('press', keycodes))
+
+    def release(self, *keycodes):
+        self.queue.put(('release', keycodes))
+
+    def release_all(self):
+        self.queue.put(('release_all', ()))
+
+    def send_report(self, report):
+        # バースト送信のレポートはコピーして積む
+        self.queue.put(('send_report', (bytes(report),)))
+
+
+class AsyncLoop:
+    """タスク構成のメインループ"""
+
+    def __init__(self, encoder, switch_handler, mode_manager, keyboard, display=None,
+                 render_scheduler=None, encoder_accel=None, boot_profile=None, poll_interval=0.001):
+        """
+        Args:
+            encoder: rotaryio.IncrementalEncoder
+            switch_handler: SwitchHandler
+            mode_manager: ModeManager
+            keyboard: QueuedKeyboard (モードに渡したもの)
+            display: ディスプレイ (Noneなら表示タスクなし)
+            render_scheduler: RenderScheduler (Noneなら変更のたびに描画)
+            encoder_accel: EncoderAccelerator (Noneなら加速しない)
+            boot_profile: BootProfiler (最初の入力でレポートを出す)
+            poll_interval: エンコーダ/スイッチのポーリング間隔（秒）
+        """
+        self.encoder = encoder
+        self.switch_handler = switch_handler
+        self.mode_manager = mode_manager
+        self.keyboard = keyboard
+        self.display = display
+        self.render_scheduler = render_scheduler
+        self.encoder_accel = encoder_accel
+        self.boot_profile = boot_profile
+        self.poll_interval = poll_interval
+        # 入力イベントは ModeManager のキューに積む（処理が遅れたら同じ向きの回転はまとめられる）
+        self.input_ready = asyncio.Event()
+        self.display_dirty = asyncio.Event()
+        self.hid_waiting = False  # HID_REPORT_DELAY の待ち時間中
+
+        if display:
+            # 描画は表示タスクからだけ行う
+            display.auto_refresh = False
+
+    async def encoder_task(self):
+        last_position = self.encoder.position
+        while True:
+            position = self.encoder.position
+            if position != last_position:
+                delta = position - last_position
+                last_position = position
+                if self.encoder_accel:
+                    mode = self.mode_manager.current_mode
+                    delta = self.encoder_accel.apply(
+                        delta, time.monotonic(), mode.name if mode else None)
+                self.mode_manager.post('rotation', delta)
+                self.input_ready.set()
+            await asyncio.sleep(self.poll_interval)
+
+    async def switch_task(self):
+        while True:
+            event = self.switch_handler.update()
+            if event in SWITCH_EVENTS:
+                self.mode_manager.post(SWITCH_EVENTS[event])
+                self.input_ready.set()
+            await asyncio.sleep(self.poll_interval)
+
+    async def input_task(self):
+        mode_manager = self.mode_manager
+        while True:
+            await self.input_ready.wait()
+            self.input_ready.clear()
+            # 1イベントずつ処理し、HIDタスクなどに譲る
+            while mode_manager.dispatch(1):
+                self.display_dirty.set()
+                if self.boot_profile:
+                    self.boot_profile.finish()
+                    self.boot_profile = None
+                await asyncio.sleep(0)
+
+    async def mode_task(self):
+        # モードの定期処理（スニペットの送信など）
+        while True:
+            if self.mode_manager.update():
+                self.display_dirty.set()
+            await asyncio.sleep(0.01)
+
+    async def hid_task(self):
+        queue = self.keyboard.queue
+        keyboard = self.keyboard.keyboard
+        # HID_REPORT_DELAY の待ち時間は、ほかのタスクを止めないように await で待つ
+        # (キューの1操作は1レポートなので、PacedDevice.send_report の中では待たない)
+        device = keyboard._keyboard_device
+        paced = hasattr(device, 'wait_time')
+        while True:
+            op, keycodes = await queue.get()
+            if paced:
+                delay = device.wait_time()
+                if delay > 0:
+                    # 待っている間は表示タスクが描画してよい
+                    self.hid_waiting = True
+                    await asyncio.sleep(delay)
+                    self.hid_waiting = False
+                    # asyncio.sleep が少し早く起きても send_report で待ち直さない
+                    device.waited()
+            if op == 'send_report':
+                keyboard._keyboard_device.send_report(*keycodes)
+            else:
+                getattr(keyboard, op)(*keycodes)
+
+    async def display_task(self):
+        while True:
+            await self.display_dirty.wait()
+            # 入力とHIDの処理が残っていれば先に譲る
+            while self.mode_manager.pending() or (len(self.keyboard.queue) and not self.hid_waiting):
+                await asyncio.sleep(0)
+            if self.render_scheduler:
+                # フレーム間隔まで待つ（その間の変更はまとめて描画される）
+                delay = self.render_scheduler.time_until_frame()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                    continue
+                self.display_dirty.clear()
+                # HIDの送信待ちがあればアニメーションのフレームは捨てる
+                self.render_scheduler.service(busy=len(self.keyboard.queue) > 0)
+                if self.render_scheduler.animating:
+                    self.display_dirty.set()  # アニメーションの次のフレーム
+            else:
+                self.display_dirty.clear()
+                self.display.refresh()
+
+    async def log_task(self):
+        # 入力とHIDのキューが空のときだけログを出力する
+        while True:
+            if log.pending() and not self.mode_manager.pending() and not len(self.keyboard.queue):
+                log.flush(4)
+            await asyncio.sleep(0.05)
+
+    async def main(self):
+        tasks = [
+            asyncio.create_task(self.encoder_task()),
+            asyncio.create_task(self.switch_task()),
+            asyncio.create_task(self.input_task()),
+            asyncio.create_task(self.hid_task()),
+            asyncio.create_task(self.mode_task()),
+            asyncio.create_task(self.log_task()),
+        ]
+        if self.display:
+            # 起動時の画面を最初に描画する
+            self.display_dirty.set()
+            tasks.append(asyncio.create_task(self.display_task()))
+        await asyncio.gather(*tasks)
+
+    def run(self):
+        asyncio.run(self.main())
@@ -0,0 +1,82 @@
+# SPDX-FileCopyrightText: 2025 Takuya Urakawa (@hsgw 5z6p.com)
+# SPDX-License-Identifier: MIT
+
+"""
+次の文字の予測 (バイグラム)
+bigram.bin (host/build_bigram.py でコーパスから生成) の表で、入力した文字のあとに
+来やすい文字を引き、ダイヤルをどこに移動すれば次の文字までの回転が少ないかを決める
+"""
+
+from logger import log
+
+# このファイルと同じフォルダの bigram.bin を使う
+_BIGRAM_PATH = __file__[:__file__.rfind('/') + 1] + 'bigram.bin'
+
+NEXT_CHARS = 4  # 文字ごとの予測の数 (host/build_bigram.py と同じ)
+_ENTRY_SIZE = NEXT_CHARS * 2
+
+
+class Bigram:
+    """文字コード 0-127 ごとの (次の文字コード, 重み) x NEXT_CHARS の表"""
+
+    def __init__(self, table):
+        self.table = table
+
+    def predictions(self, char):
+        """
+        Returns:
+            list: 次に来やすい文字の (文字, 重み) 多い順
+        """
+        code = ord(char)
+        if code >= 128:
+            return []
+        table = self.table
+        result = []
+        for i in range(code * _ENTRY_SIZE, (code + 1) * _ENTRY_SIZE, 2):
+            if not table[i]:
+                break
+            result.append((chr(table[i]), table[i + 1]))
+        return result
+
+    def best_index(self, char, char_list):
+        """
+        char のあとにダイヤルを置く位置
+        予測した文字までの回転数の重み付き合計が一番少ない予測文字の位置
+        (円周上の重み付き中央値。1番目の予測が強ければそこ、割れていれば間の文字)
+
+        Returns:
+            int or None: char_list のインデックス（予測がなければNone）
+        """
+        positions = []
+        for next_char, weight in self.predictions(char):
+            if next_char in char_list:
+                positions.append((char_list.index(next_char), weight))
+        size = len(char_list)
+        best = None
+        best_cost = 0
+        for index, _ in positions:
+            cost = 0
+            for other, weight in positions:
+                distance = (other - index) % size
+                cost += weight * min(distance, size - distance)
+            if best is None or cost < best_cost:
+                best = index
+                best_cost = cost
+        return best
+
+
+def load_bigram(path=_BIGRAM_PATH):
+    """
+    Returns:
+        Bigram or None: 表が読めなければNone
+    """
+    try:
+        with open(path, 'rb') as f:
+            table = f.read()
+    except OSError as e:
+        log.warning("Bigram table disabled: %s", e)
+        return None
+    if len(table) != 128 * _ENTRY_SIZE:
+        log.warning("Bigram table disabled: bad size %d", len(table))
+        return None
+    return Bigram(table)
@@ -0,0 +1,104 @@
+# SPDX-FileCopyrightText: 2025 Takuya Urakawa (@hsgw 5z6p.com)
+# SPDX-License-Identifier: MIT
+
+"""
+起動時間のプロファイル
+code.py の各フェーズ（モジュールのインポート、ディスプレイ初期化など）の終了時刻と
+空きRAMを記録し、最初の入力を受け付けたときにまとめて出力する
+config は board を読み込むので、このモジュールでは読み込まない
+（board のインポートの時間を code.py の最初で測れるように）
+code.py が config を読み込んだあとに configure() で出力先を渡し、
+config.BOOT_PROFILE が None ならそれまでの記録を捨ててそれ以降は何も記録しない
+"""
+
+import gc
+import time
+
+
+def _mem_free():
+    mem_free = getattr(gc, 'mem_free', None)  # CPythonにはない
+    return mem_free() if mem_free else None
+
+
+class BootProfiler:
+    """フェーズごとの時刻と空きRAMの記録"""
+
+    def __init__(self):
+        # configure() までは記録するかわからないので、gc.collect() せずに記録する
+        self.enabled = True
+        self.configured = False
+        self.output = None
+        self.path = None
+        self.marks = []  # (フェーズ名, 電源投入からの時間[ns], 空きRAM)
+        self.overhead = 0  # 計測自体にかかった時間[ns]（記録する時刻から除く）
+        self.finished = False
+        self.mark("code.py start")
+
+    def configure(self, output, path, name="import config"):
+        """
+        出力先を設定し、config のインポートの終了を記録する
+
+        Args:
+            output: 'console', 'file', None (記録しない)
+            path: output='file' のときの出力先
+            name: 記録するフェーズ名
+        """
+        self.configured = True
+        self.output = output
+        self.path = path
+        if not output:
+            self.enabled = False
+            self.finished = True
+            self.marks = []
+            return
+        self.mark(name)
+
+    def mark(self, name):
+        """フェーズの終了を記録"""
+        if not self.enabled:
+            return
+        now = time.monotonic_ns()
+        if self.configured:
+            # 回収できるゴミを除いた空きRAMを測る
+            gc.collect()
+        mem = _mem_free()
+        self.marks.append((name, now - self.overhead, mem))
+        self.overhead += time.monotonic_ns() - now
+
+    def finish(self, name="first input"):
+        """最後のフェーズを記録してレポートを出力（2回目以降は何もしない）"""
+        if self.finished:
+            return
+        self.finished = True
+        self.mark(name)
+        lines = self.report_lines()
+        if self.output == 'file':
+            try:
+                with open(self.path, 'w') as f:
+                    for line in lines:
+                        f.write(line + "\n")
+                print("boot profile written to %s" % self.path)
+                return
+            except OSError as e:
+                # CIRCUITPY はboot.pyでremountしないと書き込めない
+                print("boot profile: cannot write %s (%s)" % (self.path, e))
+        for line in lines:
+            print(line)
+
+    def report_lines(self):
+        """レポートの各行"""
+        total = self.marks[-1][1] / 1000000
+        lines = [
+            "boot profile: %.1f ms from power-on to %s" % (total, self.marks[-1][0]),
+            "%-32s %9s %9s %9s %9s" % ("phase", "ms", "total ms", "free", "used"),
+        ]
+        prev_time = 0
+        prev_mem = None
+        for name, t, mem in self.marks:
+            used = "-" if mem is None or prev_mem is None else str(prev_mem - mem)
+            lines.append("%-32s %9.1f %9.1f %9s %9s" % (
+                name, (t - prev_time) / 1000000, t / 1000000,
+                "-" if mem is None else mem, used))
+            prev_time = t
+            prev_mem = mem
+        return lines
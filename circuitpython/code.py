@@ -31,82 +31,147 @@ XIAO RP2040 金庫ダイヤル風キーボード
 - adafruit_display_text (フォルダ)
 """
 
+# 起動時間のプロファイル (config を読み込んだあとに configure() し、BOOT_PROFILE が None なら何もしない)
+from boot_profile import BootProfiler
+boot = BootProfiler()
+
 import time
 import board
+boot.mark("import board")
+import busio
+boot.mark("import busio")
 import rotaryio
+boot.mark("import rotaryio")
 import displayio
+boot.mark("import displayio")
 import i2cdisplaybus
+boot.mark("import i2cdisplaybus")
 import usb_hid
+boot.mark("import usb_hid")
 from adafruit_displayio_sh1106 import SH1106
+boot.mark("import adafruit_displayio_sh1106")
 from adafruit_hid.keyboard import Keyboard
+boot.mark("import adafruit_hid.keyboard")
 
 # 自作モジュールのインポート
 from config import (
-    ENCODER_PIN_A, ENCODER_PIN_B, SWITCH_PIN,
-    KEYBOARD_LAYOUT, DISPLAY_WIDTH, DISPLAY_HEIGHT, I2C_ADDRESS
+    ENCODER_PIN_A, ENCODER_PIN_B, SWITCH_PIN, SWITCH_BACKEND, IMMEDIATE_SINGLE_CLICK,
+    DISPLAY_WIDTH, DISPLAY_HEIGHT, I2C_ADDRESS, I2C_FREQUENCY, INITIAL_MODE,
+    MAIN_LOOP, DISPLAY_FPS, ANIMATION_FRAME_BUDGET, ENCODER_ACCEL_CURVES, HID_REPORT_DELAY, HID_BURST_SIZE,
+    ANIMATION_INPUT_HOLDOFF,
+    TRACE_RECORDER_SIZE, TRACE_RECORDER_PATH,
+    POLL_INTERVAL_ACTIVE, POLL_INTERVAL_IDLE, POLL_BACKOFF_TIME, LIGHT_SLEEP_AFTER,
+    BOOT_PROFILE, BOOT_PROFILE_PATH
 )
-from switch_handler import SwitchHandler
-from mode_manager import ModeManager
-from switch_handler import SwitchHandler
-from mode_manager import ModeManager
-from modes import BasicMode, UtilityMode, JapaneseMode
+boot.configure(BOOT_PROFILE, BOOT_PROFILE_PATH)
+from switch_handler import SwitchHandler, KeypadSwitchHandler
+boot.mark("import switch_handler")
+from mode_manager import ModeManager, SWITCH_EVENTS
+boot.mark("import mode_manager")
+from render_scheduler import RenderScheduler
+boot.mark("import render_scheduler")
+from encoder_accel import EncoderAccelerator
+boot.mark("import encoder_accel")
+from poll_scheduler import PollScheduler
+boot.mark("import poll_scheduler")
+from logger import log
 
 
 # --- 初期化 ---
 
 # I2Cとディスプレイ
 displayio.release_displays()
+boot.mark("release_displays")
 
 try:
-    i2c = board.I2C()
+    # board.I2C() は 100kHz 固定なのでクロックを指定して作る
+    # displayio は変わった範囲（SH1106 では8行のページ単位）だけを転送する
+    i2c = busio.I2C(board.SCL, board.SDA, frequency=I2C_FREQUENCY)
     display_bus = i2cdisplaybus.I2CDisplayBus(i2c, device_address=I2C_ADDRESS)
     display = SH1106(display_bus, width=DISPLAY_WIDTH, height=DISPLAY_HEIGHT, colstart=2)
 except (ValueError, RuntimeError) as e:
     print(f"Error: ディスプレイが見つかりません。接続とI2Cアドレス({hex(I2C_ADDRESS)})を確認してください。")
     print(e)
     display = None
+boot.mark("display init")
 
 # ロータリーエンコーダ
 encoder = rotaryio.IncrementalEncoder(ENCODER_PIN_A, ENCODER_PIN_B)
 
+# エンコーダ加速
+encoder_accel = EncoderAccelerator(ENCODER_ACCEL_CURVES)
+
 # スイッチハンドラー
-switch_handler = SwitchHandler(SWITCH_PIN)
+if SWITCH_BACKEND == 'keypad':
+    switch_handler = KeypadSwitchHandler(SWITCH_PIN)
+else:
+    switch_handler = SwitchHandler(SWITCH_PIN)
+boot.mark("encoder/switch init")
 
 # USBキーボード
 keyboard = Keyboard(usb_hid.devices)
 
-# --- ディスプレイ表示の準備 ---
-main_group = None
+if HID_REPORT_DELAY:
+    # ホストが取りこぼさないようにレポートの間をあける
+    from hid_pacing import pace_keyboard
+    pace_keyboard(keyboard, HID_REPORT_DELAY, HID_BURST_SIZE)
 
-if display:
-    # 表示グループを作成（各モードがここにラベルを追加）
-    main_group = displayio.Group()
-    display.root_group = main_group
+if MAIN_LOOP == 'async':
+    # asyncio版ではHID送信をキュー経由にする
+    from async_loop import AsyncLoop, QueuedKeyboard
+    keyboard = QueuedKeyboard(keyboard)
+boot.mark("HID init")
 
 # --- 変数の準備 ---
 last_encoder_pos = 0
 encoder.position = 0  # エンコーダ位置を0にリセット
 
 # --- モードマネージャーの初期化 ---
-mode_manager = ModeManager(display, main_group)
-
-# 基本入力モードを追加
-basic_mode = BasicMode(keyboard, display, main_group)
-mode_manager.add_mode(basic_mode)
-
-# ユーティリティモードを追加
-utility_mode = UtilityMode(keyboard, display, main_group)
-mode_manager.add_mode(utility_mode)
-
-# 日本語入力モードを追加
-japanese_mode = JapaneseMode(keyboard, display, main_group)
-mode_manager.add_mode(japanese_mode)
+# 各モードは自分の表示グループを持ち、set_mode で display.root_group を切り替える
+mode_manager = ModeManager(display, keyboard)
+mode_manager.switch_handler = switch_handler
+mode_manager.immediate_click_enabled = IMMEDIATE_SINGLE_CLICK
+
+# 入力トレースの記録（リングバッファは起動時に確保）
+if TRACE_RECORDER_SIZE:
+    from trace_recorder import TraceRecorder
+    mode_manager.recorder = TraceRecorder(TRACE_RECORDER_SIZE, TRACE_RECORDER_PATH)
+
+# 描画スケジューラ（表示更新をフレーム単位にまとめ、カルーセルのスライドを進める）
+render_scheduler = None
+if display and DISPLAY_FPS:
+    render_scheduler = RenderScheduler(display, mode_manager.render, DISPLAY_FPS,
+                                       mode_manager.animate, ANIMATION_FRAME_BUDGET,
+                                       ANIMATION_INPUT_HOLDOFF)
+    mode_manager.render_scheduler = render_scheduler
+
+# モードを登録（最初に選ばれたときにインポートして作成）
+# menu=True のモードはユーティリティモードのメニューに並ぶ
+mode_manager.register_mode("Basic", "modes.basic_mode", "BasicMode")
+mode_manager.register_mode("Utility", "modes.utility_mode", "UtilityMode", menu=False)
+mode_manager.register_mode("Japanese", "modes.japanese_mode", "JapaneseMode")
+mode_manager.register_mode("Snippets", "modes.snippet_mode", "SnippetMode")
+if TRACE_RECORDER_SIZE:
+    mode_manager.register_mode("Trace", "modes.trace_mode", "TraceMode")
 
 # 初期モードを設定（ディスプレイレイアウトと状態も自動初期化）
-mode_manager.set_mode("Japanese")
+mode_manager.set_mode(INITIAL_MODE)
+boot.mark("initial mode")
 
 # --- メインループ ---
+if MAIN_LOOP == 'async':
+    AsyncLoop(encoder, switch_handler, mode_manager, keyboard, display, render_scheduler,
+              encoder_accel, boot).run()
+
+# ポーリング間隔（入力がなければ広げ、長く入力がなければライトスリープ）
+# digitalio のスイッチは押下をポーリングで見つけるので、間隔を10msより広げない
+poll_scheduler = PollScheduler(
+    POLL_INTERVAL_ACTIVE,
+    POLL_INTERVAL_IDLE if SWITCH_BACKEND == 'keypad' else min(POLL_INTERVAL_IDLE, 0.01),
+    POLL_BACKOFF_TIME, LIGHT_SLEEP_AFTER)
+
 while True:
+    busy = False
     current_encoder_pos = encoder.position
 
     # エンコーダの値が変化したかチェック
@@ -115,22 +180,52 @@ while True:
         delta = current_encoder_pos - last_encoder_pos
         last_encoder_pos = current_encoder_pos
         
-        # モードに回転を通知（モードが状態を更新）
-        mode_manager.handle_rotation(delta)
+        # 回転速度に応じて加速
+        now = time.monotonic()
+        mode = mode_manager.current_mode
+        delta = encoder_accel.apply(delta, now, mode.name if mode else None)
+        mode_manager.post('rotation', delta, now)
 
-    # スイッチイベントをチェック
+    # スイッチイベントをチェック（シングルクリック, ダブルクリック, 長押し）
     switch_event = switch_handler.update()
+    if switch_event in SWITCH_EVENTS:
+        mode_manager.post(SWITCH_EVENTS[switch_event])
+    
+    # 積んだイベントを現在のモードで処理（モードが状態を更新）
+    if mode_manager.dispatch():
+        busy = True
+        if boot:
+            # 最初の入力で一度だけ出力する
+            boot.finish()
+            boot = None
+        poll_scheduler.event(time.monotonic())
+    
+    # モードの定期処理（スニペットの送信など）
+    if mode_manager.update():
+        busy = True
     
-    if switch_event == 'timeout':
-        # シングルクリック
-        mode_manager.handle_single_click()
+    # 表示の更新（フレーム間隔ごと, まだ読んでいない回転があればアニメーションのフレームは捨てる）
+    if render_scheduler:
+        render_scheduler.service(busy=encoder.position != last_encoder_pos)
     
-    elif switch_event == 'double':
-        # ダブルクリック
-        mode_manager.handle_double_click()
+    # 入力がなかったときだけログを出力
+    if not busy and log.pending():
+        log.flush(4)
     
-    elif switch_event == 'long_press':
-        # 長押し
-        mode_manager.handle_long_press()
+    # 入力や処理中の仕事（クリックの判定待ち、描画待ちを含む）がなければポーリング間隔を広げる
+    now = time.monotonic()
+    if (busy or not switch_handler.is_idle()
+            or (render_scheduler and (render_scheduler.dirty or render_scheduler.animating))):
+        poll_scheduler.activity(now)
+    elif poll_scheduler.should_sleep(now):
+        # ピンを解放してアラームに使い、起きたら作り直す（起こした回転は入力されない）
+        encoder.deinit()
+        switch_handler.deinit()
+        poll_scheduler.light_sleep((ENCODER_PIN_A, ENCODER_PIN_B, SWITCH_PIN))
+        encoder = rotaryio.IncrementalEncoder(ENCODER_PIN_A, ENCODER_PIN_B)
+        last_encoder_pos = encoder.position
+        switch_handler.reinit()
+        poll_scheduler.ready()
+        continue
     
-    time.sleep(0.01)  # CPU負荷を軽減
+    time.sleep(poll_scheduler.interval(now))  # CPU負荷を軽減
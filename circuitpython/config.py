@@ -13,10 +13,87 @@ ENCODER_PIN_A = board.D9
 ENCODER_PIN_B = board.D10
 SWITCH_PIN = board.D7
 
+# --- スイッチ設定 ---
+SWITCH_BACKEND = 'keypad'  # 'keypad' (イベントキュー) または 'digitalio' (ループごとにポーリング)
+# ダブルクリックを区別しないモードではシングルクリックを待たずに確定する
+IMMEDIATE_SINGLE_CLICK = True
+
 # --- キーボード設定 ---
-KEYBOARD_LAYOUT = 'JIS'  # 'US' または 'JIS' を選択
+KEYBOARD_LAYOUT = 'JIS'  # 'US', 'JIS', 'UK', 'DE', 'FR' から選択 (layouts/*.bin)
+
+# --- HID送信間隔 ---
+# 連続したレポートを取りこぼすホスト向け: HID_BURST_SIZE 個続けて送るごとに HID_REPORT_DELAY 秒あける
+HID_REPORT_DELAY = 0  # 秒 (0なら調整しない: USBのポーリング間隔ごとに送る)
+HID_BURST_SIZE = 1  # 間をあけずに続けて送るレポート数 (1文字は押下と解放の2レポート)
+
+# --- モード設定 ---
+INITIAL_MODE = "Japanese"  # 起動時のモード ('Basic', 'Japanese', 'Utility', 'Snippets')
+# モード切り替え後の空きRAMがこれより少なければ、現在と前のモード以外を解放する (0なら解放しない)
+MODE_EVICT_FREE_BYTES = 0
+
+# --- 次の文字の予測 (基本モード) ---
+# 文字を入力したら、次に来やすい文字 (bigram.bin) の近くへダイヤルを移動する
+BASIC_PREDICTION = False
+
+# --- ローマ字候補 (日本語モード) ---
+ROMAJI_CANDIDATES = 3  # 入力中の語に続く候補を表示する数 (0なら辞書を使わない)
+ROMAJI_LOOKUP_BUDGET_MS = 5  # 1イベントで辞書の検索に使う時間の上限 (超えたらそのイベントでは候補を読まない)
+
+# --- スニペット (ユーティリティモードのメニューの Snippets) ---
+SNIPPETS_FILE = 'snippets.txt'  # スニペットファイル ('/' で始まらなければ code.py と同じフォルダ)
+SNIPPET_CHUNK_SIZE = 16  # 1回に送る最大の文字数 (送る間は入力を処理しない, 16文字で約150ms)
+SNIPPET_CHUNK_DELAY = 0.02  # チャンクの間隔[秒]
+SNIPPET_CHORD_DELAY = 0.1  # {CTRL+V} などのキー操作のあとの間隔[秒] (ホスト側の処理を待つ)
+
+# --- エンコーダ加速設定 ---
+# モードごとの加速カーブ: ((1クリックの間隔[秒], 倍率), ...) 間隔の短い順
+# カーブのないモードは加速しない
+ENCODER_ACCEL_CURVES = {
+    'Basic': ((0.03, 4), (0.06, 2)),
+}
+
+# --- メインループ設定 ---
+MAIN_LOOP = 'poll'  # 'poll' (10msごとのポーリング) または 'async' (asyncioのタスク構成)
+# 入力イベントのキューの長さ (処理が遅れたときは同じ向きの回転をまとめ、それでもあふれたら捨てる)
+EVENT_QUEUE_SIZE = 16
+EVENT_STATS_INTERVAL = 0  # イベントキューの統計をログに出す間隔[秒] (0なら出さない)
+
+# --- ポーリング間隔とライトスリープ (MAIN_LOOP = 'poll') ---
+POLL_INTERVAL_ACTIVE = 0.005  # 入力の直後のポーリング間隔[秒]
+POLL_INTERVAL_IDLE = 0.04  # 入力がないときに広げる間隔の上限[秒] (SWITCH_BACKEND = 'digitalio' では0.01まで)
+POLL_BACKOFF_TIME = 0.5  # 入力がない時間がこれだけ続くごとに間隔を2倍にする[秒]
+# 入力がない時間がこれだけ続いたら、エンコーダとスイッチのピンの変化で起きるライトスリープに入る[秒] (0ならしない)
+# スリープから起こした回転は入力されない (スイッチの押下は入力される)
+LIGHT_SLEEP_AFTER = 0
+
+# --- ログ設定 ---
+# 'DEBUG' (選択・送信した文字も表示), 'INFO', 'WARNING', 'ERROR', 'NONE'
+LOG_LEVEL = 'INFO'
+LOG_BUFFER_SIZE = 32  # アイドル時に出力するまでためておくメッセージ数
+
+# --- 入力トレース ---
+# ModeManager に渡した入力イベントを最新からこの数だけ記録する (1イベント12バイト, 0なら記録しない)
+# メニューの 'Trace' で TRACE_RECORDER_PATH に書き出す (boot.pyでremountが必要)
+TRACE_RECORDER_SIZE = 0
+TRACE_RECORDER_PATH = '/input_trace.txt'
+
+# --- 起動プロファイル ---
+# 起動から最初の入力までのフェーズごとの時間と空きRAMを出力する
+# None (無効), 'console' (シリアルコンソール), 'file' (BOOT_PROFILE_PATH に書き込む, boot.pyでremountが必要)
+BOOT_PROFILE = None
+BOOT_PROFILE_PATH = '/boot_profile.txt'
 
 # --- ディスプレイ設定 ---
 DISPLAY_WIDTH = 128
 DISPLAY_HEIGHT = 64
 I2C_ADDRESS = 0x3C  # 使用するOLEDのアドレスに合わせて変更してください
+I2C_FREQUENCY = 400000  # I2Cのクロック[Hz] (表示が乱れるときは 100000 に下げてください)
+DISPLAY_FPS = 30  # 表示更新の最大フレームレート (0ならイベントごとに自動リフレッシュ)
+GLYPH_CACHE_BYTES = 8192  # カルーセル文字の事前描画に使うRAM (0なら毎回Labelで描画)
+# カルーセルが前/次の文字へスライドする時間[秒] (0ならスライドしない, DISPLAY_FPS が必要)
+CAROUSEL_SLIDE_TIME = 0
+# アニメーションの1フレームに使える時間[秒] (直前のフレームの描画がこれより長ければアニメーションを飛ばす)
+ANIMATION_FRAME_BUDGET = 0.025
+# 入力の間隔がこれより短い（続けて回している）ときは、スライドせずに最後の位置で描き、
+# 最後の入力からこの時間はアニメーションのフレームを描かない[秒] (描画中に来た入力を待たせない)
+ANIMATION_INPUT_HOLDOFF = 0.15
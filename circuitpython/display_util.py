@@ -7,4 +7,79 @@ def get_display_char(char):
         return 'SP'  # terminalio.FONTはASCII基本セットのみのため'SP'で代用
     elif char == '\n':
         return 'EN'  # Enter/改行を'EN'で表示
-    return char
\ No newline at end of file
+    return char
+
+
+class RetainedLabel:
+    """
+    ラベルの差分更新ラッパー
+    前回反映した値と同じ代入はラベルに触れずに捨てる
+    (adafruit_display_textは text/scale の代入ごとにレイアウトをやり直すため)
+    """
+
+    # 全ラベル合計の統計
+    applied = 0  # 実際にラベルへ反映した代入の数
+    skipped = 0  # 値が同じで省略した代入の数
+
+    def __init__(self, label):
+        self.label = label
+        self._values = {}
+
+    def _set(self, name, value):
+        values = self._values
+        if name not in values:
+            values[name] = getattr(self.label, name)
+        if values[name] == value:
+            RetainedLabel.skipped += 1
+            return
+        values[name] = value
+        setattr(self.label, name, value)
+        RetainedLabel.applied += 1
+
+    def _get(self, name):
+        if name in self._values:
+            return self._values[name]
+        return getattr(self.label, name)
+
+    @property
+    def text(self):
+        return self._get('text')
+
+    @text.setter
+    def text(self, value):
+        self._set('text', value)
+
+    @property
+    def color(self):
+        return self._get('color')
+
+    @color.setter
+    def color(self, value):
+        self._set('color', value)
+
+    @property
+    def scale(self):
+        return self._get('scale')
+
+    @scale.setter
+    def scale(self, value):
+        self._set('scale', value)
+
+    @property
+    def hidden(self):
+        return self._get('hidden')
+
+    @hidden.setter
+    def hidden(self, value):
+        self._set('hidden', value)
+
+    @classmethod
+    def reset_stats(cls):
+        """統計をリセット"""
+        cls.applied = 0
+        cls.skipped = 0
+
+
+def wrap_labels(labels):
+    """ラベル辞書の各ラベルを RetainedLabel で包む"""
+    return {name: RetainedLabel(label) for name, label in labels.items()}
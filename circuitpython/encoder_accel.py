@@ -0,0 +1,56 @@
+# SPDX-FileCopyrightText: 2025 Takuya Urakawa (@hsgw 5z6p.com)
+# SPDX-License-Identifier: MIT
+
+"""
+エンコーダ加速
+1クリックあたりの間隔が短いほど回転量を大きくする（モードごとのカーブ）
+回転方向が変わった最初のイベントは加速しないので、
+方向転換で入力するモードの動作はそのまま
+"""
+
+
+class EncoderAccelerator:
+    """回転速度に応じて回転量を増やすクラス"""
+
+    def __init__(self, curves):
+        """
+        Args:
+            curves: {モード名: ((1クリックの間隔[秒], 倍率), ...)}
+                    間隔の短い順に並べる。カーブのないモードは加速しない
+        """
+        self.curves = curves
+        self.last_time = None
+        self.last_direction = 0
+
+    def reset(self):
+        """加速状態をリセット"""
+        self.last_time = None
+        self.last_direction = 0
+
+    def apply(self, delta, now, mode_name):
+        """
+        加速後の回転量を求める
+
+        Args:
+            delta: エンコーダの変化量
+            now: 現在時刻（秒）
+            mode_name: 現在のモード名 (Noneならモードがないので加速しない)
+
+        Returns:
+            int: 加速後の回転量（符号は delta と同じ）
+        """
+        direction = 1 if delta > 0 else -1
+        multiplier = 1
+        curve = self.curves.get(mode_name)
+
+        # 同じ方向に回し続けているときだけ加速する
+        if curve and self.last_time is not None and direction == self.last_direction:
+            interval = (now - self.last_time) / abs(delta)
+            for threshold, factor in curve:
+                if interval <= threshold:
+                    multiplier = factor
+                    break
+
+        self.last_time = now
+        self.last_direction = direction
+        return delta * multiplier
@@ -0,0 +1,172 @@
+# SPDX-FileCopyrightText: 2025 Takuya Urakawa (@hsgw 5z6p.com)
+# SPDX-License-Identifier: MIT
+
+"""
+カルーセル用グリフキャッシュ
+文字リストの各エントリを1ビットのビットマップに一度だけ描画しておき、
+回転時は TileGrid のビットマップを差し替えるだけにする（テキストのレイアウトをしない）
+RAM予算に収まらないエントリは通常の Label で描画する
+"""
+
+import displayio
+from adafruit_display_text import label
+
+try:
+    import bitmaptools
+except ImportError:
+    bitmaptools = None
+
+# 1エントリの最大文字数 ('SP', 'EN' など)
+CELL_CHARS = 2
+
+
+class GlyphCache:
+    """表示文字列 -> 1ビットビットマップのキャッシュ"""
+
+    def __init__(self, font, budget_bytes):
+        """
+        Args:
+            font: terminalio.FONT
+            budget_bytes: ビットマップに使うRAMの上限（バイト）
+        """
+        self.font = font
+        self.budget_bytes = budget_bytes
+        self.glyph_width, self.glyph_height = font.get_bounding_box()
+        self.cell_width = self.glyph_width * CELL_CHARS
+        # 1bppのBitmapは1行を32ビット単位で確保する
+        self.entry_bytes = ((self.cell_width + 31) // 32) * 4 * self.glyph_height
+        self.used_bytes = 0
+        self.entries = {}  # text -> (bitmap, 幅px)
+        self.blank = displayio.Bitmap(self.cell_width, self.glyph_height, 2)
+
+    def get(self, text):
+        """キャッシュ済みなら (bitmap, 幅px)、なければ None"""
+        return self.entries.get(text)
+
+    def add(self, text):
+        """
+        文字列を描画してキャッシュに追加
+
+        Returns:
+            bool: キャッシュにあるかどうか（予算オーバーやセルに収まらない場合はFalse）
+        """
+        if text in self.entries:
+            return True
+        if len(text) > CELL_CHARS or self.used_bytes + self.entry_bytes > self.budget_bytes:
+            return False
+        bitmap = displayio.Bitmap(self.cell_width, self.glyph_height, 2)
+        x = 0
+        for char in text:
+            glyph = self.font.get_glyph(ord(char))
+            if glyph:
+                self._blit_glyph(bitmap, x, glyph)
+            x += self.glyph_width
+        self.entries[text] = (bitmap, x)
+        self.used_bytes += self.entry_bytes
+        return True
+
+    def add_all(self, texts):
+        """リストの先頭から順にキャッシュする（予算に収まる分だけ）"""
+        for text in texts:
+            self.add(text)
+
+    def _blit_glyph(self, bitmap, x, glyph):
+        source = glyph.bitmap
+        tiles_per_row = source.width // glyph.width
+        sx = (glyph.tile_index % tiles_per_row) * glyph.width
+        sy = (glyph.tile_index // tiles_per_row) * glyph.height
+        if bitmaptools:
+            bitmaptools.blit(bitmap, source, x, 0, x1=sx, y1=sy,
+                             x2=sx + glyph.width, y2=sy + glyph.height)
+            return
+        for dy in range(glyph.height):
+            for dx in range(glyph.width):
+                if source[sx + dx, sy + dy]:
+                    bitmap[x + dx, dy] = 1
+
+
+class GlyphSlot(displayio.Group):
+    """
+    カルーセルの1枠（Labelと同じく text / color / hidden で操作できる）
+    キャッシュにある文字列はTileGridの差し替え、ない文字列はLabelで描画
+    """
+
+    def __init__(self, cache, *, color, scale, anchor_point, anchored_position):
+        super().__init__()
+        self.cache = cache
+        self._text = ""
+        self._scale = scale
+        self._anchor_point = anchor_point
+        self._anchored_position = anchored_position
+
+        self.palette = displayio.Palette(2)
+        self.palette.make_transparent(0)
+        self.palette[1] = color
+        self.tile_group = displayio.Group(scale=scale)
+        self.tile = displayio.TileGrid(cache.blank, pixel_shader=self.palette)
+        self.tile_group.append(self.tile)
+        self.append(self.tile_group)
+        self.fallback = None  # 必要になったときに作る
+
+    @property
+    def text(self):
+        return self._text
+
+    @text.setter
+    def text(self, text):
+        self._text = text
+        entry = self.cache.get(text)
+        if entry:
+            bitmap, width = entry
+            self.tile.bitmap = bitmap
+            self._place(width)
+            self.tile_group.hidden = False
+            if self.fallback:
+                self.fallback.hidden = True
+        else:
+            self._show_fallback(text)
+
+    @property
+    def color(self):
+        return self.palette[1]
+
+    @color.setter
+    def color(self, color):
+        self.palette[1] = color
+        if self.fallback:
+            self.fallback.color = color
+
+    def _place(self, width):
+        """アンカー位置に合わせてタイルの位置を決める（Labelのanchored_positionと同じ）"""
+        ax, ay = self._anchor_point
+        px, py = self._anchored_position
+        scale = self._scale
+        self.tile_group.x = px - int(ax * width * scale)
+        self.tile_group.y = py - int(ay * self.cache.glyph_height * scale)
+
+    def _show_fallback(self, text):
+        if self.fallback is None:
+            self.fallback = label.Label(
+                self.cache.font,
+                text=text,
+                color=self.palette[1],
+                scale=self._scale,
+                anchor_point=self._anchor_point,
+                anchored_position=self._anchored_position
+            )
+            self.append(self.fallback)
+        else:
+            self.fallback.text = text
+            self.fallback.hidden = False
+        self.tile_group.hidden = True
+
+
+_cache = None
+
+
+def get_glyph_cache(font, budget_bytes):
+    """全モードで共有するキャッシュを取得"""
+    global _cache
+    if _cache is None:
+        _cache = GlyphCache(font, budget_bytes)
+    return _cache
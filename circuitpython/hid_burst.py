@@ -0,0 +1,106 @@
+# SPDX-FileCopyrightText: 2025 Takuya Urakawa (@hsgw 5z6p.com)
+# SPDX-License-Identifier: MIT
+
+"""
+HIDバースト送信
+文字列をまとめて送るときに、必要最小限のキーボードレポートだけを送る
+- 1文字につき押下レポート1つ（前のキーの解放は次のレポートに含める）
+- Shiftは Shift が必要な文字が続く間は押したまま
+- 同じキーが続くときだけ間に解放レポートを入れる（離さないとホストが入力しない）
+- 最後に全キー解放のレポートを1つ (send_text は keyboard.release_all() で送り、Keyboard の状態と合わせる)
+- keyboard.press() で押したままのキーがあるときは、バーストのレポートで離してしまわないように
+  1文字ずつ Keyboard の press / release で送る
+"""
+
+from adafruit_hid.keycode import Keycode
+
+SHIFT_BIT = Keycode.modifier_bit(Keycode.SHIFT)
+
+
+def iter_reports(text, lookup, use_shift=False, report=None, release=True):
+    """
+    文字列を送るためのレポート列を順に返す（同じbytearrayを書き換えて返す）
+
+    Args:
+        text: 送信する文字列
+        lookup: 文字 -> (keycode, modifier) または None を返す関数
+        use_shift: Trueならすべての文字にShiftを付ける
+        report: 書き込み先の8バイトのbytearray (Noneなら新しく確保)
+        release: Falseなら最後の全キー解放のレポートを返さない
+    """
+    if report is None:
+        report = bytearray(8)
+    prev_keycode = 0
+    prev_modifier = 0
+    for char in text:
+        key = lookup(char)
+        if key is None:
+            continue
+        keycode, modifier = key
+        if use_shift:
+            modifier |= SHIFT_BIT
+        if keycode == prev_keycode:
+            # 同じキーは一度離す（修飾キーはそのまま）
+            report[0] = prev_modifier
+            report[2] = 0
+            yield report
+        report[0] = modifier
+        report[2] = keycode
+        yield report
+        prev_keycode = keycode
+        prev_modifier = modifier
+    if prev_keycode and release:
+        report[0] = 0
+        report[2] = 0
+        yield report
+
+
+def send_text(keyboard, text, lookup, use_shift=False):
+    """
+    文字列をまとめて送信
+
+    Args:
+        keyboard: adafruit_hid の Keyboard (または send_report を持つプロキシ)
+        text: 送信する文字列
+        lookup: 文字 -> (keycode, modifier) または None を返す関数
+        use_shift: Trueならすべての文字にShiftを付ける
+
+    Returns:
+        int: 送信した文字数（マッピングのない文字は飛ばす）
+    """
+    held = getattr(keyboard, 'report', None)  # Keyboard が押しているキー (async版のプロキシにはない)
+    if held is not None and any(held):
+        return _send_text_held(keyboard, held, text, lookup, use_shift)
+    send_report = getattr(keyboard, 'send_report', None)
+    if send_report is None:
+        send_report = keyboard._keyboard_device.send_report
+    sent = 0
+    for report in iter_reports(text, lookup, use_shift, release=False):
+        send_report(report)
+        if report[2]:
+            sent += 1
+    if sent:
+        # Keyboard.report も全キー解放にする
+        keyboard.release_all()
+    return sent
+
+
+def _send_text_held(keyboard, held, text, lookup, use_shift):
+    """押したままのキーを残して、1文字ずつ押して離す"""
+    sent = 0
+    for char in text:
+        key = lookup(char)
+        if key is None:
+            continue
+        keycode, modifier = key
+        if use_shift:
+            modifier |= SHIFT_BIT
+        # 押したままの修飾キーとキーは離さない
+        keys = [Keycode.LEFT_CONTROL + i for i in range(8)
+                if modifier & (1 << i) and not held[0] & (1 << i)]
+        if keycode not in held[2:]:
+            keys.append(keycode)
+        keyboard.press(*keys)
+        keyboard.release(*keys)
+        sent += 1
+    return sent
@@ -0,0 +1,75 @@
+# SPDX-FileCopyrightText: 2025 Takuya Urakawa (@hsgw 5z6p.com)
+# SPDX-License-Identifier: MIT
+
+"""
+HIDレポートの送信間隔の調整
+連続したレポートを取りこぼすホスト向けに、HID_BURST_SIZE 個のレポートを続けて送るごとに
+HID_REPORT_DELAY 秒あける
+キーボードのデバイスを差し替えるので、send_key / send_text / keyboard.send のどれにも効く
+"""
+
+import time
+
+
+class PacedDevice:
+    """送信間隔を調整する HID デバイスのラッパー"""
+
+    def __init__(self, device, delay, burst=1):
+        """
+        Args:
+            device: usb_hid.Device (キーボード)
+            delay: burst 個送ったあとに次のレポートまであける時間（秒）
+            burst: 間をあけずに続けて送るレポート数
+        """
+        self.device = device
+        self.delay = delay
+        self.burst = max(1, burst)
+        self.count = 0  # 最後に間をあけてから送ったレポート数
+        self.last_time = -delay  # 最後に送った時刻
+        self.waits = 0  # send_report の中で time.sleep して間をあけた回数（async版では0のはず）
+
+    def wait_time(self):
+        """
+        次のレポートを送るまでに待つ時間（秒）
+        前のレポートから delay 以上たっていれば、続けて送れる数を戻す
+        """
+        elapsed = time.monotonic() - self.last_time
+        if elapsed >= self.delay:
+            self.count = 0
+            return 0
+        if self.count < self.burst:
+            return 0
+        return self.delay - elapsed
+
+    def waited(self):
+        """wait_time() の時間を呼び出し側で待った (async版の HIDタスクが await で待ったあとに呼ぶ)"""
+        self.count = 0
+
+    def send_report(self, report, report_id=None):
+        wait = self.wait_time()
+        if wait > 0:
+            self.waits += 1
+            time.sleep(wait)
+            self.waited()
+        if report_id is None:
+            self.device.send_report(report)
+        else:
+            self.device.send_report(report, report_id)
+        self.count += 1
+        self.last_time = time.monotonic()
+
+    def __getattr__(self, name):
+        # usage_page などはそのまま
+        return getattr(self.device, name)
+
+
+def pace_keyboard(keyboard, delay, burst=1):
+    """
+    Keyboard のデバイスを PacedDevice に差し替える
+
+    Returns:
+        PacedDevice: 差し替えたデバイス
+    """
+    device = PacedDevice(keyboard._keyboard_device, delay, burst)
+    keyboard._keyboard_device = device
+    return device
@@ -0,0 +1,60 @@
+# SPDX-FileCopyrightText: 2025 Takuya Urakawa (@hsgw 5z6p.com)
+# SPDX-License-Identifier: MIT
+
+"""
+キーボードレイアウト
+layouts/<名前>.bin (host/build_layouts.py で host/layouts/*.txt から生成) を読み込み、
+文字 -> (keycode, modifier) を引く
+使うレイアウト (config.KEYBOARD_LAYOUT) の表だけを、最初に使うときに1回だけ読み込む
+"""
+
+from config import KEYBOARD_LAYOUT
+from logger import log
+
+# このファイルと同じフォルダの layouts/ を使う
+_LAYOUT_DIR = __file__[:__file__.rfind('/') + 1] + 'layouts/'
+
+
+class Layout:
+    """文字コード 0-255 の (keycode, modifier) 表"""
+
+    def __init__(self, name, table):
+        """
+        Args:
+            name: レイアウト名
+            table: 文字コードごとに (keycode, modifier) の2バイト、計512バイト
+        """
+        self.name = name
+        self.table = table
+
+    def lookup(self, char):
+        """
+        Returns:
+            tuple or None: (keycode, modifier) マッピングがなければNone
+        """
+        code = ord(char)
+        if code > 255:
+            return None
+        keycode = self.table[code << 1]
+        if not keycode:
+            return None
+        return keycode, self.table[(code << 1) + 1]
+
+
+def load_layout(name):
+    """レイアウト名 ('US', 'JIS', 'UK', 'DE', 'FR') の表を読み込む"""
+    with open(_LAYOUT_DIR + name.lower() + '.bin', 'rb') as f:
+        table = f.read()
+    log.info("Keyboard Layout: %s", name)
+    return Layout(name, table)
+
+
+_layout = None
+
+
+def get_layout():
+    """全モードで共有するレイアウトを取得"""
+    global _layout
+    if _layout is None:
+        _layout = load_layout(KEYBOARD_LAYOUT)
+    return _layout
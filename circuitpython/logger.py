@@ -0,0 +1,112 @@
+# SPDX-FileCopyrightText: 2025 Takuya Urakawa (@hsgw 5z6p.com)
+# SPDX-License-Identifier: MIT
+
+"""
+ログ出力
+メッセージはフォーマットせずにリングバッファへ積み、アイドル時にまとめて出力する
+（USBシリアルへの書き込みで入力処理が止まらないように）
+レベルが無効なメッセージはバッファにも積まず、フォーマットも行わない
+
+使い方:
+    from logger import log
+    log.debug("Selected: '%s'", char)
+"""
+
+from config import LOG_LEVEL, LOG_BUFFER_SIZE
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+NONE = 100
+
+LEVELS = {'DEBUG': DEBUG, 'INFO': INFO, 'WARNING': WARNING, 'ERROR': ERROR, 'NONE': NONE}
+_PREFIXES = {WARNING: "Warning: ", ERROR: "Error: "}
+
+
+class RingLogger:
+    """リングバッファ付きのロガー"""
+
+    def __init__(self, level=INFO, size=32):
+        """
+        Args:
+            level: 出力する最低レベル
+            size: バッファに保持できるメッセージ数（あふれたら古いものから捨てる）
+        """
+        self.level = level
+        self.size = size
+        # バッファは最初に確保しておく
+        self._levels = bytearray(size)
+        self._messages = [None] * size
+        self._args = [None] * size
+        self._head = 0   # 次に書き込む位置
+        self._count = 0  # 未出力のメッセージ数
+        self.dropped = 0
+
+    def enabled(self, level):
+        """そのレベルのメッセージを出力するかどうか（引数の計算が重い場合の判定用）"""
+        return level >= self.level
+
+    def log(self, level, message, *args):
+        """
+        メッセージをバッファに積む（フォーマットは出力時に message % args で行う）
+        """
+        if level < self.level:
+            return
+        head = self._head
+        self._levels[head] = level
+        self._messages[head] = message
+        self._args[head] = args
+        self._head = (head + 1) % self.size
+        if self._count < self.size:
+            self._count += 1
+        else:
+            self.dropped += 1
+
+    def debug(self, message, *args):
+        if DEBUG >= self.level:
+            self.log(DEBUG, message, *args)
+
+    def info(self, message, *args):
+        if INFO >= self.level:
+            self.log(INFO, message, *args)
+
+    def warning(self, message, *args):
+        if WARNING >= self.level:
+            self.log(WARNING, message, *args)
+
+    def error(self, message, *args):
+        if ERROR >= self.level:
+            self.log(ERROR, message, *args)
+
+    def pending(self):
+        """未出力のメッセージ数"""
+        return self._count
+
+    def flush(self, max_messages=None):
+        """
+        バッファのメッセージを古い順に出力する（メインループのアイドル時に呼ぶ）
+
+        Args:
+            max_messages: 1回に出力する最大数 (Noneならすべて)
+        """
+        if self.dropped:
+            print("(%d log messages dropped)" % self.dropped)
+            self.dropped = 0
+        count = self._count
+        if max_messages is not None and count > max_messages:
+            count = max_messages
+        for _ in range(count):
+            index = (self._head - self._count) % self.size
+            level = self._levels[index]
+            message = self._messages[index]
+            args = self._args[index]
+            self._messages[index] = None
+            self._args[index] = None
+            self._count -= 1
+            if args:
+                message = message % args
+            print(_PREFIXES.get(level, "") + message)
+
+
+log = RingLogger(LEVELS.get(LOG_LEVEL, INFO), LOG_BUFFER_SIZE)
@@ -8,23 +8,40 @@
 各モードが独自の状態（文字インデックスなど）を管理
 """
 
-from adafruit_hid.keycode import Keycode
+import gc
+import sys
+import time
+import displayio
+from config import MODE_EVICT_FREE_BYTES, EVENT_QUEUE_SIZE, EVENT_STATS_INTERVAL
+from display_util import wrap_labels
+from logger import log
+from keyboard_layout import get_layout
+import hid_burst
+
+# スイッチハンドラーのイベント -> ModeManager.post のイベントの種類
+SWITCH_EVENTS = {'timeout': 'single', 'double': 'double', 'long_press': 'long_press'}
 
 
 class Mode:
     """モードの基底クラス"""
     
-    def __init__(self, name, keyboard, char_list=None, char_to_keycode=None, needs_shift=None, display=None, display_group=None):
+    # ダブルクリックの使い方（スイッチの判定方法を決める）
+    #  'distinct': シングルとダブルで別の動作 (シングルはダブルクリック判定時間を待ってから)
+    #  'repeat'  : ダブルはシングル2回と同じ (シングルは解放時にすぐ)
+    #  'none'    : ダブルクリックを使わない (シングルは解放時にすぐ)
+    CLICK_POLICY = 'distinct'
+    
+    def __init__(self, name, keyboard, char_list=None, display=None):
         self.name = name
         self.keyboard = keyboard
         self.char_list = char_list if char_list else []
-        self.char_to_keycode = char_to_keycode if char_to_keycode else {}
-        self.needs_shift = needs_shift if needs_shift else []
+        self.mode_manager = None  # ModeManager.add_mode で設定
         self.display = display
-        self.display_group = display_group
+        # モード専用の表示グループ（最初に入ったときに作り、以降は使い回す）
+        self.display_group = None
         self.last_rotation_direction = None
         
-        # ディスプレイラベル（各モードで管理）
+        # ディスプレイラベル（各モードで管理, RetainedLabelで包む）
         self.display_labels = {}
         
         # モード固有の状態（サブクラスで初期化）
@@ -75,18 +92,6 @@ class Mode:
         # デフォルト実装: 何もしない（サブクラスで実装）
         return {}
     
-    def cleanup_display(self):
-        """
-        ディスプレイのクリーンアップ
-        モードから出るときにラベルを削除
-        """
-        if self.display_group:
-            # すべてのラベルをグループから削除
-            for label in self.display_labels.values():
-                if label in self.display_group:
-                    self.display_group.remove(label)
-        self.display_labels = {}
-    
     def on_enter(self, reset=True):
         """
         モードに入ったときの処理
@@ -94,24 +99,62 @@ class Mode:
         Args:
             reset: 状態をリセットするかどうか (Falseなら前の状態を保持)
         """
-        print(f"Mode: {self.name} (reset={reset})")
+        log.info("Mode: %s (reset=%s)", self.name, reset)
         self.last_rotation_direction = None
         
         # 状態を初期化（リセットフラグがTrueの場合のみ）
         if reset:
             self.state = self.init_state()
         
-        # ディスプレイを初期化
-        if self.display and self.display_group is not None:
-            self.display_labels = self.init_display()
+        # ディスプレイを初期化（初回のみ。グループは表示される前に組み立てる）
+        if self.display and self.display_group is None:
+            self.display_group = displayio.Group()
+            # 差分更新のラッパーで包む（同じ値の再代入で再レイアウトしない）
+            self.display_labels = wrap_labels(self.init_display())
         
         self.update_display_mode()
         self.update_display_state()
     
     def on_exit(self):
-        """モードから出るときの処理"""
-        # ディスプレイをクリーンアップ
-        self.cleanup_display()
+        """
+        モードから出るときの処理
+        表示グループとラベルは次に入るときのために残す
+        """
+        pass
+    
+    def click_policy(self):
+        """
+        現在のダブルクリックの使い方
+        状態によって変える場合はサブクラスでオーバーライド
+        
+        Returns:
+            str: 'distinct', 'repeat', 'none'
+        """
+        return self.CLICK_POLICY
+    
+    def update(self):
+        """
+        メインループから毎回呼ばれる処理（入力がなくても進める処理がある場合）
+        サブクラスでオーバーライド可能
+        
+        Returns:
+            bool: 状態が変わって表示の更新が必要かどうか
+        """
+        return False
+    
+    def animate(self, now, skip=False):
+        """
+        アニメーションを1フレーム進める（描画スケジューラから描画の直前に呼ばれる）
+        サブクラスでオーバーライド可能
+        
+        Args:
+            now: 現在時刻（秒）
+            skip: Trueならアニメーションを最後の状態まで進めて終える
+        
+        Returns:
+            bool: アニメーションが続くかどうか
+        """
+        return False
     
     def update_display_mode(self):
         """
@@ -158,32 +201,151 @@ class Mode:
         """
         return None
     
+    def handle_long_press(self):
+        """
+        長押し時の処理
+        
+        Returns:
+            str or None: 次のモード名（Noneの場合は変更なし）
+        """
+        return None
+    
     def send_key(self, char, use_shift=False):
         """キーを送信するヘルパーメソッド"""
-        if char in self.char_to_keycode:
-            keycode = self.char_to_keycode[char]
-            if use_shift or char in self.needs_shift:
-                self.keyboard.send(keycode, Keycode.SHIFT)
-            else:
-                self.keyboard.send(keycode)
-            return True
-        return False
+        return self.send_text(char, use_shift) == 1
+    
+    def lookup_key(self, char):
+        """
+        文字のキーコードと修飾キー
+        
+        Returns:
+            tuple or None: (keycode, modifier) マッピングがなければNone
+        """
+        return get_layout().lookup(char)
+    
+    def send_text(self, text, use_shift=False):
+        """
+        文字列をまとめて送信するヘルパーメソッド
+        1文字ずつ send_key するより少ないレポートで送る（Shiftは続く間押したまま）
+        
+        Returns:
+            int: 送信した文字数
+        """
+        return hid_burst.send_text(self.keyboard, text, get_layout().lookup, use_shift)
 
 
 class ModeManager:
     """モード管理クラス"""
     
-    def __init__(self, display=None, display_group=None):
-        self.modes = {}
+    def __init__(self, display=None, keyboard=None):
+        self.modes = {}  # 作成済みのモード
+        # 登録済みのモード: モード名 -> (モジュール名, クラス名)
+        # 最初に set_mode で選ばれたときにインポートして作成する
+        self.registry = {}
+        self.menu = []  # メニューに出すモード名（登録順）
+        self.keyboard = keyboard
         self.current_mode = None
         self.previous_mode_name = None
         self.display = display
-        self.display_group = display_group
+        # 描画スケジューラ (Noneならイベントごとに即時更新)
+        self.render_scheduler = None
+        # スイッチハンドラー (モードに合わせてシングルクリックの判定方法を切り替える)
+        self.switch_handler = None
+        self.immediate_click_enabled = True
+        # 入力トレースの記録 (TraceRecorder, Noneなら記録しない)
+        self.recorder = None
+        # 入力イベントのキュー: [時刻, 種類, 値, 回転をまとめてよいか]
+        self.events = []
+        self.queue_size = EVENT_QUEUE_SIZE
+        self._last_direction = 0  # 最後に積んだイベントの回転方向 (回転以外は0)
+        self.event_stats = {
+            'posted': 0,      # 積んだイベント数
+            'coalesced': 0,   # 前の回転にまとめたイベント数
+            'dropped': 0,     # キューがいっぱいで捨てたイベント数
+            'dispatched': 0,  # 処理したイベント数
+            'max_depth': 0,   # キューの最大の長さ
+            'max_wait': 0.0,  # 積んでから処理するまでの最大時間（秒）
+        }
+        self._next_stats_time = 0
     
     def add_mode(self, mode):
-        """モードを追加"""
+        """作成済みのモードを追加"""
+        mode.mode_manager = self
         self.modes[mode.name] = mode
     
+    def register_mode(self, name, module_name, class_name, menu=True):
+        """
+        モードを登録（インポートと作成は最初に選ばれたとき）
+        
+        Args:
+            name: モード名
+            module_name: モジュール名 (例: 'modes.basic_mode')
+            class_name: クラス名 (コンストラクタは (keyboard, display))
+            menu: ユーティリティモードのメニューに出すかどうか
+        """
+        self.registry[name] = (module_name, class_name)
+        if menu:
+            self.menu.append(name)
+    
+    def menu_items(self):
+        """メニューに出すモード名の一覧"""
+        return self.menu
+    
+    def _load_mode(self, mode_name):
+        """
+        モードを取得（未作成なら登録情報からインポートして作成）
+        
+        Returns:
+            tuple: (モード or None, 新しく作成したかどうか)
+        """
+        mode = self.modes.get(mode_name)
+        if mode:
+            return mode, False
+        entry = self.registry.get(mode_name)
+        if entry is None:
+            return None, False
+        module_name, class_name = entry
+        module = __import__(module_name, None, None, (class_name,))
+        mode = getattr(module, class_name)(self.keyboard, self.display)
+        self.add_mode(mode)
+        log.info("Loaded mode: %s", mode_name)
+        return mode, True
+    
+    def evict_mode(self, mode_name):
+        """
+        登録済みのモードを解放する（次に選ばれたときに作り直す）
+        現在のモードと add_mode で追加したモードは解放しない
+        """
+        if mode_name not in self.registry or mode_name not in self.modes:
+            return
+        if self.current_mode and self.current_mode.name == mode_name:
+            return
+        del self.modes[mode_name]
+        module_name = self.registry[mode_name][0]
+        # 他のモードがモジュールを使っていなければモジュールも解放
+        if not any(self.registry[name][0] == module_name for name in self.modes if name in self.registry):
+            sys.modules.pop(module_name, None)
+            package, _, child = module_name.rpartition('.')
+            if package in sys.modules:
+                try:
+                    delattr(sys.modules[package], child)
+                except AttributeError:
+                    pass
+        log.info("Evicted mode: %s", mode_name)
+    
+    def _evict_if_low_memory(self):
+        """空きRAMが MODE_EVICT_FREE_BYTES より少なければ、現在と前のモード以外を解放"""
+        if not MODE_EVICT_FREE_BYTES:
+            return
+        gc.collect()
+        if gc.mem_free() >= MODE_EVICT_FREE_BYTES:
+            return
+        keep = (self.current_mode.name, self.previous_mode_name)
+        for name in list(self.modes):
+            if name not in keep:
+                self.evict_mode(name)
+        gc.collect()
+    
     def set_mode(self, mode_name, reset=True):
         """
         モードを切り替え
@@ -191,79 +353,215 @@ class ModeManager:
         Args:
             mode_name: 切り替えるモード名
             reset: 新しいモードの状態をリセットするかどうか
+                   (新しく作成したモードは常にリセット)
         """
-        if mode_name in self.modes:
+        mode, created = self._load_mode(mode_name)
+        if mode:
             if self.current_mode:
                 # 同じモードへの切り替えでなければ履歴を保存
                 if self.current_mode.name != mode_name:
                     self.previous_mode_name = self.current_mode.name
                 self.current_mode.on_exit()
                 
-            self.current_mode = self.modes[mode_name]
-            self.current_mode.on_enter(reset=reset)
+            self.current_mode = mode
+            self.current_mode.on_enter(reset=reset or created)
+            if self.display:
+                # 組み立て済みのグループに一度で切り替える（途中のフレームを描画しない）
+                self.display.root_group = mode.display_group
+            self.update_click_policy()
+            if self.render_scheduler:
+                self.render_scheduler.mark_dirty()
+            self._evict_if_low_memory()
         else:
-            print(f"Warning: Mode '{mode_name}' not found")
+            log.warning("Mode '%s' not found", mode_name)
     
     def get_previous_mode(self):
         """前のモード名を取得"""
         return self.previous_mode_name
     
-    def handle_rotation(self, delta):
-        """現在のモードで回転を処理"""
-        if self.current_mode:
-            next_mode = self.current_mode.handle_rotation(delta)
-            
-            # ディスプレイを更新
+    def update_click_policy(self):
+        """
+        現在のモードがダブルクリックを区別しなければ、
+        シングルクリックを解放時にすぐ出すようスイッチハンドラーに伝える
+        (モードの状態で変わることがあるので、イベントを処理するたびに呼ぶ)
+        """
+        if self.switch_handler and self.current_mode:
+            immediate = self.immediate_click_enabled and self.current_mode.click_policy() != 'distinct'
+            self.switch_handler.set_immediate_click(immediate)
+    
+    def request_display_update(self):
+        """
+        表示の更新を要求
+        描画スケジューラがあれば次のフレームまで遅らせ、なければ即時更新
+        """
+        if self.render_scheduler:
+            self.render_scheduler.mark_dirty()
+        else:
             self.current_mode.update_display_state()
-            
-            if next_mode:
-                # 特別な値 "__PREVIOUS__" の場合、前のモードに戻る
-                if next_mode == "__PREVIOUS__":
-                    next_mode = self.previous_mode_name
-                
-                if next_mode:
-                    # モード切り替え要求があれば切り替え（前のモードに戻る場合はリセットしない）
-                    should_reset = True
-                    if next_mode == self.previous_mode_name:
-                        should_reset = False
-                        
-                    self.set_mode(next_mode, reset=should_reset)
-                    return True
-            return False # モード変更なし（処理は行われた）
-        return False
     
-    def handle_single_click(self):
-        """現在のモードでシングルクリックを処理"""
+    def render(self):
+        """現在のモードの状態をラベルに反映（描画スケジューラから呼ばれる）"""
         if self.current_mode:
-            next_mode = self.current_mode.handle_single_click()
-            
-            # ディスプレイを更新 (状態が変わった可能性があるため)
             self.current_mode.update_display_state()
-            
-            if next_mode:
-                if next_mode == "__PREVIOUS__":
-                    next_mode = self.previous_mode_name
-                    
-                if next_mode:
-                    should_reset = True
-                    if next_mode == self.previous_mode_name:
-                        should_reset = False
-                    self.set_mode(next_mode, reset=should_reset)
     
-    def handle_double_click(self):
-        """現在のモードでダブルクリックを処理"""
+    def animate(self, now, skip=False):
+        """現在のモードのアニメーションを進める（描画スケジューラから呼ばれる）"""
         if self.current_mode:
-            next_mode = self.current_mode.handle_double_click()
+            return self.current_mode.animate(now, skip)
+        return False
+    
+    def update(self):
+        """
+        現在のモードの定期処理（メインループから毎回呼ぶ）
+        
+        Returns:
+            bool: 処理したかどうか（表示の更新を要求した）
+        """
+        if EVENT_STATS_INTERVAL:
+            now = time.monotonic()
+            if now >= self._next_stats_time:
+                if self._next_stats_time:
+                    self.log_event_stats()
+                self._next_stats_time = now + EVENT_STATS_INTERVAL
+        if self.current_mode and self.current_mode.update():
+            self.request_display_update()
+            self.update_click_policy()
+            return True
+        return False
+    
+    def post(self, kind, value=0, timestamp=None):
+        """
+        入力イベントをキューに積む
+        処理が追いつかずに同じ向きの回転が続いたときは、キューの最後の回転にまとめる
+        回転方向が変わった回転と、回転以外のイベントのあとの最初の回転にはまとめない
+        (BasicMode や UtilityMode は方向の反転で入力・モード切り替えをするので、
+         反転した1クリック目は必ずそれだけで処理する)
+        キューがいっぱいのときは、まとめてよい回転（反転やクリックのあとの最初の回転ではないもの）の
+        一番古いものを捨てて場所を空ける（反転した回転を捨てたり、逆向きの回転にまとめたりはしない）
+        捨てられる回転がなければ、新しい回転は捨て、スイッチのイベントは捨てずにキューの長さを超えて積む
+        
+        Args:
+            kind: 'rotation', 'single', 'double', 'long_press'
+            value: 回転量 (rotation のみ)
+            timestamp: イベントの時刻 (time.monotonic(), Noneなら今)
             
-            # ディスプレイを更新 (状態が変わった可能性があるため)
-            self.current_mode.update_display_state()
+        Returns:
+            bool: 積んだ（まとめた）かどうか（捨てたならFalse）
+        """
+        stats = self.event_stats
+        direction = 0
+        if kind == 'rotation':
+            if not value:
+                return True
+            direction = 1 if value > 0 else -1
+        stats['posted'] += 1
+        if self.render_scheduler:
+            self.render_scheduler.note_input(timestamp)
+        events = self.events
+        if direction and direction == self._last_direction and events and events[-1][3]:
+            events[-1][2] += value
+            stats['coalesced'] += 1
+            return True
+        if len(events) >= self.queue_size and not self._drop_oldest_rotation() and direction:
+            # 反転した回転は次の回転で反転として積む (_last_direction は変えない)
+            stats['dropped'] += 1
+            log.warning("Event queue full, dropped rotation")
+            return False
+        if timestamp is None:
+            timestamp = time.monotonic()
+        events.append([timestamp, kind, value, direction != 0 and direction == self._last_direction])
+        self._last_direction = direction
+        if len(events) > stats['max_depth']:
+            stats['max_depth'] = len(events)
+        return True
+    
+    def _drop_oldest_rotation(self):
+        """
+        キューの一番古い、まとめてよい回転を捨てる
+        まとめてよい回転の前は同じ向きの回転なので、次のイベントのまとめてよいかは変わらない
+        
+        Returns:
+            bool: 捨てたかどうか
+        """
+        events = self.events
+        for i in range(len(events)):
+            if events[i][3]:
+                events.pop(i)
+                self.event_stats['dropped'] += 1
+                log.warning("Event queue full, dropped the oldest rotation")
+                return True
+        return False
+    
+    def pending(self):
+        """キューに残っているイベント数"""
+        return len(self.events)
+    
+    def dispatch(self, max_events=0):
+        """
+        キューのイベントを古い順に現在のモードで処理
+        
+        Args:
+            max_events: 処理するイベント数の上限 (0ならキューが空になるまで)
             
-            if next_mode:
-                if next_mode == "__PREVIOUS__":
-                    next_mode = self.previous_mode_name
-                    
-                if next_mode:
-                    should_reset = True
-                    if next_mode == self.previous_mode_name:
-                        should_reset = False
-                    self.set_mode(next_mode, reset=should_reset)
+        Returns:
+            int: 処理したイベント数
+        """
+        count = 0
+        stats = self.event_stats
+        while self.events and (not max_events or count < max_events):
+            timestamp, kind, value, _ = self.events.pop(0)
+            wait = time.monotonic() - timestamp
+            if wait > stats['max_wait']:
+                stats['max_wait'] = wait
+            self._dispatch_event(kind, value, timestamp)
+            stats['dispatched'] += 1
+            count += 1
+        return count
+    
+    def _dispatch_event(self, kind, value, timestamp=None):
+        """
+        1つのイベントを現在のモードで処理し、モードが返したモードに切り替える
+
+        Args:
+            timestamp: post() で積んだイベントの時刻 (time.monotonic(), Noneなら今)
+        """
+        mode = self.current_mode
+        if not mode:
+            return
+        if self.recorder:
+            # キューで待った時間ではなく、イベントが起きた時刻を記録する
+            timestamp_ns = None if timestamp is None else int(timestamp * 1000000000)
+            self.recorder.record(kind, mode.name, value, timestamp_ns)
+        if kind == 'rotation':
+            next_mode = mode.handle_rotation(value)
+        elif kind == 'single':
+            next_mode = mode.handle_single_click()
+        elif kind == 'double':
+            next_mode = mode.handle_double_click()
+        elif kind == 'long_press':
+            next_mode = mode.handle_long_press()
+        else:
+            log.warning("Unknown event: %s", kind)
+            return
+        
+        # ディスプレイを更新 (状態が変わった可能性があるため)
+        self.request_display_update()
+        self.update_click_policy()
+        
+        # 特別な値 "__PREVIOUS__" の場合、前のモードに戻る
+        if next_mode == "__PREVIOUS__":
+            next_mode = self.previous_mode_name
+        if next_mode:
+            # 前のモードに戻る場合はリセットしない
+            self.set_mode(next_mode, reset=next_mode != self.previous_mode_name)
+    
+    def log_event_stats(self):
+        """イベントキューと描画（フレーム数, I2C転送の時間）の統計をログに出す"""
+        stats = self.event_stats
+        log.info("Events: posted %d, coalesced %d, dropped %d, dispatched %d, max depth %d, max wait %d ms",
+                 stats['posted'], stats['coalesced'], stats['dropped'], stats['dispatched'],
+                 stats['max_depth'], int(stats['max_wait'] * 1000))
+        scheduler = self.render_scheduler
+        if scheduler:
+            log.info("Frames: %d, refresh last %.1f ms, max %.1f ms",
+                     scheduler.frames, scheduler.refresh_cost * 1000, scheduler.max_refresh_cost * 1000)
@@ -4,10 +4,6 @@
 """
 モードパッケージ
 各種入力モードを提供
+各モードは ModeManager.register_mode で登録し、最初に使うときにインポートする
+(ここでまとめてインポートしない)
 """
-
-from modes.basic_mode import BasicMode
-from modes.utility_mode import UtilityMode
-from modes.japanese_mode import JapaneseMode
-
-__all__ = ['BasicMode', 'UtilityMode', 'JapaneseMode']
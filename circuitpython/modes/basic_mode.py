@@ -5,10 +5,13 @@
 基本入力モード
 金庫のダイヤル風の入力方式を実装
 文字インデックスを内部で管理
+BASIC_PREDICTION が True なら、文字を入力するたびに次に来やすい文字へダイヤルを移動する
 """
 
+from config import BASIC_PREDICTION
 from modes.input_mode import InputMode
 from display_util import get_display_char
+from logger import log
 
 
 class BasicMode(InputMode):
@@ -23,8 +26,14 @@ class BasicMode(InputMode):
         ':', ';', '<', '=', '>', '?', '@', '[', ']', '^', '_', '`', '{', '|', '}', '~', '\n'
     ]
     
-    def __init__(self, keyboard, display=None, display_group=None):
-        super().__init__("Basic", keyboard, self.CHAR_LIST, display, display_group)
+    def __init__(self, keyboard, display=None):
+        super().__init__("Basic", keyboard, self.CHAR_LIST, display)
+        # 次の文字の予測表 (1KB, 無効または読めなければNone)
+        self.bigram = None
+        if BASIC_PREDICTION:
+            from bigram import load_bigram
+            self.bigram = load_bigram()
+
     def on_enter(self, reset=True):
         """モードに入ったときの処理"""
         super().on_enter(reset=reset)
@@ -43,6 +52,22 @@ class BasicMode(InputMode):
         elif direction == -1: # 左回転中
             self.update_footer_text("< Prev", "Input >")
 
+    def _predict_next(self, char):
+        """
+        入力した文字のあと、次に来やすい文字へダイヤルを移動してニュートラル状態にする
+
+        Returns:
+            bool: 移動したかどうか
+        """
+        if not self.bigram:
+            return False
+        index = self.bigram.best_index(char, self.char_list)
+        if index is None:
+            return False
+        self.set_state('char_index', index)
+        self._set_rotation_direction(None)
+        return True
+
     def update_display_state(self):
         """状態に基づいてディスプレイを更新"""
         if not self.display or not self.display_labels:
@@ -65,7 +90,7 @@ class BasicMode(InputMode):
         if 'next' in self.display_labels:
             self.display_labels['next'].text = next_char
         
-        print(f"Selected: '{selected_char}'")
+        log.debug("Selected: '%s'", selected_char)
     
     def handle_rotation(self, delta):
         """回転処理：文字インデックスを更新し、方向変更で入力"""
@@ -78,15 +103,22 @@ class BasicMode(InputMode):
             selected_char = self.char_list[char_index]
             
             if self.send_key(selected_char):
-                print(f"Sent (Direction Change): '{selected_char}'")
+                log.debug("Sent (Direction Change): '%s'", selected_char)
+                # 予測した文字へ移動したら、この回転の1クリック目は移動の代わりにする
+                if self._predict_next(selected_char):
+                    delta -= current_rotation_direction
+                    if not delta:
+                        return None
+                    char_index = self.get_state('char_index', 0)
             else:
-                print(f"Warning: No keycode mapping for '{selected_char}'")
+                log.warning("No keycode mapping for '%s'", selected_char)
         
         self._set_rotation_direction(current_rotation_direction)
         
         # 文字インデックスを更新
         char_index = (char_index + delta) % len(self.char_list)
         self.set_state('char_index', char_index)
+        self.slide_carousel(current_rotation_direction)
         
         return None
     
@@ -96,11 +128,12 @@ class BasicMode(InputMode):
         selected_char = self.char_list[char_index]
         
         if self.send_key(selected_char):
-            print(f"Sent (Click): '{selected_char}'")
+            log.debug("Sent (Click): '%s'", selected_char)
             # 回転方向をリセットし、フッターを更新
             self._set_rotation_direction(None)
+            self._predict_next(selected_char)
         else:
-            print(f"Warning: No keycode mapping for '{selected_char}'")
+            log.warning("No keycode mapping for '%s'", selected_char)
         
         return None  # モード変更なし
     
@@ -110,10 +143,11 @@ class BasicMode(InputMode):
         selected_char = self.char_list[char_index]
         
         if self.send_key(selected_char, use_shift=True):
-            print(f"Sent (Double Click): '{selected_char.upper() if selected_char.isalpha() else selected_char}'")
+            log.debug("Sent (Double Click): Shift+'%s'", selected_char)
             # 回転方向をリセットし、フッターを更新
             self._set_rotation_direction(None)
+            self._predict_next(selected_char)
         else:
-            print(f"Warning: No keycode mapping for '{selected_char}'")
+            log.warning("No keycode mapping for '%s'", selected_char)
         
         return None  # モード変更なし
@@ -4,13 +4,18 @@
 """
 InputModeの基底クラス
 基本的なディスプレイレイアウト（前/現在/次）を提供
+CAROUSEL_SLIDE_TIME > 0 なら、カルーセルが1つ動くたびに前の位置からスライドさせる
 """
 
-from config import DISPLAY_WIDTH, DISPLAY_HEIGHT, KEYBOARD_LAYOUT
+from config import DISPLAY_WIDTH, DISPLAY_HEIGHT, GLYPH_CACHE_BYTES, CAROUSEL_SLIDE_TIME, DISPLAY_FPS
+import displayio
 import terminalio
 from adafruit_display_text import label
 from mode_manager import Mode
-from keyboard_mapping import get_keycode_mapping
+from display_util import get_display_char
+
+# スライドの距離（前/次の文字の位置から中央まで, ピクセル）
+SLIDE_DISTANCE = DISPLAY_WIDTH // 2 - 18
 
 
 class InputMode(Mode):
@@ -19,10 +24,31 @@ class InputMode(Mode):
     前/現在/次の3つのラベルを持つディスプレイレイアウトを初期化する
     """
     
-    def __init__(self, name, keyboard, char_list=None, display=None, display_group=None):
-        # キーボードマッピングを取得
-        char_to_keycode, needs_shift = get_keycode_mapping(KEYBOARD_LAYOUT)
-        super().__init__(name, keyboard, char_list, char_to_keycode, needs_shift, display, display_group)
+    # スライドするカルーセルのグループ (スライドしないときはNone)
+    carousel = None
+    _slide_from = 0  # スライドを始めるときのカルーセルのx
+    _slide_start = None  # スライドを始めた時刻 (最初のフレームで決める)
+    _sliding = False
+    
+    def carousel_texts(self):
+        """
+        カルーセルに表示する文字列の一覧（グリフキャッシュの事前描画用）
+        サブクラスでオーバーライド可能
+        """
+        return [get_display_char(char) for char in self.char_list]
+
+    def _carousel_label(self, **kwargs):
+        """
+        カルーセルの1枠を作成
+        GLYPH_CACHE_BYTES > 0 なら事前描画したビットマップを差し替える GlyphSlot、
+        それ以外は通常の Label
+        """
+        if GLYPH_CACHE_BYTES > 0:
+            from glyph_cache import get_glyph_cache, GlyphSlot
+            cache = get_glyph_cache(terminalio.FONT, GLYPH_CACHE_BYTES)
+            cache.add_all(self.carousel_texts())
+            return GlyphSlot(cache, **kwargs)
+        return label.Label(terminalio.FONT, text="", **kwargs)
 
     def init_display(self):
         """
@@ -34,38 +60,38 @@ class InputMode(Mode):
         
         labels = {}
         
+        # スライドさせるときは前/現在/次をまとめて動かすグループに入れる
+        carousel = self.display_group
+        if CAROUSEL_SLIDE_TIME and DISPLAY_FPS:
+            self.carousel = carousel = displayio.Group()
+            self.display_group.append(carousel)
+        
         # 前の文字を小さく表示（左側・左揃え）
-        labels['prev'] = label.Label(
-            terminalio.FONT, 
-            text="", 
+        labels['prev'] = self._carousel_label(
             color=0x888888, 
             scale=2,
             anchor_point=(0.0, 0.5),
             anchored_position=(10, DISPLAY_HEIGHT // 2)
         )
-        self.display_group.append(labels['prev'])
+        carousel.append(labels['prev'])
         
         # 選択中の文字を大きく表示（中央・中央揃え）
-        labels['current'] = label.Label(
-            terminalio.FONT, 
-            text="", 
+        labels['current'] = self._carousel_label(
             color=0xFFFFFF, 
             scale=4,
             anchor_point=(0.5, 0.5),
             anchored_position=(DISPLAY_WIDTH // 2, DISPLAY_HEIGHT // 2 - 4)
         )
-        self.display_group.append(labels['current'])
+        carousel.append(labels['current'])
         
         # 次の文字を小さく表示（右側・右揃え）
-        labels['next'] = label.Label(
-            terminalio.FONT, 
-            text="", 
+        labels['next'] = self._carousel_label(
             color=0x888888, 
             scale=2,
             anchor_point=(1.0, 0.5),
             anchored_position=(DISPLAY_WIDTH - 10, DISPLAY_HEIGHT // 2)
         )
-        self.display_group.append(labels['next'])
+        carousel.append(labels['next'])
 
         # --- フッター ---
         # 左アクション
@@ -90,6 +116,46 @@ class InputMode(Mode):
         
         return labels
 
+    def slide_carousel(self, direction):
+        """
+        カルーセルが1つ動いたことを伝え、動く前の位置からスライドさせる
+        （ラベルは次の描画で新しい文字になるので、グループを前の位置までずらしてから戻す）
+        
+        Args:
+            direction: 1 なら次（右）の文字、-1 なら前（左）の文字が中央に来た
+        """
+        carousel = self.carousel
+        if carousel is None:
+            return
+        # スライドの途中なら今の位置から続ける（早回しでも1つ分より遅れない）
+        x = carousel.x + direction * SLIDE_DISTANCE
+        self._slide_from = max(-SLIDE_DISTANCE, min(SLIDE_DISTANCE, x))
+        self._slide_start = None
+        self._sliding = True
+
+    def animate(self, now, skip=False):
+        """スライドを1フレーム進める（速く動き出して減速する）"""
+        if not self._sliding:
+            return False
+        if self._slide_start is None:
+            self._slide_start = now
+        progress = (now - self._slide_start) / CAROUSEL_SLIDE_TIME
+        if skip or progress >= 1:
+            self._sliding = False
+            x = 0
+        else:
+            remaining = 1 - progress
+            x = int(self._slide_from * remaining * remaining)
+        if self.carousel.x != x:
+            self.carousel.x = x
+        return self._sliding
+
+    def on_exit(self):
+        """スライドの途中で出たら最後の位置にしておく"""
+        if self._sliding:
+            self.animate(0, skip=True)
+        super().on_exit()
+
     def update_footer_text(self, left_text, right_text):
         """フッターのテキストを更新する"""
         if 'left_action' in self.display_labels:
@@ -4,20 +4,32 @@
 """
 日本語入力モード (Japanese Input Mode)
 ローマ字入力用。2つのリスト（子音・母音）を回転方向で切り替えて選択する。
+入力中の語に続く候補をローマ字辞書 (romaji_dict.py) から引いて上部に表示する。
 """
 
-from adafruit_hid.keycode import Keycode
+import time
+import terminalio
+from adafruit_display_text import label
+from config import DISPLAY_WIDTH, ROMAJI_CANDIDATES, ROMAJI_LOOKUP_BUDGET_MS
 from modes.input_mode import InputMode
 from display_util import get_display_char
+from romaji_dict import get_romaji_dict
+from logger import log
+
+# 語の一部として辞書を引く文字（それ以外の文字を入力すると語の区切り）
+WORD_CHARS = 'abcdefghijklmnopqrstuvwxyz-'
 
 
 class JapaneseMode(InputMode):
     """
     日本語入力モード
     左回転: 母音リスト (A, I, U, E, O)
+           子音を入力した直後は、その子音に続けられる母音と2文字の子音 (KY, SH, ...) だけ
     右回転: 子音リスト (K, S, T, ...)
     逆回転: 直前の選択を入力し、新しいリスト操作へ切り替え
     クリック: 現在の選択を入力し、操作状態をリセット
+    候補の表示中にニュートラル状態でクリック: 最初の候補の残りを入力
+    (このときダブルクリックで現在の選択を1回入力)
     """
     
     # 母音リスト (左回転用)
@@ -26,25 +38,57 @@ class JapaneseMode(InputMode):
     # 子音リスト (右回転用)
     CONSONANTS = ['k', 's', 't', 'n', 'h', 'm', 'y', 'r', 'w', 'g', 'z', 'd', 'b', 'p']
     
-    # キーコードマッピング（簡易版: a-zのみ対応）
-    # 記号などが必要な場合は keyboard_mapping.py を拡張して使うか、ここで定義する
+    # 子音を入力した直後の母音リング（子音ごとに続けられる文字, 先頭から選択を始める）
+    # 母音のあとの y, h, s は2文字の子音 (ky, sh, ts, ...) になり、母音リングはその表に切り替わる
+    # ch, j, f はIMEで同じかなになる ty, zy, hu で入力する
+    # 子音のあとのリングも最後に数字 (DIGITS) を続ける
+    # 表にない子音・記号のあとや、母音のあとは数字も含む母音リスト全体
+    SYLLABLES = {
+        'k': 'aiueoy', 's': 'aiueoh', 't': 'aiueosy', 'n': 'aiueoyn', 'h': 'aiueoy',
+        'm': 'aiueoy', 'y': 'auo', 'r': 'aiueoy', 'w': 'ao', 'g': 'aiueoy',
+        'z': 'aiueoy', 'd': 'aiueo', 'b': 'aiueoy', 'p': 'aiueoy',
+        'ky': 'auo', 'sh': 'aiueo', 'ts': 'u', 'ty': 'auo', 'ny': 'auo', 'hy': 'auo',
+        'my': 'auo', 'ry': 'auo', 'gy': 'auo', 'zy': 'auo', 'by': 'auo', 'py': 'auo',
+    }
+    
+    DIGITS = '1234567890'
+    
+    # 1イベントで辞書を読む回数の上限（ダブルクリックの2文字は子ノードの読み込みだけで使い切る）
+    LOOKUP_READS = 2
+    
+    # ダブルクリックは同じ文字を2回入力（シングル2回と同じ）なので、シングルは待たずに確定
+    CLICK_POLICY = 'repeat'
     
-    def __init__(self, keyboard, display=None, display_group=None):
-        super().__init__("Japanese", keyboard, None, display, display_group)
+    # キーコードは keyboard_layout.py のレイアウト表 (layouts/*.bin) から引く
+    
+    def __init__(self, keyboard, display=None):
+        super().__init__("Japanese", keyboard, None, display)
         
         # リストの拡張 (インスタンス属性として上書き)
         # 母音側: 数字 (1-0)
-        self.VOWELS = self.VOWELS + ['1', '2', '3', '4', '5', '6', '7', '8', '9', '0']
+        self.VOWELS = self.VOWELS + list(self.DIGITS)
         
         # 子音側: 記号
         self.CONSONANTS = self.CONSONANTS + ['.', ',', '-', '/', '!', '?', '@', ' ', '\n']
         
+        # ローマ字辞書 (フラッシュ上のファイルを開くだけでRAMには読み込まない)
+        self.dictionary = get_romaji_dict() if ROMAJI_CANDIDATES else None
+        self.word_node = None  # 入力中の語に対応する辞書のノード (辞書にない綴りならNone)
+        self.candidates = []  # 入力中の語に続く候補（語の残りの部分）
+        
+    def carousel_texts(self):
+        """カルーセルに表示する文字列の一覧（大文字で表示）"""
+        digraphs = [consonant for consonant in self.SYLLABLES if len(consonant) == 2]
+        return [get_display_char(char).upper() for char in self.VOWELS + self.CONSONANTS + digraphs]
+
     def on_enter(self, reset=False):
         """モードに入ったときの処理"""
         super().on_enter(reset=reset)
         # Utilityモード等から戻った時も、常にニュートラル状態で開始する
         self._set_active_state(is_neutral=True)
-        self.set_state('vowel_index', 0)
+        # 離れている間にカーソルが動いたかもしれないので、語の入力もやり直す
+        self._reset_word()
+        self._set_vowel_context(None)
         self.update_display_state()
     
     def init_state(self):
@@ -57,7 +101,10 @@ class JapaneseMode(InputMode):
             # -1: Active Left (Vowel)
             #  2: Neutral Right (Last selection was Consonant)
             'active_side': 'vowel', # 'vowel' or 'consonant'
-            'is_neutral': True      # True: 選択待機中(リセット直後), False: 選択中
+            'is_neutral': True,     # True: 選択待機中(リセット直後), False: 選択中
+            'word': '',             # 入力中の語（最後の区切りのあとに入力した文字）
+            'vowel_context': None,  # 直前に入力した子音 (母音リングを絞る, Noneなら全体)
+            'vowel_unselected': False,  # 母音リングの今の位置をまだ選んでいない (次の左回転で選ぶ)
         }
     
 
@@ -80,6 +127,105 @@ class JapaneseMode(InputMode):
             else: # consonant
                 self.update_footer_text("< Input", "Next >")
 
+    def init_display(self):
+        """カルーセルとフッターに加えて、上部に候補のラベルを作る"""
+        labels = super().init_display()
+        if not labels:
+            return labels
+        labels['candidates'] = label.Label(
+            terminalio.FONT,
+            text="",
+            color=0xFFFFFF,
+            anchor_point=(0.5, 0.0),  # 中央上
+            anchored_position=(DISPLAY_WIDTH // 2, 0)
+        )
+        self.display_group.append(labels['candidates'])
+        return labels
+
+    def vowel_ring(self):
+        """現在の母音リング（直前に入力した子音に続けられる母音, なければ母音リスト全体）"""
+        context = self.get_state('vowel_context')
+        if context is None or context not in self.SYLLABLES:
+            return self.VOWELS
+        return self.SYLLABLES[context] + self.DIGITS
+
+    def _vowel_text(self, vowels, index):
+        """母音リングの文字の表示（2文字の子音になる文字は KY のように表示）"""
+        char = vowels[index % len(vowels)]
+        context = self.get_state('vowel_context')
+        if context is not None and context + char in self.SYLLABLES:
+            return context + char
+        return char
+
+    def _set_vowel_context(self, consonant):
+        """母音リングを consonant に続く母音に切り替え、先頭の母音を選ぶ"""
+        self.set_state('vowel_context', consonant)
+        self.set_state('vowel_index', 0)
+
+    def _typed_vowel(self, vowel):
+        """
+        母音リングの文字を入力したあと
+        子音の続き (k -> ky など) なら母音リングを2文字の子音に続く母音に切り替え、
+        母音なら母音リングを全体に戻して同じ母音を選んだままにする
+        """
+        context = self.get_state('vowel_context')
+        if context is not None and context + vowel in self.SYLLABLES:
+            self._set_vowel_context(context + vowel)
+            # クリックで入力したときも、次の左回転で先頭の母音 (kya の a) を選ぶ
+            self.set_state('vowel_unselected', True)
+            return
+        self.set_state('vowel_context', None)
+        self.set_state('vowel_index', self.VOWELS.index(vowel) if vowel in self.VOWELS else 0)
+
+    def _typed_consonant(self, consonant):
+        """子音（記号を含む）を入力したあと: 母音リングをその子音に続く母音に絞る"""
+        self._set_vowel_context(consonant if consonant in self.SYLLABLES else None)
+
+    def _reset_word(self):
+        """語の区切り: 入力中の語と候補を消す"""
+        self.set_state('word', '')
+        self.word_node = self.dictionary.root if self.dictionary else None
+        self.candidates = []
+
+    def _type(self, text):
+        """文字を送信し、入力中の語と候補を更新する"""
+        self.send_text(text)
+        if not self.dictionary:
+            return
+        start = time.monotonic_ns()
+        reads = self.dictionary.reads
+        word = self.get_state('word')
+        node = self.word_node
+        for char in text:
+            if char in WORD_CHARS:
+                word += char
+                if node:
+                    node = self.dictionary.child(node, char)
+            else:
+                word = ''
+                node = self.dictionary.root
+        self.set_state('word', word)
+        self.word_node = node
+        self.candidates = []
+        if word and node:
+            # 子ノードの読み込みで回数か時間を使い切ったら、このイベントでは候補を読まない
+            if (self.dictionary.reads - reads < self.LOOKUP_READS
+                    and time.monotonic_ns() - start < ROMAJI_LOOKUP_BUDGET_MS * 1000000):
+                self.candidates = self.dictionary.candidates(node, ROMAJI_CANDIDATES)
+            else:
+                log.debug("Romaji lookup over budget: %s", word)
+
+    def _commit_candidate(self):
+        """最初の候補の残りを入力して語を終える"""
+        self.send_text(self.candidates[0])
+        self._reset_word()
+
+    def click_policy(self):
+        """候補をクリックで確定できる間は、シングルとダブルを区別する"""
+        if self.candidates and self.get_state('is_neutral'):
+            return 'distinct'
+        return self.CLICK_POLICY
+
     def update_display_state(self):
         """状態に基づいてディスプレイを更新"""
         if not self.display or not self.display_labels:
@@ -90,13 +236,14 @@ class JapaneseMode(InputMode):
         active_side = self.get_state('active_side')
         is_neutral = self.get_state('is_neutral')
         
+        vowels = self.vowel_ring()
         center_text = ""
         left_text = ""
         right_text = ""
         
         # 中央（現在の選択）
         if active_side == 'vowel':
-            center_text = self.VOWELS[v_index]
+            center_text = self._vowel_text(vowels, v_index)
         else:
             center_text = self.CONSONANTS[c_index]
             
@@ -104,11 +251,11 @@ class JapaneseMode(InputMode):
         if is_neutral:
             # ニュートラル状態
             
-            # 左（母音）: アクティブなら次の文字、非アクティブ（切り替え）なら現在の文字
-            if active_side == 'vowel':
-                left_text = self.VOWELS[(v_index + 1) % len(self.VOWELS)]
+            # 左（母音）: アクティブなら次の文字、非アクティブ（切り替え）や未選択なら現在の文字
+            if active_side == 'vowel' and not self.get_state('vowel_unselected'):
+                left_text = self._vowel_text(vowels, v_index + 1)
             else:
-                left_text = self.VOWELS[v_index]
+                left_text = self._vowel_text(vowels, v_index)
                 
             # 右（子音）: アクティブなら次の文字、非アクティブ（切り替え）なら現在の文字
             if active_side == 'consonant':
@@ -118,8 +265,8 @@ class JapaneseMode(InputMode):
             
         elif active_side == 'vowel': # Active Left
             # 母音リスト内での前後 (左回転でindex増)
-            left_text = self.VOWELS[(v_index + 1) % len(self.VOWELS)]
-            right_text = self.VOWELS[(v_index - 1) % len(self.VOWELS)]
+            left_text = self._vowel_text(vowels, v_index + 1)
+            right_text = self._vowel_text(vowels, v_index - 1)
             
         elif active_side == 'consonant': # Active Right
             # 子音リスト内での前後
@@ -133,6 +280,23 @@ class JapaneseMode(InputMode):
             self.display_labels['prev'].text = get_display_char(left_text).upper()
         if 'next' in self.display_labels:
             self.display_labels['next'].text = get_display_char(right_text).upper()
+        if 'candidates' in self.display_labels:
+            self.display_labels['candidates'].text = self._candidates_text(is_neutral)
+
+    def _candidates_text(self, is_neutral):
+        """候補の表示（ニュートラル状態ではクリックで入力される最初の候補を [] で囲む）"""
+        if not self.candidates:
+            return ""
+        word = self.get_state('word')
+        text = word + self.candidates[0]
+        if is_neutral:
+            text = "[" + text + "]"
+        # 画面の幅に収まる候補だけを並べる (terminalio.FONT は幅6ドット)
+        for suffix in self.candidates[1:]:
+            if len(text) + 1 + len(word) + len(suffix) > DISPLAY_WIDTH // 6:
+                break
+            text += " " + word + suffix
+        return text
 
 
     def handle_rotation(self, delta):
@@ -150,33 +314,43 @@ class JapaneseMode(InputMode):
         
         # サイド変更があるか（ニュートラルかどうかに関わらず）
         switching_side = (target_side != current_side)
+        # 2文字の子音 (ky など) をクリックで入力した直後の母音リングは、今の位置（先頭）から選ぶ
+        unselected = self.get_state('vowel_unselected')
+        self.set_state('vowel_unselected', False)
         
         # 1. 入力判定（非ニュートラル かつ サイド変更時）
         if not is_neutral and switching_side:
             # 現在のサイドの文字を入力
-            target_char = ""
             if current_side == 'consonant':
                 target_char = self.CONSONANTS[c_index]
+                self._type(target_char)
+                # 2. 子音から母音への切り替え: 母音リングをこの子音に続く母音にして先頭から
+                self._typed_consonant(target_char)
             else:
-                target_char = self.VOWELS[v_index]
-            self.send_key(target_char)
+                target_char = self.vowel_ring()[v_index]
+                self._type(target_char)
+                self._typed_vowel(target_char)
+            v_index = self.get_state('vowel_index')
             
         # 2. リセット判定（子音から母音への切り替え時）
-        # Active中の切り替え、およびNeutral(クリック)後の切り替えの両方で有効
-        if current_side == 'consonant' and target_side == 'vowel':
+        # Neutral(クリック)後の切り替えでも母音を先頭から選ぶ（母音リングはクリックした子音のまま）
+        elif current_side == 'consonant' and target_side == 'vowel':
              v_index = 0
              self.set_state('vowel_index', v_index)
 
         # 3. インデックス更新
         # 「同じリストの場合はすぐに次の文字を選択」 -> switching_side == False なら更新
         # 「リストの変更があった場合は...以前のインデックス（ホールド）」 -> switching_side == True なら更新しない
-        if not switching_side:
+        # 回転がまとめられたとき (|delta| > 1) は、残りのクリック数だけ進める
+        steps = abs(delta) - 1 if switching_side or (unselected and target_side == 'vowel') else abs(delta)
+        if steps:
             if target_side == 'consonant':
-                c_index = (c_index + 1) % len(self.CONSONANTS)
+                c_index = (c_index + steps) % len(self.CONSONANTS)
                 self.set_state('consonant_index', c_index)
             else: # vowel (左回転で順送り)
-                v_index = (v_index + 1) % len(self.VOWELS)
+                v_index = (v_index + steps) % len(self.vowel_ring())
                 self.set_state('vowel_index', v_index)
+            self.slide_carousel(direction)
         
         # 4. 新しい状態を保存
         self._set_active_state(is_neutral=False, active_side=target_side)
@@ -186,28 +360,36 @@ class JapaneseMode(InputMode):
     def _handle_click(self, num_clicks =1):
         """クリック処理：現在の選択を入力してリセット"""
         active_side = self.get_state('active_side')
+        self.set_state('vowel_unselected', False)
         
-        target_char = ""
         if active_side == 'consonant':
             target_char = self.CONSONANTS[self.get_state('consonant_index')]
-            # 子音をクリックで入力した場合、母音のindexをリセットする
-            self.set_state('vowel_index', 0)
-            
         else:
-            target_char = self.VOWELS[self.get_state('vowel_index')]
+            target_char = self.vowel_ring()[self.get_state('vowel_index')]
         
-        if target_char:
-            for _ in range(num_clicks):
-                self.send_key(target_char)
+        # 2回入力はまとめて送る（同じキーの間の解放だけ挟む）
+        self._type(target_char * num_clicks)
+        
+        if active_side == 'consonant':
+            # 子音をクリックで入力した場合、母音リングをこの子音に続く母音にして先頭から
+            self._typed_consonant(target_char)
+        else:
+            self._typed_vowel(target_char)
         
         # ニュートラル状態へ移行（サイドは維持）
         self._set_active_state(is_neutral=True)
         return None
 
     def handle_single_click(self):
+        if self.candidates and self.get_state('is_neutral'):
+            self._commit_candidate()
+            return None
         return self._handle_click(1)
 
     def handle_double_click(self):
+        if self.candidates and self.get_state('is_neutral'):
+            # 候補の表示中は、ダブルクリックがこれまでのシングルクリックの代わり
+            return self._handle_click(1)
         return self._handle_click(2)
     
     
@@ -0,0 +1,147 @@
+# SPDX-FileCopyrightText: 2025 Takuya Urakawa (@hsgw 5z6p.com)
+# SPDX-License-Identifier: MIT
+
+"""
+スニペットモード
+CIRCUITPY のスニペットファイル (snippets.py) の定型文を選んで送る
+送信は SNIPPET_CHUNK_SIZE 文字ずつ、メインループの update で少しずつ進める
+（送信中も入力と表示は止まらない）
+"""
+
+import time
+import terminalio
+from adafruit_display_text import label
+from config import (
+    DISPLAY_WIDTH, DISPLAY_HEIGHT, SNIPPET_CHUNK_SIZE, SNIPPET_CHUNK_DELAY, SNIPPET_CHORD_DELAY
+)
+from mode_manager import Mode
+from snippets import get_snippets
+from logger import log
+
+
+class SnippetMode(Mode):
+    """
+    スニペットモード
+    - 回転: スニペットを選ぶ
+    - クリック: 選んだスニペットを送る（送信中なら中止）
+    - ダブルクリック: 前のモードに戻る
+    - 長押し: ユーティリティモード
+    """
+
+    def __init__(self, keyboard, display=None):
+        super().__init__("Snippets", keyboard, display=display)
+        # 目次は snippets モジュールで1回だけ作る（モードを解放しても残る）
+        self.snippets = get_snippets()
+        self.stream = None  # 送信中のスニペット
+        self.next_time = 0  # 次のチャンクを送る時刻
+
+    def init_state(self):
+        """状態を初期化"""
+        return {
+            'snippet_index': 0,
+            'status': '',
+        }
+
+    def init_display(self):
+        """ディスプレイレイアウトを初期化"""
+        if not self.display or self.display_group is None:
+            return {}
+
+        labels = {}
+        labels['title'] = label.Label(terminalio.FONT, text="< Snippets >", color=0xFFFFFF, anchor_point=(0.5, 0.0), anchored_position=(DISPLAY_WIDTH // 2, 5))
+        labels['name'] = label.Label(terminalio.FONT, text="", color=0xFFFFFF, anchor_point=(0.5, 0.5), anchored_position=(DISPLAY_WIDTH // 2, DISPLAY_HEIGHT // 2 + 2))
+        labels['status'] = label.Label(terminalio.FONT, text="", color=0xAAAAAA, anchor_point=(0.5, 1.0), anchored_position=(DISPLAY_WIDTH // 2, DISPLAY_HEIGHT - 2))
+
+        for l in labels.values():
+            self.display_group.append(l)
+
+        return labels
+
+    def on_exit(self):
+        """モードから出るときは送信を中止する"""
+        self._stop("")
+
+    def click_policy(self):
+        """送信中はクリックをすぐ中止に使う"""
+        return 'none' if self.stream else 'distinct'
+
+    def update_display_state(self):
+        """状態に基づいてディスプレイを更新"""
+        if not self.display or not self.display_labels:
+            return
+        if self.snippets and self.snippets.entries:
+            index = self.get_state('snippet_index', 0)
+            self.display_labels['name'].text = self.snippets.entries[index][0][:DISPLAY_WIDTH // 6]
+        else:
+            self.display_labels['name'].text = "(no snippets)"
+        self.display_labels['status'].text = self.get_state('status', '')
+
+    def handle_rotation(self, delta):
+        """回転でスニペットを選ぶ（送信中は何もしない）"""
+        if self.stream or not self.snippets or not self.snippets.entries:
+            return None
+        index = (self.get_state('snippet_index', 0) + delta) % len(self.snippets.entries)
+        self.set_state('snippet_index', index)
+        self.set_state('status', '')
+        return None
+
+    def handle_single_click(self):
+        """選んだスニペットの送信を始める（送信中なら中止）"""
+        if self.stream:
+            self._stop("Canceled")
+            return None
+        if not self.snippets or not self.snippets.entries:
+            return None
+        index = self.get_state('snippet_index', 0)
+        try:
+            self.stream = self.snippets.open_stream(index, SNIPPET_CHUNK_SIZE)
+        except OSError as e:
+            log.warning("Snippet open failed: %s", e)
+            self.set_state('status', "Error")
+            return None
+        log.info("Snippet: %s (%d bytes)", self.snippets.entries[index][0], self.stream.length)
+        self.next_time = 0
+        self.set_state('status', "Sending 0%")
+        return None
+
+    def handle_double_click(self):
+        """ダブルクリックで前のモードに戻る"""
+        return "__PREVIOUS__"
+
+    def handle_long_press(self):
+        """長押しでユーティリティモードに切り替え"""
+        return "Utility"
+
+    def update(self):
+        """
+        送信中なら次のチャンク（文字列かキー操作1つ）を送る
+        前のチャンクから SNIPPET_CHUNK_DELAY (キー操作のあとは SNIPPET_CHORD_DELAY) 秒あけ、
+        HIDキュー (async版) が空になるまで待つ
+        """
+        stream = self.stream
+        if stream is None:
+            return False
+        now = time.monotonic()
+        if now < self.next_time or len(getattr(self.keyboard, 'queue', ())):
+            return False
+        item = stream.next_item()
+        if item is None:
+            self._stop("Sent")
+            return True
+        if isinstance(item, tuple):
+            self.keyboard.send(*item)
+            self.next_time = now + SNIPPET_CHORD_DELAY
+        else:
+            self.send_text(item)
+            self.next_time = now + SNIPPET_CHUNK_DELAY
+        self.set_state('status', "Sending %d%%" % (stream.sent * 100 // max(stream.length, 1)))
+        return True
+
+    def _stop(self, status):
+        """送信を終える"""
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+            log.info("Snippet: %s", status or "Stopped")
+        if status:
+            self.set_state('status', status)
@@ -0,0 +1,71 @@
+# SPDX-FileCopyrightText: 2025 Takuya Urakawa (@hsgw 5z6p.com)
+# SPDX-License-Identifier: MIT
+
+"""
+入力トレースの保存モード
+メニューから選ぶと、それまでに記録した入力トレース (trace_recorder.py) を CIRCUITPY に書き出す
+(TRACE_RECORDER_SIZE が 0 のときは登録されない)
+"""
+
+import terminalio
+from adafruit_display_text import label
+from config import DISPLAY_WIDTH, DISPLAY_HEIGHT
+from mode_manager import Mode
+
+
+class TraceMode(Mode):
+    """
+    入力トレースの保存モード
+    - 入ったとき: トレースを書き出して結果を表示
+    - クリック/ダブルクリック: 前のモードに戻る
+    - 長押し: ユーティリティモード
+    """
+
+    CLICK_POLICY = 'none'
+
+    def __init__(self, keyboard, display=None):
+        super().__init__("Trace", keyboard, display=display)
+
+    def init_display(self):
+        """ディスプレイレイアウトを初期化"""
+        if not self.display or self.display_group is None:
+            return {}
+
+        labels = {}
+        labels['title'] = label.Label(terminalio.FONT, text="< Save Trace >", color=0xFFFFFF, anchor_point=(0.5, 0.0), anchored_position=(DISPLAY_WIDTH // 2, 5))
+        labels['result'] = label.Label(terminalio.FONT, text="", color=0xFFFFFF, anchor_point=(0.5, 0.5), anchored_position=(DISPLAY_WIDTH // 2, DISPLAY_HEIGHT // 2 + 2))
+
+        for l in labels.values():
+            self.display_group.append(l)
+
+        return labels
+
+    def on_enter(self, reset=True):
+        """モードに入ったらトレースを書き出す"""
+        recorder = self.mode_manager.recorder if self.mode_manager else None
+        if recorder is None:
+            result = "Disabled"
+        elif recorder.dump():
+            result = "%d events saved" % min(recorder.count, recorder.size)
+        else:
+            result = "Read-only (console)"
+        self.state = {'result': result}
+        super().on_enter(reset=False)
+
+    def update_display_state(self):
+        """状態に基づいてディスプレイを更新"""
+        if not self.display or not self.display_labels:
+            return
+        self.display_labels['result'].text = self.get_state('result', '')
+
+    def handle_single_click(self):
+        """クリックで前のモードに戻る"""
+        return "__PREVIOUS__"
+
+    def handle_double_click(self):
+        """ダブルクリックで前のモードに戻る"""
+        return "__PREVIOUS__"
+
+    def handle_long_press(self):
+        """長押しでユーティリティモードに切り替え"""
+        return "Utility"
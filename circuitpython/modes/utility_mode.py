@@ -12,6 +12,7 @@ import terminalio
 from adafruit_display_text import label
 from adafruit_hid.keycode import Keycode
 from mode_manager import Mode
+from logger import log
 
 class UtilityMode(Mode):
     """
@@ -20,13 +21,14 @@ class UtilityMode(Mode):
     - 回転あり:
       - 左回転: Backspace
       - 右回転: Space
-    - 長押し: モード選択メニューを開く
+      - 1回の回転イベントで、回転量 (|delta|) の数だけ送る
+        (速く回してエンコーダが1回で2クリック以上を返したときや、イベントキューで回転がまとめられたときも
+         1クリック1文字)
+    - 長押し: モード選択メニューを開く (項目は ModeManager.register_mode で menu=True のモード)
     """
     
-    MENU_ITEMS = ["Basic", "Japanese"]
-
-    def __init__(self, keyboard, display=None, display_group=None):
-        super().__init__("Utility", keyboard, display=display, display_group=display_group)
+    def __init__(self, keyboard, display=None):
+        super().__init__("Utility", keyboard, display=display)
 
     def on_enter(self, reset=True):
         """モードに入ったときの処理"""
@@ -90,7 +92,7 @@ class UtilityMode(Mode):
             self.display_labels['sp'].scale = 4 if current_action == 'SP' else 2
         elif sub_mode == 'menu':
             index = self.get_state('selected_menu_index')
-            self.display_labels['menu_item'].text = self.MENU_ITEMS[index]
+            self.display_labels['menu_item'].text = self.mode_manager.menu_items()[index]
 
     def handle_rotation(self, delta):
         """回転処理"""
@@ -105,20 +107,22 @@ class UtilityMode(Mode):
                 # 逆回転が検出されたら前のモードに戻る
                 if self.get_state('last_action_direction') == 'SP':
                     self.keyboard.send(Keycode.ENTER)
-                    print("Sent: Enter")
-                    print("Return to previous mode")
+                    log.debug("Sent: Enter")
+                    log.debug("Return to previous mode")
                 self.set_state('current_action', None) # 状態をリセット
                 self.set_state('last_action_direction', None) # 状態をリセット
                 return "__PREVIOUS__"
             
             # 同じ方向なら連続入力、または最初のアクション
+            # 回転量の数だけ送る（速く回したときやキューで回転がまとめられたときも1クリック1文字）
             self.set_state('current_action', direction)
-            self._execute_action(direction)
+            for _ in range(abs(delta)):
+                self._execute_action(direction)
             self.set_state('last_action_direction', direction) # 最後に実行したアクションの方向を保存
 
         elif sub_mode == 'menu':
             index = self.get_state('selected_menu_index')
-            index = (index + delta) % len(self.MENU_ITEMS)
+            index = (index + delta) % len(self.mode_manager.menu_items())
             self.set_state('selected_menu_index', index)
         
         return None
@@ -133,14 +137,14 @@ class UtilityMode(Mode):
             current_action = self.get_state('current_action')
             if current_action == 'SP':
                 self.keyboard.send(Keycode.ENTER)
-                print("Sent: Enter")
+                log.debug("Sent: Enter")
             elif current_action == 'BS':
                 self.keyboard.send(Keycode.BACKSPACE)
-                print("Sent: Backspace")
+                log.debug("Sent: Backspace")
             return None # アクションモードではクリックでモードを抜けない
         elif sub_mode == 'menu':
             index = self.get_state('selected_menu_index')
-            return self.MENU_ITEMS[index]
+            return self.mode_manager.menu_items()[index]
 
     def handle_long_press(self):
         """長押しでメニューモードに切り替え"""
@@ -155,7 +159,7 @@ class UtilityMode(Mode):
         """アクションを実行"""
         if action == 'BS':
             self.keyboard.send(Keycode.BACKSPACE)
-            print("Sent: Backspace")
+            log.debug("Sent: Backspace")
         elif action == 'SP':
             self.keyboard.send(Keycode.SPACE)
-            print("Sent: Space")
\ No newline at end of file
+            log.debug("Sent: Space")
\ No newline at end of file
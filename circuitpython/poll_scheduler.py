@@ -0,0 +1,104 @@
+# SPDX-FileCopyrightText: 2025 Takuya Urakawa (@hsgw 5z6p.com)
+# SPDX-License-Identifier: MIT
+
+"""
+メインループ (MAIN_LOOP = 'poll') のポーリング間隔とライトスリープ
+入力の直後は短い間隔でポーリングし、入力がない時間が backoff_time 続くごとに間隔を2倍にして
+idle_interval まで広げる
+入力がない時間が sleep_after 続いたら、エンコーダとスイッチのピンの変化で起きる
+alarm.light_sleep_until_alarms() に入る（ピンは rotaryio / keypad から解放しておく）
+"""
+
+import time
+
+from logger import log
+
+
+class PollScheduler:
+    """入力の有無に合わせてポーリング間隔を決める"""
+
+    def __init__(self, active_interval, idle_interval, backoff_time, sleep_after=0):
+        """
+        Args:
+            active_interval: 入力の直後のポーリング間隔（秒）
+            idle_interval: 広げる間隔の上限（秒）
+            backoff_time: 入力がない時間がこれだけ続くごとに間隔を2倍にする（秒）
+            sleep_after: 入力がない時間がこれだけ続いたらライトスリープ（秒, 0ならしない）
+        """
+        self.active_interval = active_interval
+        self.idle_interval = max(active_interval, idle_interval)
+        self.backoff_time = backoff_time
+        self.sleep_after = sleep_after
+        self.last_activity = time.monotonic()
+
+        # ライトスリープの統計
+        self.sleeps = 0
+        self.woke_by = None  # 最後に起こしたピン
+        self.wake_time = None  # 起きた時刻（最初のイベントを処理するまで）
+        self.wake_latency = 0.0  # 起きてから最初のイベントを処理するまでの時間（秒）
+        self.max_wake_latency = 0.0
+        self.ready_latency = 0.0  # 起きてから入力を受け付けられるようになるまでの時間（秒）
+
+    def activity(self, now):
+        """入力や処理中の仕事があった（間隔を最短に戻す）"""
+        self.last_activity = now
+
+    def interval(self, now):
+        """
+        次のポーリングまでの時間
+
+        Returns:
+            float: 秒
+        """
+        interval = self.active_interval
+        steps = int((now - self.last_activity) / self.backoff_time)
+        while steps > 0 and interval < self.idle_interval:
+            interval *= 2
+            steps -= 1
+        return min(interval, self.idle_interval)
+
+    def should_sleep(self, now):
+        """ライトスリープに入る時間かどうか"""
+        return bool(self.sleep_after) and now - self.last_activity >= self.sleep_after
+
+    def light_sleep(self, pins):
+        """
+        ピンの変化までライトスリープ（呼ぶ前にピンを使っているオブジェクトを deinit しておく）
+
+        Args:
+            pins: 起こすピン（押下・回転で Low になる, 内部プルアップ）
+
+        Returns:
+            bool: スリープしたかどうか (alarm モジュールがなければ False)
+        """
+        try:
+            import alarm
+        except ImportError:
+            self.sleep_after = 0
+            return False
+        alarms = [alarm.pin.PinAlarm(pin, value=False, edge=True, pull=True) for pin in pins]
+        log.info("Light sleep after %d s idle", self.sleep_after)
+        log.flush()
+        woke_by = alarm.light_sleep_until_alarms(*alarms)
+        self.wake_time = time.monotonic()
+        self.sleeps += 1
+        self.woke_by = woke_by.pin if woke_by else None
+        return True
+
+    def ready(self):
+        """起きたあと入力のオブジェクトを作り直した"""
+        now = time.monotonic()
+        self.last_activity = now
+        if self.wake_time is not None:
+            self.ready_latency = now - self.wake_time
+
+    def event(self, now):
+        """イベントを処理した（起きてから最初のイベントなら時間を記録）"""
+        self.last_activity = now
+        if self.wake_time is None:
+            return
+        self.wake_latency = now - self.wake_time
+        self.max_wake_latency = max(self.max_wake_latency, self.wake_latency)
+        self.wake_time = None
+        log.info("Wake by %s: ready %.1f ms, first event %.1f ms",
+                 self.woke_by, self.ready_latency * 1000, self.wake_latency * 1000)
@@ -0,0 +1,132 @@
+# SPDX-FileCopyrightText: 2025 Takuya Urakawa (@hsgw 5z6p.com)
+# SPDX-License-Identifier: MIT
+
+"""
+描画スケジューラ
+状態が変わったら dirty にしておき、フレーム間隔ごとに最新の状態だけを描画する
+早回し中の途中のフレームは飛ばされる
+アニメーション（カルーセルのスライドなど）のフレームは、入力やHIDの処理待ちがあるときや
+描画が時間の予算を超えるときは捨てる（入力イベントは捨てない）
+描画中のフレームは止められないので、入力が続いている間（前の入力から input_holdoff 以内に
+次の入力が来たとき）は、最後の入力から input_holdoff の間アニメーションのフレームを描かない
+"""
+
+import time
+
+
+class RenderScheduler:
+    """ディスプレイの更新をフレーム単位にまとめるクラス"""
+
+    def __init__(self, display, render, fps=30, animate=None, frame_budget=0, input_holdoff=0):
+        """
+        Args:
+            display: ディスプレイ (auto_refreshは無効にする)
+            render: 描画直前に呼ぶ関数（ラベルを最新の状態に更新する）
+            fps: 最大フレームレート
+            animate: render のあとに呼ぶ関数 animate(now, skip) -> アニメーションが続くかどうか
+                     skip が True なら最後の状態まで進めて終える
+            frame_budget: アニメーションの1フレームに使える時間（秒, 0なら制限なし）
+            input_holdoff: 入力の間隔がこれより短いとき、最後の入力からアニメーションを止める時間（秒, 0なら止めない）
+        """
+        self.display = display
+        self.render = render
+        self.frame_interval = 1 / fps
+        self.dirty = False
+        self.last_frame_time = None
+        self.animate = animate
+        self.animating = False
+        self.frame_budget = frame_budget
+        self.input_holdoff = input_holdoff
+        self.last_input_time = None
+        self.holdoff_until = 0.0  # この時刻まではアニメーションのフレームを描かない
+        self.frame_cost = 0.0  # 直前のフレームの描画にかかった時間（秒）
+        self.refresh_cost = 0.0  # 直前のフレームの display.refresh() (I2C転送) にかかった時間（秒）
+        self.max_refresh_cost = 0.0
+
+        # 統計
+        self.frames = 0
+        self.coalesced = 0  # 描画前に上書きされた更新要求の数
+        self.animation_frames = 0  # アニメーションの途中のフレームの数
+        self.dropped = 0  # 処理待ちや予算超過で描かなかったアニメーションのフレームの数
+
+        display.auto_refresh = False
+
+    def mark_dirty(self):
+        """表示の更新を要求"""
+        if self.dirty:
+            self.coalesced += 1
+        self.dirty = True
+
+    def note_input(self, now=None):
+        """
+        入力があったことを知らせる（ModeManager.post から呼ばれる）
+        前の入力から input_holdoff 以内なら、この入力から input_holdoff の間アニメーションを止める
+
+        Args:
+            now: 入力の時刻 (Noneなら time.monotonic())
+        """
+        if now is None:
+            now = time.monotonic()
+        if self.last_input_time is not None and now - self.last_input_time < self.input_holdoff:
+            self.holdoff_until = now + self.input_holdoff
+        self.last_input_time = now
+
+    def time_until_frame(self, now=None):
+        """
+        次のフレームを描画できるまでの時間（秒）
+
+        Returns:
+            float: 0以下なら今すぐ描画できる
+        """
+        if self.last_frame_time is None:
+            return 0
+        if now is None:
+            now = time.monotonic()
+        return self.last_frame_time + self.frame_interval - now
+
+    def service(self, now=None, busy=False):
+        """
+        dirtyまたはアニメーション中で、フレーム間隔を過ぎていれば描画する
+        メインループから毎回呼ぶ
+
+        Args:
+            now: 現在時刻 (Noneなら time.monotonic())
+            busy: 入力やHIDの処理待ちがあるか (Trueならアニメーションのフレームを捨てる)
+
+        Returns:
+            bool: 描画したかどうか
+        """
+        if not self.dirty and not self.animating:
+            return False
+        if now is None:
+            now = time.monotonic()
+        if self.time_until_frame(now) > 0:
+            return False
+        self.last_frame_time = now
+        if now < self.holdoff_until:
+            # 入力が続いている: 次の入力が描画を待たないように、アニメーションは最後の状態に飛ばす
+            busy = True
+        if not self.dirty and busy:
+            # アニメーションだけのフレームは捨てる（位置は時刻で決まるので次のフレームで追いつく）
+            self.dropped += 1
+            return False
+        if self.dirty:
+            self.dirty = False
+            self.render()
+        if self.animate:
+            # 処理待ちがあるときや前のフレームが予算を超えたときは最後の状態に飛ばす
+            skip = busy or (self.frame_budget and self.frame_cost > self.frame_budget)
+            if skip and self.animating:
+                self.dropped += 1
+            self.animating = self.animate(now, skip)
+            if self.animating:
+                self.animation_frames += 1
+        start = time.monotonic()
+        self.display.refresh()
+        end = time.monotonic()
+        self.refresh_cost = end - start
+        if self.refresh_cost > self.max_refresh_cost:
+            self.max_refresh_cost = self.refresh_cost
+        self.frames += 1
+        self.frame_cost = end - now
+        return True
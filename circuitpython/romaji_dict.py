@@ -0,0 +1,119 @@
+# SPDX-FileCopyrightText: 2025 Takuya Urakawa (@hsgw 5z6p.com)
+# SPDX-License-Identifier: MIT
+
+"""
+ローマ字辞書
+romaji.bin (host/build_romaji_dict.py で host/dict/romaji.txt から生成) のトライ木を
+RAMに読み込まず、ファイルを開いたまま必要なノードだけを読む
+1文字進めるごとの読み込みは、子ノードの並び1回と候補リスト1回だけ
+(2文字進めるときは子ノードの並び2回だけにして、候補リストは読まない: modes/japanese_mode.py)
+"""
+
+from logger import log
+
+# このファイルと同じフォルダの romaji.bin を使う
+_DICT_PATH = __file__[:__file__.rfind('/') + 1] + 'romaji.bin'
+
+_HEADER_SIZE = 8
+_NODE_SIZE = 8
+_NO_CANDIDATES = 0xFFFF
+
+
+class RomajiDict:
+    """
+    フラッシュ上のローマ字トライ木
+    ノードは (子ノード数, 最初の子ノード番号, 候補リストの位置) のタプルで扱う
+    """
+
+    def __init__(self, path=_DICT_PATH):
+        self._file = open(path, 'rb')
+        header = self._file.read(_HEADER_SIZE)
+        if len(header) != _HEADER_SIZE or header[:4] != b'RMJ1':
+            self._file.close()
+            raise ValueError("bad romaji dictionary: %s" % path)
+        node_count = header[4] | (header[5] << 8)
+        self._candidate_base = _HEADER_SIZE + node_count * _NODE_SIZE
+        # 読み込み用のバッファ（毎回確保しない）
+        self._children = bytearray(header[6] * _NODE_SIZE)
+        self._children_view = memoryview(self._children)
+        self._list = bytearray(header[7])
+        self.reads = 0  # ファイルを読んだ回数（1イベントの読み込み回数の制限とベンチマーク用）
+        self.root = self._read_root()
+
+    def _read(self, offset, view):
+        self._file.seek(offset)
+        self.reads += 1
+        return self._file.readinto(view)
+
+    def _read_root(self):
+        view = self._children_view[:_NODE_SIZE]
+        self._read(_HEADER_SIZE, view)
+        return self._node(self._children, 0)
+
+    @staticmethod
+    def _node(buf, i):
+        return (buf[i + 1], buf[i + 2] | (buf[i + 3] << 8), buf[i + 4] | (buf[i + 5] << 8))
+
+    def child(self, node, char):
+        """
+        Args:
+            node: 親ノード
+            char: 次の1文字
+        Returns:
+            tuple or None: 子ノード（辞書にない綴りならNone）
+        """
+        count, first, _ = node
+        if not count:
+            return None
+        code = ord(char)
+        buf = self._children
+        self._read(_HEADER_SIZE + first * _NODE_SIZE, self._children_view[:count * _NODE_SIZE])
+        for i in range(0, count * _NODE_SIZE, _NODE_SIZE):
+            if buf[i] == code:
+                return self._node(buf, i)
+        return None
+
+    def candidates(self, node, limit):
+        """
+        ノードより長い語の残りの部分を優先度順に最大 limit 個
+
+        Returns:
+            list: 候補（ノードまでの文字を除いた文字列）
+        """
+        offset = node[2]
+        if offset == _NO_CANDIDATES or not limit:
+            return []
+        buf = self._list
+        size = self._read(self._candidate_base + offset, buf)
+        result = []
+        pos = 1
+        for _ in range(min(buf[0], limit)):
+            end = pos + 1 + buf[pos]
+            if end > size:
+                break
+            result.append(str(bytes(buf[pos + 1:end]), 'ascii'))
+            pos = end
+        return result
+
+    def close(self):
+        self._file.close()
+
+
+_dictionary = None
+
+
+def get_romaji_dict():
+    """
+    全モードで共有する辞書を取得（最初に使うときに開く）
+
+    Returns:
+        RomajiDict or None: 辞書がなければNone
+    """
+    global _dictionary
+    if _dictionary is None:
+        try:
+            _dictionary = RomajiDict()
+        except (OSError, ValueError) as e:
+            log.warning("Romaji dictionary disabled: %s", e)
+            _dictionary = False
+    return _dictionary or None
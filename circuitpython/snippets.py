@@ -0,0 +1,207 @@
+# SPDX-FileCopyrightText: 2025 Takuya Urakawa (@hsgw 5z6p.com)
+# SPDX-License-Identifier: MIT
+
+"""
+スニペット (定型文・マクロ)
+CIRCUITPY のスニペットファイルの目次を最初に使うときに1回だけ作り、
+選ばれたスニペットは少しずつ読みながら送る（スニペット全体をRAMに読み込まない）
+
+ファイルの書式 (ASCII):
+    [名前]
+    本文 (複数行可, 改行はEnterとして送る)
+    [次の名前]
+    ...
+
+- 最初の [名前] より前の行は読み飛ばす（コメント用）
+- 本文の最後の改行と空行は送らない（最後にEnterを送るときは {ENTER}）
+- {CTRL+V}, {ENTER}, {CTRL+SHIFT+T} のように {} で囲むとキー操作
+  (修飾キー CTRL, SHIFT, ALT, GUI と、Keycode の名前または1文字を + でつなぐ)
+- { そのものは {{ と書く
+"""
+
+from adafruit_hid.keycode import Keycode
+from config import SNIPPETS_FILE
+from keyboard_layout import get_layout
+from logger import log
+
+# 相対パスはこのファイルと同じフォルダ (CIRCUITPY のルート) から
+_BASE_DIR = __file__[:__file__.rfind('/') + 1]
+
+_BRACE_OPEN = 0x7B  # '{'
+_BRACE_CLOSE = b'}'
+_MAX_CHORD = 32  # {...} の最大の長さ
+
+# Keycode の別名
+_KEY_ALIASES = {
+    'CTRL': 'CONTROL',
+    'ESC': 'ESCAPE',
+    'DEL': 'DELETE',
+    'BS': 'BACKSPACE',
+    'CMD': 'GUI',
+    'WIN': 'GUI',
+    'UP': 'UP_ARROW',
+    'DOWN': 'DOWN_ARROW',
+    'LEFT': 'LEFT_ARROW',
+    'RIGHT': 'RIGHT_ARROW',
+}
+
+
+def parse_chord(name):
+    """
+    'CTRL+V' のようなキー操作をキーコードのタプルにする
+
+    Returns:
+        tuple or None: 同時に押すキーコード（わからない名前があればNone）
+    """
+    keycodes = []
+    for part in name.upper().split('+'):
+        part = _KEY_ALIASES.get(part, part)
+        if len(part) == 1:
+            # 1文字はレイアウトの表で引く（AZERTYなどでも同じ文字のキーになる）
+            key = get_layout().lookup(part.lower())
+            if key is None:
+                return None
+            keycode, modifier = key
+            if modifier & Keycode.modifier_bit(Keycode.SHIFT):
+                keycodes.append(Keycode.SHIFT)
+            if modifier & Keycode.modifier_bit(Keycode.RIGHT_ALT):
+                keycodes.append(Keycode.RIGHT_ALT)
+            keycodes.append(keycode)
+        else:
+            keycode = getattr(Keycode, part, None)
+            if keycode is None:
+                return None
+            keycodes.append(keycode)
+    return tuple(keycodes)
+
+
+class SnippetStream:
+    """1つのスニペットの本文を、文字列とキー操作に分けて少しずつ読む"""
+
+    def __init__(self, path, offset, length, chunk_size):
+        self._file = open(path, 'rb')
+        self._pos = offset
+        self._end = offset + length
+        self._chunk_size = chunk_size
+        self._buf = b''
+        self.sent = 0  # 読み終えたバイト数（進み具合の表示用）
+        self.length = length
+
+    def _fill(self, size):
+        """バッファの後ろにファイルの続きを読み足す"""
+        size = min(size, self._end - self._pos)
+        if size <= 0:
+            return False
+        self._file.seek(self._pos)
+        data = self._file.read(size)
+        self._pos += len(data)
+        self._buf += data
+        return bool(data)
+
+    def next_item(self):
+        """
+        次の文字列（最大 chunk_size 文字）またはキー操作
+
+        Returns:
+            str, tuple or None: 文字列、キーコードのタプル、終わりならNone
+        """
+        if not self._buf and not self._fill(self._chunk_size):
+            return None
+        buf = self._buf
+        if buf[0] == _BRACE_OPEN:
+            # {...} がチャンクの境目で切れていたら読み足す
+            close = buf.find(_BRACE_CLOSE)
+            while close < 0 and len(buf) < _MAX_CHORD and self._fill(_MAX_CHORD):
+                buf = self._buf
+                close = buf.find(_BRACE_CLOSE)
+            if buf[1:2] == b'{':
+                return self._take(2, '{')
+            if close > 0:
+                name = str(buf[1:close], 'ascii')
+                chord = parse_chord(name)
+                if chord:
+                    self._take(close + 1, None)
+                    return chord
+                log.warning("Unknown key in snippet: {%s}", name)
+            # 閉じていない・わからない { は文字として送る
+            return self._take(1, '{')
+        # キー操作の読み足しでバッファが長くなっていても chunk_size 文字まで
+        size = min(len(buf), self._chunk_size)
+        brace = buf.find(b'{', 0, size)
+        return self._take(size if brace < 0 else brace, None, text=True)
+
+    def _take(self, size, value, text=False):
+        """バッファの先頭 size バイトを消費する"""
+        data = self._buf[:size]
+        self._buf = self._buf[size:]
+        self.sent += size
+        if not text:
+            return value
+        # ASCII以外とCRは送らない
+        if max(data) >= 0x80 or b'\r' in data:
+            data = bytes(b for b in data if b < 0x80 and b != 0x0D)
+        return str(data, 'ascii')
+
+    def close(self):
+        self._file.close()
+
+
+class SnippetFile:
+    """スニペットファイルと、その目次 (名前, 本文の位置, 本文の長さ)"""
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = self._scan()
+
+    def _scan(self):
+        entries = []
+        name = None
+        start = end = offset = 0
+        with open(self.path, 'rb') as f:
+            while True:
+                line = f.readline()
+                if not line:
+                    break
+                stripped = line.strip()
+                if stripped.startswith(b'[') and stripped.endswith(b']') and len(stripped) > 2:
+                    if name is not None:
+                        entries.append((name, start, end - start))
+                    name = str(stripped[1:-1], 'ascii')
+                    start = end = offset + len(line)
+                elif name is not None and stripped:
+                    # 最後に中身のある行の終わり（改行は含めない）
+                    end = offset + len(line.rstrip(b'\r\n'))
+                offset += len(line)
+        if name is not None:
+            entries.append((name, start, end - start))
+        return entries
+
+    def names(self):
+        return [entry[0] for entry in self.entries]
+
+    def open_stream(self, index, chunk_size):
+        """index 番目のスニペットを読み始める"""
+        _, offset, length = self.entries[index]
+        return SnippetStream(self.path, offset, length, chunk_size)
+
+
+_snippets = None
+
+
+def get_snippets():
+    """
+    スニペットファイルを取得（目次は最初の1回だけ作る）
+
+    Returns:
+        SnippetFile or None: ファイルがなければNone
+    """
+    global _snippets
+    if _snippets is None:
+        path = SNIPPETS_FILE if SNIPPETS_FILE.startswith('/') else _BASE_DIR + SNIPPETS_FILE
+        try:
+            _snippets = SnippetFile(path)
+            log.info("Snippets: %d in %s", len(_snippets.entries), path)
+        except (OSError, UnicodeError) as e:
+            log.warning("Snippets disabled: %s", e)
+            _snippets = False
+    return _snippets or None
@@ -4,15 +4,93 @@
 """
 スイッチハンドラー
 ダブルクリック検出機能を持つスイッチ管理クラス
+- SwitchHandler: digitalioでメインループごとに状態を読む
+- KeypadSwitchHandler: keypad.Keysのイベントキュー（バックグラウンドでデバウンス）を使い、
+  イベントのタイムスタンプで判定する
 """
 
-import time
 import digitalio
+import keypad
+from supervisor import ticks_ms
+
+_TICKS_PERIOD = 1 << 29
+_TICKS_MAX = _TICKS_PERIOD - 1
+_TICKS_HALFPERIOD = _TICKS_PERIOD // 2
+
+
+def ticks_diff(ticks1, ticks2):
+    """supervisor.ticks_ms() の差分（ラップアラウンド対応, ミリ秒）"""
+    diff = (ticks1 - ticks2) & _TICKS_MAX
+    return ((diff + _TICKS_HALFPERIOD) & _TICKS_MAX) - _TICKS_HALFPERIOD
+
+
+class ClickClassifier:
+    """押下/解放の時刻からクリック・ダブルクリック・長押しを判定する"""
+
+    def __init__(self, double_click_threshold, long_press_threshold):
+        """
+        Args:
+            double_click_threshold: ダブルクリック判定時間（秒）
+            long_press_threshold: 長押し判定時間（秒）
+        """
+        self.double_click_ms = int(double_click_threshold * 1000)
+        self.long_press_ms = int(long_press_threshold * 1000)
+        self.pressed = False
+        self.last_click_time = 0
+        self.press_start_time = 0
+        self.waiting_for_double_click = False
+        self.long_press_active = False
+        # Trueならダブルクリックを待たずに解放時にシングルクリックを出す
+        self.immediate_click = False
+
+    def is_idle(self):
+        """押されておらず、ダブルクリックの判定も待っていないか"""
+        return not self.pressed and not self.waiting_for_double_click
+
+    def check_timeout(self, now):
+        """ダブルクリック待ちの時間切れ（シングルクリック確定）なら 'timeout'"""
+        if self.waiting_for_double_click and ticks_diff(now, self.last_click_time) >= self.double_click_ms:
+            self.waiting_for_double_click = False
+            return 'timeout'  # シングルクリックとして処理
+        return None
+
+    def check_long_press(self, now):
+        """押されたまま長押し時間を過ぎたら 'long_press'"""
+        if self.pressed and not self.long_press_active:
+            if ticks_diff(now, self.press_start_time) >= self.long_press_ms:
+                self.long_press_active = True
+                self.waiting_for_double_click = False  # Cancel potential click
+                return 'long_press'
+        return None
+
+    def press(self, now):
+        """押されたとき"""
+        self.pressed = True
+        self.press_start_time = now
+        self.long_press_active = False  # Reset flag on new press
+
+    def release(self, now):
+        """離されたとき。2回目のクリックなら 'double'"""
+        self.pressed = False
+        # 長押し済みでなければクリック処理へ
+        if self.long_press_active:
+            return None
+        # ダブルクリックを使わないモードでは待たずに確定
+        if self.immediate_click:
+            return 'timeout'
+        # ダブルクリック判定
+        if self.waiting_for_double_click and ticks_diff(now, self.last_click_time) < self.double_click_ms:
+            self.waiting_for_double_click = False
+            return 'double'
+        # 1回目のクリック: 待機状態にする
+        self.waiting_for_double_click = True
+        self.last_click_time = now
+        return None
 
 
 class SwitchHandler:
     """ダブルクリック検出機能を持つスイッチハンドラー"""
-    
+
     def __init__(self, switch_pin, double_click_threshold=0.3, long_press_threshold=0.5):
         """
         Args:
@@ -20,63 +98,122 @@ class SwitchHandler:
             double_click_threshold: ダブルクリック判定時間（秒）
             long_press_threshold: 長押し判定時間（秒）
         """
-        # スイッチ (内部プルアップ抵抗を有効化)
-        self.switch = digitalio.DigitalInOut(switch_pin)
+        self.pin = switch_pin
+        self.reinit()
+
+        self.last_state = True  # 押されていない状態で初期化
+        self.classifier = ClickClassifier(double_click_threshold, long_press_threshold)
+
+    def reinit(self):
+        """スイッチのピンを使う (内部プルアップ抵抗を有効化)"""
+        self.switch = digitalio.DigitalInOut(self.pin)
         self.switch.direction = digitalio.Direction.INPUT
         self.switch.pull = digitalio.Pull.UP
-        
-        self.last_state = True  # 押されていない状態で初期化
-        self.last_click_time = 0
-        self.press_start_time = 0
-        self.double_click_threshold = double_click_threshold
-        self.long_press_threshold = long_press_threshold
-        self.waiting_for_double_click = False
-        self.long_press_active = False
-    
+
+    def deinit(self):
+        """ピンを解放する（ライトスリープのアラームに使うため）"""
+        self.switch.deinit()
+
+    def is_idle(self):
+        """押されておらず、ダブルクリックの判定も待っていないか"""
+        return self.classifier.is_idle()
+
+    def set_immediate_click(self, immediate):
+        """Trueならダブルクリックを待たずに解放時にシングルクリックを出す"""
+        self.classifier.immediate_click = immediate
+
     def update(self):
         """
         スイッチの状態を更新し、クリックイベントを検出
-        
+
         Returns:
             str or None: イベントタイプ ('timeout', 'double', 'long_press', None)
         """
         current_state = self.switch.value
-        current_time = time.monotonic()
-        event = None
-        
+        current_time = ticks_ms()
+        classifier = self.classifier
+
         # タイムアウトチェック
-        if self.waiting_for_double_click and (current_time - self.last_click_time) >= self.double_click_threshold:
-            self.waiting_for_double_click = False
-            event = 'timeout'  # シングルクリックとして処理
-        
+        event = classifier.check_timeout(current_time)
+
         # スイッチの状態変化をチェック
         if current_state != self.last_state:
             self.last_state = current_state
             # 押されたとき (プルアップなのでFalseになる)
             if not current_state:
-                self.press_start_time = current_time
-                self.long_press_active = False # Reset flag on new press
-            
+                classifier.press(current_time)
             # 離されたとき
             else:
-                # 長押し済みでなければクリック処理へ
-                if not self.long_press_active:
-                    # ダブルクリック判定
-                    is_double_click = self.waiting_for_double_click and (current_time - self.last_click_time) < self.double_click_threshold
-                    
-                    if is_double_click:
-                        self.waiting_for_double_click = False
-                        event = 'double'
-                    else:
-                        # 1回目のクリック: 待機状態にする
-                        self.waiting_for_double_click = True
-                        self.last_click_time = current_time
-        
+                event = classifier.release(current_time) or event
+
         # 長押しチェック (押されている間)
-        if not current_state and not self.long_press_active:
-            if (current_time - self.press_start_time) >= self.long_press_threshold:
-                self.long_press_active = True
-                self.waiting_for_double_click = False # Cancel potential click
-                event = 'long_press'
-        
+        event = classifier.check_long_press(current_time) or event
+
         return event
+
+
+class KeypadSwitchHandler:
+    """
+    keypad.Keys を使うスイッチハンドラー
+    デバウンスはバックグラウンドで行われ、押下/解放の時刻はイベントのタイムスタンプを使うので、
+    メインループが遅れてもクリックの判定はずれない
+    """
+
+    def __init__(self, switch_pin, double_click_threshold=0.3, long_press_threshold=0.5):
+        """
+        Args:
+            switch_pin: スイッチのピン
+            double_click_threshold: ダブルクリック判定時間（秒）
+            long_press_threshold: 長押し判定時間（秒）
+        """
+        self.pin = switch_pin
+        self.reinit()
+        self.event = keypad.Event()
+        self.classifier = ClickClassifier(double_click_threshold, long_press_threshold)
+        self.pending = []  # 判定済みで未返却のイベント
+
+    def reinit(self):
+        """スイッチのピンを使う (内部プルアップ, 押下でLow)"""
+        self.keys = keypad.Keys((self.pin,), value_when_pressed=False, pull=True)
+
+    def deinit(self):
+        """ピンを解放する（ライトスリープのアラームに使うため）"""
+        self.keys.deinit()
+
+    def is_idle(self):
+        """押されておらず、ダブルクリックの判定も待っていないか"""
+        return self.classifier.is_idle() and not self.pending
+
+    def set_immediate_click(self, immediate):
+        """Trueならダブルクリックを待たずに解放時にシングルクリックを出す"""
+        self.classifier.immediate_click = immediate
+
+    def _emit(self, event):
+        if event:
+            self.pending.append(event)
+
+    def update(self):
+        """
+        キューにたまった押下/解放イベントをすべて処理し、クリックイベントを1つ返す
+
+        Returns:
+            str or None: イベントタイプ ('timeout', 'double', 'long_press', None)
+        """
+        classifier = self.classifier
+        while self.keys.events.get_into(self.event):
+            timestamp = self.event.timestamp
+            # このイベントより前に確定していた判定を先に出す
+            self._emit(classifier.check_timeout(timestamp))
+            self._emit(classifier.check_long_press(timestamp))
+            if self.event.pressed:
+                classifier.press(timestamp)
+            else:
+                self._emit(classifier.release(timestamp))
+
+        now = ticks_ms()
+        self._emit(classifier.check_timeout(now))
+        self._emit(classifier.check_long_press(now))
+
+        if self.pending:
+            return self.pending.pop(0)
+        return None
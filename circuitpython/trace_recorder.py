@@ -0,0 +1,102 @@
+# SPDX-FileCopyrightText: 2025 Takuya Urakawa (@hsgw 5z6p.com)
+# SPDX-License-Identifier: MIT
+
+"""
+入力トレースの記録
+ModeManager に渡した入力イベント（加速後の回転量、クリック、ダブルクリック、長押し）を
+イベントが起きた時刻 (ns, キューで待った時間を含まない) とそれを処理したモード名とともに、
+起動時に確保したリングバッファへ記録する
+dump() で CIRCUITPY のテキストファイルに書き出し、host/replay_trace.py で再生できる
+(書き込むには boot.py で storage.remount("/", readonly=False) が必要)
+
+書き出す形式 (1行1イベント, '#' 以降はコメント):
+    <時刻ns> <モード名> rotation <回転量>
+    <時刻ns> <モード名> single | double | long_press
+"""
+
+import struct
+import sys
+import time
+
+from logger import log
+
+KINDS = ('rotation', 'single', 'double', 'long_press')
+
+# 時刻ns, 種類, モード番号, 値
+_RECORD = '<qBBh'
+_RECORD_SIZE = struct.calcsize(_RECORD)
+
+
+class TraceRecorder:
+    """入力イベントのリングバッファ (1イベント12バイト)"""
+
+    def __init__(self, size, path):
+        """
+        Args:
+            size: 記録するイベント数（古いものから上書き）
+            path: dump() の書き出し先
+        """
+        self.size = size
+        self.path = path
+        self.buffer = bytearray(size * _RECORD_SIZE)
+        self.count = 0  # 記録したイベントの総数
+        self.modes = []  # モード番号 -> モード名
+
+    def record(self, kind, mode_name, value=0, timestamp_ns=None):
+        """
+        イベントを記録（メモリは確保しない, モード名は初めてのときだけ一覧に追加）
+
+        Args:
+            kind: KINDS のどれか
+            mode_name: イベントを処理するモード名
+            value: 回転量 (rotation のみ)
+            timestamp_ns: イベントの時刻 (time.monotonic_ns() の単位, Noneなら今)
+        """
+        try:
+            mode = self.modes.index(mode_name)
+        except ValueError:
+            mode = len(self.modes)
+            self.modes.append(mode_name)
+        value = max(-32768, min(32767, value))
+        if timestamp_ns is None:
+            timestamp_ns = time.monotonic_ns()
+        struct.pack_into(_RECORD, self.buffer, (self.count % self.size) * _RECORD_SIZE,
+                         timestamp_ns, KINDS.index(kind), mode, value)
+        self.count += 1
+
+    def events(self):
+        """記録したイベントを古い順に返す (時刻ns, 種類, モード名, 値)"""
+        start = max(0, self.count - self.size)
+        for i in range(start, self.count):
+            t, kind, mode, value = struct.unpack_from(
+                _RECORD, self.buffer, (i % self.size) * _RECORD_SIZE)
+            yield t, KINDS[kind], self.modes[mode], value
+
+    def write(self, f):
+        """テキスト形式で書き出す"""
+        kept = min(self.count, self.size)
+        f.write("# input trace: %d events (%d recorded, %d overwritten)\n"
+                % (kept, self.count, self.count - kept))
+        for t, kind, mode, value in self.events():
+            if kind == 'rotation':
+                f.write("%d %s %s %d\n" % (t, mode, kind, value))
+            else:
+                f.write("%d %s %s\n" % (t, mode, kind))
+
+    def dump(self):
+        """
+        path に書き出す（書き込めなければシリアルコンソールに出力）
+
+        Returns:
+            bool: ファイルに書き出せたかどうか
+        """
+        try:
+            with open(self.path, 'w') as f:
+                self.write(f)
+            log.info("Input trace: %d events written to %s", min(self.count, self.size), self.path)
+            return True
+        except OSError as e:
+            # CIRCUITPY はboot.pyでremountしないと書き込めない
+            print("input trace: cannot write %s (%s)" % (self.path, e))
+            self.write(sys.stdout)
+            return False
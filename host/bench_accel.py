@@ -0,0 +1,123 @@
+# SPDX-FileCopyrightText: 2025 Takuya Urakawa (@hsgw 5z6p.com)
+# SPDX-License-Identifier: MIT
+
+"""
+エンコーダ加速のベンチマーク
+
+BasicMode と EncoderAccelerator を直接動かし、サンプル文を入力するのに
+必要なクリック数（デテント数）を加速あり/なしで比較する
+
+利用者モデル:
+- 目標の文字まで近い向きに回す
+- 残りが多いときは速く、近づいたらゆっくり回す（行き過ぎない）
+- 目標の文字でシングルクリックして入力する
+
+使い方:
+    python3 host/bench_accel.py [corpus.txt]
+"""
+
+import os
+import sys
+
+HOST_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.join(os.path.dirname(HOST_DIR), 'circuitpython')
+sys.path.insert(0, os.path.join(HOST_DIR, 'sim'))
+
+from hostsim import SIM, load_project  # noqa: E402
+
+# (残りステップ数の下限, 1クリックの間隔[秒])  残りが多いほど速く回す
+SPEED_MODEL = ((8, 0.025), (3, 0.05), (0, 0.2))
+
+
+def detent_interval(remaining):
+    for min_remaining, interval in SPEED_MODEL:
+        if remaining >= min_remaining:
+            return interval
+    return SPEED_MODEL[-1][1]
+
+
+def type_text(text, curves, config=None):
+    """
+    文字列を入力するのに必要なデテント数を数える
+
+    Args:
+        text: 入力する文字列
+        curves: ENCODER_ACCEL_CURVES と同じ形式の加速カーブ
+        config: config モジュールの上書き
+
+    Returns:
+        tuple: (デテント数, 入力した文字数, 押下レポートのキーコード列)
+    """
+    SIM.reset()
+    load_project(PROJECT_DIR, config)
+    from adafruit_hid.keyboard import Keyboard
+    import usb_hid
+    from mode_manager import ModeManager
+    from modes.basic_mode import BasicMode
+    from encoder_accel import EncoderAccelerator
+
+    mode_manager = ModeManager()
+    mode = BasicMode(Keyboard(usb_hid.devices))
+    mode_manager.add_mode(mode)
+    mode_manager.set_mode("Basic")
+    accel = EncoderAccelerator(curves)
+
+    char_list = mode.char_list
+    size = len(char_list)
+    now = 0.0
+    detents = 0
+    typed = 0
+    for char in text:
+        if char not in char_list:
+            continue
+        target = char_list.index(char)
+        while True:
+            index = mode.get_state('char_index', 0)
+            forward = (target - index) % size
+            if forward == 0:
+                break
+            backward = size - forward
+            direction = 1 if forward <= backward else -1
+            remaining = min(forward, backward)
+            now += detent_interval(remaining)
+            mode_manager.post('rotation', accel.apply(direction, now, "Basic"))
+            mode_manager.dispatch()
+            detents += 1
+        now += 0.3
+        mode_manager.post('single')
+        mode_manager.dispatch()
+        typed += 1
+    keycodes = [report[2] for _, report, _, _ in SIM.reports if report[2]]
+    return detents, typed, keycodes
+
+
+def main(argv):
+    path = argv[0] if argv else os.path.join(HOST_DIR, 'corpus', 'sample_en.txt')
+    with open(path) as f:
+        text = f.read().lower()
+
+    saved_stdout = sys.stdout
+    sys.stdout = open(os.devnull, 'w')
+    try:
+        load_project(PROJECT_DIR)
+        import config
+        curves = config.ENCODER_ACCEL_CURVES
+        off = type_text(text, {})
+        on = type_text(text, curves)
+    finally:
+        sys.stdout.close()
+        sys.stdout = saved_stdout
+
+    if off[2] != on[2]:
+        print("error: typed output differs with acceleration")
+        return 1
+    print("corpus: %s (%d chars typed)" % (os.path.basename(path), off[1]))
+    print("curve : %s" % (curves.get('Basic'),))
+    print("%-12s %8s %14s" % ("accel", "detents", "detents/char"))
+    for name, result in (("off", off), ("on", on)):
+        print("%-12s %8d %14.2f" % (name, result[0], result[0] / result[1]))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,147 @@
+# SPDX-FileCopyrightText: 2025 Takuya Urakawa (@hsgw 5z6p.com)
+# SPDX-License-Identifier: MIT
+
+"""
+カルーセルのスライド (CAROUSEL_SLIDE_TIME) のベンチマーク（実機なし）
+
+host/traces の基本・日本語モードの入力で code.py を動かし、スライドなし / あり /
+あり（入力が続いてもアニメーションを止めない: ANIMATION_INPUT_HOLDOFF = 0）/
+あり（フレームの予算なし）で、入力からHIDのキー押下までのレイテンシ (p99/最大) と
+フレーム数・アニメーションのフレーム数・捨てたフレーム数・1フレームの最大の描画時間を比べる
+描画中のフレームは止められないので、アニメーションを止めないと、続けて回したときの入力が
+1フレームの描画時間（400kHz で約21ms）待たされることがある
+
+既定 (--cpu-scale 0) ではホストの処理時間を仮想時刻に含めず、フレームの描画時間は
+変わったページの I2C 転送時間だけになるので、何度実行しても同じ結果になる
+--cpu-scale N (N > 0) ではホストの処理時間を N 倍して加えるので結果が実行ごとに揺れる。
+--repeat R で R 回実行し、p99/最大の中央値と [最小-最大] を表示する
+
+OLEDのI2Cクロック (I2C_FREQUENCY) は --i2c-frequency (既定 400kHz) で、
+全画面（8ページ 約1KB）の転送は 100kHz で約96ms, 400kHz で約24ms かかる
+（スライドではフッターのページは送らないので 400kHz で約21ms, 予算 25ms に収まる）
+
+使い方:
+    python3 host/bench_animation.py [--cpu-scale N] [--repeat R] [--i2c-frequency HZ] [--slide-time 秒]
+"""
+
+import os
+import sys
+
+HOST_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.join(os.path.dirname(HOST_DIR), 'circuitpython')
+sys.path.insert(0, os.path.join(HOST_DIR, 'sim'))
+sys.path.insert(0, HOST_DIR)
+
+from hostsim import SIM, load_trace, run_code, percentile  # noqa: E402
+from bench_latency import key_down_latencies  # noqa: E402
+
+TRACES = (
+    ('basic.trace', 'Basic'),
+    ('japanese.trace', 'Japanese'),
+)
+
+
+def run(trace_name, mode, loop, config, cpu_scale, i2c_frequency):
+    """
+    Returns:
+        dict: レイテンシとフレームの統計
+    """
+    frame_costs = []
+
+    def setup():
+        import render_scheduler
+
+        service = render_scheduler.RenderScheduler.service
+
+        def measured_service(self, now=None, busy=False):
+            drawn = service(self, now, busy)
+            if drawn:
+                frame_costs.append(self.frame_cost)
+            return drawn
+        render_scheduler.RenderScheduler.service = measured_service
+
+    overrides = {'INITIAL_MODE': mode, 'MAIN_LOOP': loop, 'I2C_FREQUENCY': i2c_frequency}
+    overrides.update(config)
+    trace = load_trace(os.path.join(HOST_DIR, 'traces', trace_name))
+    g = run_code(PROJECT_DIR, trace, overrides, cpu_scale=cpu_scale, setup=setup)
+    scheduler = g['render_scheduler']
+    result = {}
+    for kind in ('rotation', 'click'):
+        latencies = []
+        for values in key_down_latencies(SIM.reports, kind).values():
+            latencies.extend(values)
+        result[kind] = (percentile(latencies, 99), max(latencies))
+    result.update({
+        'frames': scheduler.frames,
+        'animation_frames': scheduler.animation_frames,
+        'dropped': scheduler.dropped,
+        'max_frame_ms': max(frame_costs) * 1000,
+    })
+    return result
+
+
+def median(values):
+    return sorted(values)[len(values) // 2]
+
+
+def format_latency(runs, kind):
+    """p99/最大 (複数回なら中央値と [p99 の最小-最大])"""
+    p99 = [r[kind][0] for r in runs]
+    worst = [r[kind][1] for r in runs]
+    text = "%6.1f/%6.1f" % (median(p99), median(worst))
+    if len(runs) > 1:
+        text += " [%5.1f-%5.1f]" % (min(p99), max(p99))
+    return text
+
+
+def main(argv):
+    cpu_scale = 0.0
+    repeat = 1
+    i2c_frequency = 400000
+    slide_time = 0.08
+    args = list(argv)
+    while args:
+        arg = args.pop(0)
+        if arg == '--cpu-scale':
+            cpu_scale = float(args.pop(0))
+        elif arg == '--repeat':
+            repeat = int(args.pop(0))
+        elif arg == '--i2c-frequency':
+            i2c_frequency = int(args.pop(0))
+        elif arg == '--slide-time':
+            slide_time = float(args.pop(0))
+        else:
+            print(__doc__)
+            return 2
+    if not cpu_scale:
+        repeat = 1  # 仮想時刻だけで決まるので毎回同じ
+
+    configs = (
+        ('off', {'CAROUSEL_SLIDE_TIME': 0}),
+        ('slide', {'CAROUSEL_SLIDE_TIME': slide_time}),
+        ('no holdoff', {'CAROUSEL_SLIDE_TIME': slide_time, 'ANIMATION_INPUT_HOLDOFF': 0}),
+        ('no budget', {'CAROUSEL_SLIDE_TIME': slide_time, 'ANIMATION_FRAME_BUDGET': 0}),
+    )
+    width = 13 if repeat == 1 else 27
+    print("I2C %dkHz, cpu-scale %g x%d, slide %.0f ms, latency = input -> HID key down p99/max ms"
+          % (i2c_frequency // 1000, cpu_scale, repeat, slide_time * 1000))
+    print("%-10s %-6s %-10s %*s %*s %7s %7s %8s %9s" % (
+        "trace", "loop", "carousel", width, "rotation", width, "click",
+        "frames", "anim", "dropped", "frame ms"))
+    for trace_name, mode in TRACES:
+        for loop in ('poll', 'async'):
+            for name, config in configs:
+                runs = [run(trace_name, mode, loop, config, cpu_scale, i2c_frequency)
+                        for _ in range(repeat)]
+                print("%-10s %-6s %-10s %*s %*s %7d %7d %8d %9.1f" % (
+                    mode, loop, name, width, format_latency(runs, 'rotation'),
+                    width, format_latency(runs, 'click'),
+                    median([r['frames'] for r in runs]),
+                    median([r['animation_frames'] for r in runs]),
+                    median([r['dropped'] for r in runs]),
+                    median([r['max_frame_ms'] for r in runs])))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,235 @@
+# SPDX-FileCopyrightText: 2025 Takuya Urakawa (@hsgw 5z6p.com)
+# SPDX-License-Identifier: MIT
+
+"""
+イベントキュー (ModeManager.post / dispatch) のベンチマーク
+
+1. まとめても結果が変わらないことの確認
+   ランダムな入力列（同じ向きの回転の連続、反転、クリック、ダブルクリック、長押し）を
+   1イベントずつ処理した場合と、BURST イベントずつ積んでから処理した場合（処理が遅れて
+   同じ向きの回転がまとめられる）で、送信したHIDレポートと最後のモードが一致するかを調べる
+2. キューがあふれたときの確認
+   キューの長さを OVERFLOW_QUEUE_SIZE にして OVERFLOW_BURST イベントずつ積み、
+   スイッチのイベント（クリック、ダブルクリック、長押し）が1つも捨てられないこと、
+   逆向きの回転にまとめた回転（反転が消える）と、前のイベントが同じ向きの回転ではないのに
+   まとめてよいとなっている回転がないことと、捨てた・まとめた回転の数、キューの最大の長さを調べる
+3. code.py を host/traces の入力で動かし、キューの統計（最大の長さ、まとめた数、捨てた数、
+   最大の待ち時間）をメインループ別に表示する
+
+使い方:
+    python3 host/bench_events.py [--cpu-scale N] [--sequences N] [--burst N]
+"""
+
+import os
+import random
+import sys
+
+HOST_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.join(os.path.dirname(HOST_DIR), 'circuitpython')
+sys.path.insert(0, os.path.join(HOST_DIR, 'sim'))
+sys.path.insert(0, HOST_DIR)
+
+from hostsim import SIM, load_project, load_trace, run_code, use_sim_time  # noqa: E402
+from bench_latency import DEFAULT_TRACES  # noqa: E402
+from replay_trace import MODES  # noqa: E402
+
+OVERFLOW_QUEUE_SIZE = 4
+OVERFLOW_BURST = 32
+SWITCH_KINDS = ('single', 'double', 'long_press')
+
+
+def random_events(rng, count):
+    """同じ向きの回転が続きやすいランダムな入力列"""
+    events = []
+    direction = 1
+    while len(events) < count:
+        r = rng.random()
+        if r < 0.1:
+            events.append(('single', 0))
+        elif r < 0.13:
+            events.append(('double', 0))
+        elif r < 0.14:
+            events.append(('long_press', 0))
+        else:
+            if r < 0.35:
+                direction = -direction
+            for _ in range(rng.randint(1, 6)):
+                events.append(('rotation', direction * rng.choice((1, 1, 1, 2, 4))))
+    return events[:count]
+
+
+def play(mode_name, events, burst, queue_size=None):
+    """
+    Args:
+        queue_size: EVENT_QUEUE_SIZE (Noneなら burst 以上にしてあふれないようにする)
+
+    Returns:
+        tuple: (HIDレポートの列, 最後のモード名, event_stats, 処理したイベントの種類の列)
+            event_stats には post() ごとに調べた 'opposite_merged' (逆向きの回転にまとめた数) と
+            'stale_flags' (まとめてよいの印が前のイベントと合わない数) を加える
+    """
+    SIM.reset(cpu_scale=0)
+    use_sim_time()
+    try:
+        load_project(PROJECT_DIR, {'EVENT_QUEUE_SIZE': queue_size or max(16, burst)})
+        from adafruit_hid.keyboard import Keyboard
+        import usb_hid
+        from mode_manager import ModeManager
+        manager = ModeManager(None, Keyboard(usb_hid.devices))
+        for name, module_name, class_name in MODES:
+            manager.register_mode(name, module_name, class_name)
+        manager.set_mode(mode_name)
+        dispatched = []
+        dispatch_event = manager._dispatch_event
+
+        def recorded_dispatch(kind, value, timestamp=None):
+            dispatched.append(kind)
+            dispatch_event(kind, value, timestamp)
+        manager._dispatch_event = recorded_dispatch
+        checks = {'opposite_merged': 0, 'stale_flags': 0}
+        post = manager.post
+
+        def checked_post(kind, value=0, timestamp=None):
+            before = [(event, event[2]) for event in manager.events]
+            result = post(kind, value, timestamp)
+            for event, old in before:
+                if event[2] != old and (event[2] - old) * old < 0:
+                    checks['opposite_merged'] += 1
+            queue = manager.events
+            for i in range(1, len(queue)):
+                previous, event = queue[i - 1], queue[i]
+                if event[3] and (previous[1] != 'rotation' or previous[2] * event[2] < 0):
+                    checks['stale_flags'] += 1
+            return result
+        manager.post = checked_post
+        for i, (kind, value) in enumerate(events):
+            manager.post(kind, value)
+            if (i + 1) % burst == 0:
+                manager.dispatch()
+        manager.dispatch()
+        reports = [report for _, report, _, _ in SIM.reports]
+        stats = dict(manager.event_stats)
+        stats.update(checks)
+        return reports, manager.current_mode.name, stats, dispatched
+    finally:
+        use_sim_time(False)
+
+
+def check_coalescing(sequences, burst):
+    """
+    Returns:
+        list: [(モード名, イベント数, まとめた数, キューの最大の長さ, 一致しなかった入力列の数), ...]
+    """
+    rows = []
+    for mode_name in ("Basic", "Japanese", "Utility"):
+        rng = random.Random(mode_name)
+        total = coalesced = depth = mismatch = 0
+        for _ in range(sequences):
+            events = random_events(rng, 200)
+            expected = play(mode_name, events, 1)
+            result = play(mode_name, events, burst)
+            total += len(events)
+            coalesced += result[2]['coalesced']
+            depth = max(depth, result[2]['max_depth'])
+            if result[:2] != expected[:2]:
+                mismatch += 1
+        rows.append((mode_name, total, coalesced, depth, mismatch))
+    return rows
+
+
+def check_overflow(sequences):
+    """
+    Returns:
+        list: [(モード名, スイッチのイベント数, 失われたスイッチのイベント数, 捨てた回転, まとめた回転,
+                逆向きにまとめた回転, 合わないまとめてよいの印, キューの最大の長さ), ...]
+    """
+    rows = []
+    for mode_name in ("Basic", "Japanese", "Utility"):
+        rng = random.Random(mode_name + " overflow")
+        switches = lost = dropped = coalesced = opposite = stale = depth = 0
+        for _ in range(sequences):
+            events = random_events(rng, 200)
+            _, _, stats, dispatched = play(mode_name, events, OVERFLOW_BURST, OVERFLOW_QUEUE_SIZE)
+            posted = [kind for kind, _ in events if kind in SWITCH_KINDS]
+            switches += len(posted)
+            lost += len(posted) - len([kind for kind in dispatched if kind in SWITCH_KINDS])
+            dropped += stats['dropped']
+            coalesced += stats['coalesced']
+            opposite += stats['opposite_merged']
+            stale += stats['stale_flags']
+            depth = max(depth, stats['max_depth'])
+        rows.append((mode_name, switches, lost, dropped, coalesced, opposite, stale, depth))
+    return rows
+
+
+def queue_stats(cpu_scale):
+    """
+    Returns:
+        list: [(起動モード, メインループ, event_stats), ...]
+    """
+    rows = []
+    for name, mode in DEFAULT_TRACES:
+        trace = load_trace(os.path.join(HOST_DIR, 'traces', name))
+        for loop in ('poll', 'async'):
+            g = run_code(PROJECT_DIR, trace, {'INITIAL_MODE': mode, 'MAIN_LOOP': loop},
+                         cpu_scale=cpu_scale)
+            rows.append((mode, loop, dict(g['mode_manager'].event_stats)))
+    return rows
+
+
+def main(argv):
+    cpu_scale = 20.0
+    sequences = 20
+    burst = 8
+    while argv[:1] and argv[0].startswith('--'):
+        if argv[0] == '--cpu-scale':
+            cpu_scale = float(argv[1])
+        elif argv[0] == '--sequences':
+            sequences = int(argv[1])
+        elif argv[0] == '--burst':
+            burst = int(argv[1])
+        argv = argv[2:]
+
+    saved_stdout = sys.stdout
+    sys.stdout = open(os.devnull, 'w')
+    try:
+        coalescing = check_coalescing(sequences, burst)
+        overflow = check_overflow(sequences)
+        stats = queue_stats(cpu_scale)
+    finally:
+        sys.stdout.close()
+        sys.stdout = saved_stdout
+
+    print("coalescing check: %d random sequences x 200 events per mode, burst %d" % (sequences, burst))
+    print("%-10s %8s %10s %10s %10s" % ("mode", "events", "coalesced", "max depth", "mismatch"))
+    status = 0
+    for row in coalescing:
+        print("%-10s %8d %10d %10d %10d" % row)
+        if row[4]:
+            status = 1
+    print()
+    print("overflow check: queue size %d, burst %d" % (OVERFLOW_QUEUE_SIZE, OVERFLOW_BURST))
+    print("%-10s %8s %12s %14s %10s %9s %7s %10s" % (
+        "mode", "switches", "switch lost", "rot. dropped", "coalesced", "opposite", "stale", "max depth"))
+    for row in overflow:
+        print("%-10s %8d %12d %14d %10d %9d %7d %10d" % row)
+        if row[2] or row[5] or row[6]:
+            status = 1
+    print()
+    print("code.py on host/traces, cpu-scale %g" % cpu_scale)
+    print("%-10s %-6s %7s %10s %8s %10s %12s" % (
+        "trace", "loop", "posted", "coalesced", "dropped", "max depth", "max wait ms"))
+    for mode, loop, s in stats:
+        print("%-10s %-6s %7d %10d %8d %10d %12.1f" % (
+            mode, loop, s['posted'], s['coalesced'], s['dropped'], s['max_depth'], s['max_wait'] * 1000))
+    if any(row[4] for row in coalescing):
+        print("error: coalesced events produced different output")
+    if any(row[2] for row in overflow):
+        print("error: switch events were dropped from a full queue")
+    if any(row[5] or row[6] for row in overflow):
+        print("error: a full queue merged opposite rotations or left a stale coalescing flag")
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,104 @@
+# SPDX-FileCopyrightText: 2025 Takuya Urakawa (@hsgw 5z6p.com)
+# SPDX-License-Identifier: MIT
+
+"""
+HIDバースト送信のベンチマーク
+
+サンプル文を 1文字ずつの send_key と、まとめて送る send_text で送信し、
+レポート数と文字/秒（USBのポーリング間隔ごとに1レポート）を比較する
+記録したレポートをホスト側の入力として復元し、送った文字列と一致するかも確かめる
+
+使い方:
+    python3 host/bench_hid.py [--hid-interval 秒] [corpus.txt]
+"""
+
+import os
+import sys
+
+HOST_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.join(os.path.dirname(HOST_DIR), 'circuitpython')
+sys.path.insert(0, os.path.join(HOST_DIR, 'sim'))
+
+from hostsim import SIM, load_project  # noqa: E402
+
+# Shiftの連続・同じキーの連続を含む文
+EXTRA_TEXT = "!!?? ((ok)) -- #1 && 'quoted' aa bb 100% ok\n"
+
+
+def make_mode():
+    load_project(PROJECT_DIR)
+    from adafruit_hid.keyboard import Keyboard
+    import usb_hid
+    from modes.basic_mode import BasicMode
+    return BasicMode(Keyboard(usb_hid.devices))
+
+
+def decode(reports, mode, chars):
+    """
+    ホストから見た入力を復元する（新しく押されたキーを、その時点の修飾キーで文字にする）
+    """
+    reverse = {}
+    for char in chars:
+        key = mode.lookup_key(char)
+        if key and key not in reverse:
+            reverse[key] = char
+    typed = []
+    held = set()
+    for report in reports:
+        keys = set(k for k in report[2:] if k)
+        for keycode in keys - held:
+            typed.append(reverse.get((keycode, report[0]), '?'))
+        held = keys
+    return ''.join(typed)
+
+
+def measure(text, burst, hid_interval):
+    """
+    Returns:
+        tuple: (送信した文字数, レポート数, 所要時間[秒], 復元した文字列, 送るべき文字列)
+    """
+    SIM.reset(cpu_scale=0, hid_interval=hid_interval)
+    mode = make_mode()
+    if burst:
+        sent = mode.send_text(text)
+    else:
+        sent = sum(1 for char in text if mode.send_key(char))
+    reports = [report for _, report, _, _ in SIM.reports]
+    duration = SIM.reports[-1][0] - SIM.reports[0][0] + hid_interval
+    expected = ''.join(char for char in text if mode.lookup_key(char))
+    return sent, len(reports), duration, decode(reports, mode, text), expected
+
+
+def main(argv):
+    hid_interval = 0.008
+    if argv[:1] == ['--hid-interval']:
+        hid_interval = float(argv[1])
+        argv = argv[2:]
+    path = argv[0] if argv else os.path.join(HOST_DIR, 'corpus', 'sample_en.txt')
+    with open(path) as f:
+        text = f.read().lower() + EXTRA_TEXT
+
+    saved_stdout = sys.stdout
+    sys.stdout = open(os.devnull, 'w')
+    try:
+        results = [(name, measure(text, burst, hid_interval))
+                   for name, burst in (("send_key", False), ("send_text", True))]
+    finally:
+        sys.stdout.close()
+        sys.stdout = saved_stdout
+
+    print("corpus: %s + extra (%d chars), HID interval %.1f ms"
+          % (os.path.basename(path), len(text), hid_interval * 1000))
+    print("%-10s %6s %8s %13s %10s" % ("api", "chars", "reports", "reports/char", "chars/sec"))
+    status = 0
+    for name, (sent, reports, duration, typed, expected) in results:
+        print("%-10s %6d %8d %13.2f %10.1f"
+              % (name, sent, reports, reports / sent, sent / duration))
+        if typed != expected:
+            print("error: %s output differs from the input text" % name)
+            status = 1
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
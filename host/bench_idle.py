@@ -0,0 +1,147 @@
+# SPDX-FileCopyrightText: 2025 Takuya Urakawa (@hsgw 5z6p.com)
+# SPDX-License-Identifier: MIT
+
+"""
+ポーリング間隔とライトスリープ (POLL_INTERVAL_* / LIGHT_SLEEP_AFTER) のベンチマーク（実機なし）
+
+入力のまとまり（回転6クリックとクリック）の間に GAPS 秒の放置をはさんだトレースで
+code.py (MAIN_LOOP = 'poll') を動かし、
+- 1秒あたりのメインループの周回数（CPUが起きる回数, 消費電力の目安）と、ライトスリープしていた割合
+- 放置のあとの最初の入力から、最初のイベントを ModeManager に積むまでの時間
+  (ライトスリープから起こした回転は入力されないので、その次の回転までの時間になる)
+- 入力されなかった回転のクリック数
+- PollScheduler が実機と同じ方法で測る、起きてから最初のイベントを処理するまでの時間
+を、10ms固定 / 適応ポーリング / 適応ポーリング+ライトスリープ で比べる
+
+使い方:
+    python3 host/bench_idle.py [--cpu-scale N] [--sleep-after 秒]
+"""
+
+import os
+import sys
+
+HOST_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.join(os.path.dirname(HOST_DIR), 'circuitpython')
+sys.path.insert(0, os.path.join(HOST_DIR, 'sim'))
+
+from hostsim import SIM, run_code, percentile  # noqa: E402
+
+# 入力のまとまりの前の放置時間（秒, 最初は起動の時間を含む）
+GAPS = (4, 3, 10, 30, 120, 30, 10)
+DETENT_INTERVAL = 0.08
+
+
+def make_trace():
+    """
+    Returns:
+        tuple: (トレース, 放置のあとの最初の入力の時刻のリスト)
+    """
+    trace = []
+    starts = []
+    t = 0.0
+    for i, gap in enumerate(GAPS):
+        t += gap
+        starts.append(t)
+        if i % 2:
+            # スイッチで起こす
+            trace += [(t, 'press', None), (t + 0.06, 'release', None)]
+            t += 0.5
+        for _ in range(6):
+            trace.append((t, 'enc', 1))
+            t += DETENT_INTERVAL
+        trace += [(t + 0.2, 'press', None), (t + 0.26, 'release', None)]
+        t += 0.6
+    return trace, starts
+
+
+def run(config, cpu_scale):
+    trace, starts = make_trace()
+    posted = []  # (積んだ時刻, 種類, 値)
+    wake_latencies = []
+    loops = [0]
+
+    def setup():
+        import time
+        import mode_manager
+        import poll_scheduler
+
+        sleep = time.sleep
+
+        def counted_sleep(seconds):
+            loops[0] += 1
+            sleep(seconds)
+        time.sleep = counted_sleep
+
+        post = mode_manager.ModeManager.post
+
+        def recorded_post(self, kind, value=0, timestamp=None):
+            posted.append((SIM.clock(), kind, value))
+            return post(self, kind, value, timestamp)
+        mode_manager.ModeManager.post = recorded_post
+
+        event = poll_scheduler.PollScheduler.event
+
+        def recorded_event(self, now):
+            waking = self.wake_time is not None
+            event(self, now)
+            if waking:
+                wake_latencies.append(self.wake_latency)
+        poll_scheduler.PollScheduler.event = recorded_event
+
+    overrides = {'INITIAL_MODE': 'Basic', 'MAIN_LOOP': 'poll', 'ENCODER_ACCEL_CURVES': {}}
+    overrides.update(config)
+    run_code(PROJECT_DIR, trace, overrides, cpu_scale=cpu_scale, tail=2.0, setup=setup)
+
+    duration = SIM.clock()
+    first_event = []
+    for start in starts:
+        after = [t for t, _, _ in posted if t >= start]
+        first_event.append((after[0] - start) * 1000)
+    detents = sum(value for _, kind, value in trace if kind == 'enc')
+    received = sum(value for _, kind, value in posted if kind == 'rotation')
+    return {
+        'loops_per_sec': loops[0] / duration,
+        'asleep': SIM.sleep_time / duration,
+        'first_event': first_event,
+        'lost': detents - received,
+        'sleeps': SIM.counters.get('light_sleeps', 0),
+        'wake': [latency * 1000 for latency in wake_latencies],
+    }
+
+
+def main(argv):
+    cpu_scale = 1.0
+    sleep_after = 5.0
+    args = list(argv)
+    while args:
+        arg = args.pop(0)
+        if arg == '--cpu-scale':
+            cpu_scale = float(args.pop(0))
+        elif arg == '--sleep-after':
+            sleep_after = float(args.pop(0))
+        else:
+            print(__doc__)
+            return 2
+
+    configs = (
+        ('fixed 10ms', {'POLL_INTERVAL_ACTIVE': 0.01, 'POLL_INTERVAL_IDLE': 0.01}),
+        ('adaptive', {}),
+        ('adaptive+sleep', {'LIGHT_SLEEP_AFTER': sleep_after}),
+    )
+    print("gaps %s s, cpu-scale %g, light sleep after %g s" % (
+        ' '.join(str(gap) for gap in GAPS), cpu_scale, sleep_after))
+    print("%-15s %8s %7s %7s %6s %13s %8s %13s" % (
+        "polling", "loops/s", "asleep", "sleeps", "lost", "first p50/max", "", "wake p50/max"))
+    for name, config in configs:
+        r = run(config, cpu_scale)
+        wake = "%6.1f/%6.1f" % (percentile(r['wake'], 50), max(r['wake'])) if r['wake'] else "-"
+        print("%-15s %8.1f %6.1f%% %7d %6d %6.1f/%6.1f %8s %13s" % (
+            name, r['loops_per_sec'], r['asleep'] * 100, r['sleeps'], r['lost'],
+            percentile(r['first_event'], 50), max(r['first_event']), "ms", wake))
+    print("first = first input after a gap -> first event posted, "
+          "wake = wake -> first event processed (measured on the device)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
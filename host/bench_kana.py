@@ -0,0 +1,145 @@
+# SPDX-FileCopyrightText: 2025 Takuya Urakawa (@hsgw 5z6p.com)
+# SPDX-License-Identifier: MIT
+
+"""
+日本語モードの母音リングのベンチマーク
+
+ローマ字のサンプル文をかな（子音+母音, nn, 促音の子音）ごとに区切り、
+JapaneseMode を直接動かして、かなごとに一番少ない操作
+（1デテント = 1, クリック = 1, ダブルクリック = 2）で入力したときのデテント数を数える
+- plain    : 母音リングは常に全体、2文字の子音は子音を2回選ぶ (SYLLABLES なし, 変更前の動作)
+- syllables: 子音に続けられる母音と2文字の子音だけの母音リング (SYLLABLES)
+ch, j, f のかなは、IMEで同じかなになる綴り (ty, zy, hu など) でもよい
+ローマ字の候補 (ROMAJI_CANDIDATES) は使わない
+
+使い方:
+    python3 host/bench_kana.py [corpus.txt]
+"""
+
+import heapq
+import os
+import re
+import sys
+
+HOST_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.join(os.path.dirname(HOST_DIR), 'circuitpython')
+sys.path.insert(0, os.path.join(HOST_DIR, 'sim'))
+
+from hostsim import SIM, load_project  # noqa: E402
+
+KANA = re.compile(r'(?:ky|gy|sh|ch|ts|ny|hy|my|ry|by|py|[kstnhmyrwgzdbpfj])?[aiueo]|nn|[\s\S]')
+
+# IMEで同じかなになる別の綴り (子音リストに j, f, c はない)
+SPELLINGS = (('shi', 'si'), ('chi', 'ti'), ('tsu', 'tu'), ('fu', 'hu'), ('ji', 'zi'),
+             ('sh', 'sy'), ('ch', 'ty'), ('j', 'zy'), ('f', 'hw'))
+
+# (操作, コスト)
+ACTIONS = ((1, 1), (-1, 1), ('single', 1), ('double', 2))
+
+
+def make_mode(plain):
+    load_project(PROJECT_DIR, {'ROMAJI_CANDIDATES': 0})
+    from modes.japanese_mode import JapaneseMode
+    mode = JapaneseMode(None)
+    if plain:
+        mode.SYLLABLES = {}
+    mode.on_enter(reset=True)
+    sent = []
+    mode.send_text = lambda text, use_shift=False: sent.append(text) or len(text)
+    return mode, sent
+
+
+def apply(mode, action):
+    if action == 'single':
+        mode.handle_single_click()
+    elif action == 'double':
+        mode.handle_double_click()
+    else:
+        mode.handle_rotation(action)
+
+
+def spellings(chunk):
+    """chunk と、同じかなになる別の綴り"""
+    for spelling, alternative in SPELLINGS:
+        if chunk == spelling or (len(spelling) < 3 and chunk.startswith(spelling)):
+            return (chunk, alternative + chunk[len(spelling):])
+    return (chunk,)
+
+
+def plan(mode, sent, chunk):
+    """
+    chunk (またはIMEで同じかなになる綴り) を入力する一番少ない操作を探し、
+    モードをその後の状態にする
+
+    Returns:
+        tuple: (デテント数, 左回転 (母音側) のデテント数, クリック数)
+    """
+    goals = spellings(chunk)
+    queue = [(0, 0, 0, 0, 0, dict(mode.state), '')]
+    seen = set()
+    order = 0
+    while queue:
+        cost, detents, left, clicks, _, state, typed = heapq.heappop(queue)
+        if typed in goals:
+            mode.state = state
+            return detents, left, clicks
+        key = (tuple(sorted(state.items())), typed)
+        if key in seen:
+            continue
+        seen.add(key)
+        for action, action_cost in ACTIONS:
+            mode.state = dict(state)
+            del sent[:]
+            apply(mode, action)
+            new_typed = typed + ''.join(sent)
+            if not any(goal.startswith(new_typed) for goal in goals):
+                continue
+            order += 1
+            is_rotation = action in (1, -1)
+            heapq.heappush(queue, (
+                cost + action_cost, detents + is_rotation, left + (action == -1),
+                clicks + (not is_rotation), order, dict(mode.state), new_typed))
+    raise ValueError("cannot type %r" % chunk)
+
+
+def run(text, plain):
+    """
+    Returns:
+        tuple: (デテント数, 左回転のデテント数, クリック数, かなの数)
+    """
+    mode, sent = make_mode(plain)
+    detents = left = clicks = kana = 0
+    for chunk in KANA.findall(text):
+        d, l, c = plan(mode, sent, chunk)
+        detents += d
+        left += l
+        clicks += c
+        kana += chunk.isalpha()
+    return detents, left, clicks, kana
+
+
+def main(argv):
+    path = argv[0] if argv else os.path.join(HOST_DIR, 'corpus', 'sample_ja.txt')
+    with open(path) as f:
+        text = f.read().lower()
+
+    saved_stdout = sys.stdout
+    sys.stdout = open(os.devnull, 'w')
+    try:
+        SIM.reset(cpu_scale=0)
+        results = [(name, run(text, plain)) for name, plain in (("plain", True), ("syllables", False))]
+    finally:
+        sys.stdout.close()
+        sys.stdout = saved_stdout
+
+    print("corpus: %s (%d chars, %d kana)" % (os.path.basename(path), len(text), results[0][1][3]))
+    print("%-10s %8s %13s %7s %13s %15s" % (
+        "ring", "detents", "(left/vowel)", "clicks", "detents/kana", "actions/kana"))
+    for name, (detents, left, clicks, kana) in results:
+        print("%-10s %8d %13d %7d %13.2f %15.2f" % (
+            name, detents, left, clicks, detents / kana, (detents + clicks) / kana))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
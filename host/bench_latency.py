@@ -0,0 +1,134 @@
+# SPDX-FileCopyrightText: 2025 Takuya Urakawa (@hsgw 5z6p.com)
+# SPDX-License-Identifier: MIT
+
+"""
+入力レイテンシのベンチマーク（実機なし）
+
+host/sim のスタブ上で circuitpython/code.py のメインループをそのまま動かし、
+トレースの入力イベントからHIDのキー押下レポートまでの時間をモード別に集計する
+
+使い方:
+    python3 host/bench_latency.py [--cpu-scale N] [--loop poll|async|both]
+                                  [--set KEY=VALUE ...] [trace ...]
+
+--loop both でポーリング版と asyncio 版の最悪レイテンシを並べて比較する
+--set で config.py の値を上書きする (例: --set IMMEDIATE_SINGLE_CLICK=False)
+"""
+
+import os
+import sys
+
+HOST_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.join(os.path.dirname(HOST_DIR), 'circuitpython')
+sys.path.insert(0, os.path.join(HOST_DIR, 'sim'))
+
+from hostsim import SIM, load_trace, run_code, percentile  # noqa: E402
+
+# トレースファイル -> 起動モード
+DEFAULT_TRACES = (
+    ('basic.trace', 'Basic'),
+    ('japanese.trace', 'Japanese'),
+    ('utility.trace', 'Utility'),
+)
+
+
+def key_down_latencies(reports, cause_kind):
+    """
+    原因イベントごとに最初のキー押下レポートまでの時間を求める
+
+    Returns:
+        dict: {モード名: [レイテンシ(ms), ...]}
+    """
+    result = {}
+    seen = set()
+    for t, report, cause, mode in reports:
+        if cause is None or cause[1] != cause_kind or cause in seen:
+            continue
+        if not any(report):
+            continue  # 解放レポート
+        seen.add(cause)
+        result.setdefault(mode, []).append((t - cause[0]) * 1000)
+    return result
+
+
+def run(traces, config=None, cpu_scale=1.0):
+    """
+    トレースを順に実行してレイテンシを集計
+
+    Returns:
+        dict: {(モード名, 種類): [レイテンシ(ms), ...]}
+    """
+    results = {}
+    for path, mode in traces:
+        overrides = {'INITIAL_MODE': mode}
+        overrides.update(config or {})
+        run_code(PROJECT_DIR, load_trace(path), overrides, cpu_scale=cpu_scale)
+        for kind in ('rotation', 'click'):
+            for name, values in key_down_latencies(SIM.reports, kind).items():
+                results.setdefault((name, kind), []).extend(values)
+    return results
+
+
+def print_table(results):
+    print("%-10s %-9s %6s %8s %8s %8s" % ("mode", "event", "n", "p50 ms", "p99 ms", "max ms"))
+    for (mode, kind) in sorted(results):
+        values = results[(mode, kind)]
+        print("%-10s %-9s %6d %8.1f %8.1f %8.1f" % (
+            mode, kind, len(values),
+            percentile(values, 50), percentile(values, 99), max(values)))
+
+
+def print_comparison(by_loop):
+    """メインループ別の p99 / 最悪レイテンシを並べて表示"""
+    loops = list(by_loop)
+    keys = sorted(set(k for results in by_loop.values() for k in results))
+    header = "%-10s %-9s" % ("mode", "event")
+    for loop in loops:
+        header += " %14s" % (loop + " p99/max")
+    print(header)
+    for key in keys:
+        line = "%-10s %-9s" % key
+        for loop in loops:
+            values = by_loop[loop].get(key)
+            if values:
+                line += " %6.1f/%7.1f" % (percentile(values, 99), max(values))
+            else:
+                line += " %14s" % "-"
+        print(line)
+
+
+def main(argv):
+    cpu_scale = 1.0
+    loop = 'poll'
+    overrides = {}
+    traces = []
+    args = list(argv)
+    while args:
+        arg = args.pop(0)
+        if arg == '--cpu-scale':
+            cpu_scale = float(args.pop(0))
+        elif arg == '--loop':
+            loop = args.pop(0)
+        elif arg == '--set':
+            key, _, value = args.pop(0).partition('=')
+            overrides[key] = eval(value)
+        else:
+            # 任意のトレースは "path:Mode" で起動モードを指定
+            path, _, mode = arg.partition(':')
+            traces.append((path, mode or 'Japanese'))
+    if not traces:
+        traces = [(os.path.join(HOST_DIR, 'traces', name), mode)
+                  for name, mode in DEFAULT_TRACES]
+    if loop == 'both':
+        by_loop = {}
+        for name in ('poll', 'async'):
+            overrides['MAIN_LOOP'] = name
+            by_loop[name] = run(traces, overrides, cpu_scale=cpu_scale)
+        print_comparison(by_loop)
+    else:
+        overrides['MAIN_LOOP'] = loop
+        print_table(run(traces, overrides, cpu_scale=cpu_scale))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
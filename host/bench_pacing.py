@@ -0,0 +1,128 @@
+# SPDX-FileCopyrightText: 2025 Takuya Urakawa (@hsgw 5z6p.com)
+# SPDX-License-Identifier: MIT
+
+"""
+HID送信間隔 (HID_REPORT_DELAY / HID_BURST_SIZE) のベンチマーク
+
+bench_snippets.py と同じく、サンプル文のスニペットを code.py のスニペットモードから送り、
+記録したレポート（時刻付き）を取りこぼしのあるホストのモデルに通す
+ホストのモデル: 1レポートの処理に PROCESS 秒かかり、処理待ちが DEPTH 個を超えたレポートは捨てる
+受け取ったレポートから入力を復元し、スニペットと比べて失われたキーを数える
+ポーリング版と asyncio 版の両方で送り、送信間隔を send_report の中の time.sleep で待った回数
+(blocking) も表示する。asyncio 版は HIDタスクが await で待つので 0 になる
+
+使い方:
+    python3 host/bench_pacing.py [--repeat N] [--host 名前=処理ms,深さ ...] [--pacing 遅延ms,バースト ...]
+"""
+
+import difflib
+import os
+import sys
+import tempfile
+
+HOST_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HOST_DIR)
+
+from bench_snippets import make_file, run, received_tokens, snippet_tokens  # noqa: E402
+
+# (名前, 1レポートの処理時間[秒], 処理待ちの最大数)
+HOSTS = [
+    ('desktop', 0.001, 16),
+    ('kvm', 0.012, 2),
+    ('remote', 0.025, 8),
+]
+
+# (HID_REPORT_DELAY[秒], HID_BURST_SIZE)
+PACINGS = [(0, 1), (0.012, 1), (0.025, 1), (0.05, 4), (0.1, 8)]
+
+LOOPS = ('poll', 'async')
+
+
+def accepted_reports(times, process, depth):
+    """
+    ホストが受け取るレポートの番号
+
+    Args:
+        times: レポートを送った時刻の列
+        process: 1レポートの処理時間（秒）
+        depth: 処理待ちの最大数
+
+    Returns:
+        list: 受け取ったレポートの番号
+    """
+    accepted = []
+    finish = []  # 処理待ちのレポートの処理が終わる時刻
+    for i, t in enumerate(times):
+        finish = [f for f in finish if f > t]
+        if len(finish) >= depth:
+            continue
+        finish.append(max(t, finish[-1] if finish else t) + process)
+        accepted.append(i)
+    return accepted
+
+
+def lost_keys(received, expected):
+    """受け取ったキー列と送るべきキー列の差（足りない・余分なキーの数）"""
+    matcher = difflib.SequenceMatcher(None, received, expected, autojunk=False)
+    matched = sum(block.size for block in matcher.get_matching_blocks())
+    return len(expected) - matched + len(received) - matched
+
+
+def parse_pair(text, scale):
+    first, second = text.split(',')
+    return float(first) / scale, int(second)
+
+
+def main(argv):
+    repeat = 2
+    hosts = []
+    pacings = []
+    while argv[:1] and argv[0].startswith('--'):
+        if argv[0] == '--repeat':
+            repeat = int(argv[1])
+        elif argv[0] == '--host':
+            name, _, value = argv[1].partition('=')
+            hosts.append((name,) + parse_pair(value, 1000))
+        elif argv[0] == '--pacing':
+            pacings.append(parse_pair(argv[1], 1000))
+        argv = argv[2:]
+    corpus = argv[0] if argv else os.path.join(HOST_DIR, 'corpus', 'sample_en.txt')
+    with open(corpus) as f:
+        text = f.read()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'snippets.txt')
+        make_file(path, text, repeat)
+        for delay, burst in pacings or PACINGS:
+            for loop in LOOPS:
+                result = run(path, {'HID_REPORT_DELAY': delay, 'HID_BURST_SIZE': burst,
+                                    'MAIN_LOOP': loop}, 0)
+                results.append((loop, delay, burst, result))
+        expected = snippet_tokens(path, results[0][3]['entries'][1])
+
+    print("corpus: %s x%d as a snippet (%d keys)" % (os.path.basename(corpus), repeat, len(expected)))
+    print("%-8s %-6s %9s %6s %8s %10s %8s %10s %9s" % (
+        "host", "loop", "delay ms", "burst", "reports", "chars/sec", "dropped", "lost keys", "blocking"))
+    status = 0
+    for name, process, depth in hosts or HOSTS:
+        for loop, delay, burst, result in results:
+            times = result['times']
+            reports = result['reports']
+            accepted = accepted_reports(times, process, depth)
+            received = received_tokens([reports[i] for i in accepted])
+            duration = times[-1] - times[0]
+            print("%-8s %-6s %9.1f %6d %8d %10.1f %8d %10d %9d" % (
+                name, loop, delay * 1000, burst, len(reports), len(expected) / duration,
+                len(reports) - len(accepted), lost_keys(received, expected), result['blocking_waits']))
+            if received_tokens(reports) != expected:
+                print("error: sent keys differ from the snippet")
+                status = 1
+            if loop == 'async' and result['blocking_waits']:
+                print("error: the async loop blocked in send_report")
+                status = 1
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
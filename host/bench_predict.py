@@ -0,0 +1,56 @@
+# SPDX-FileCopyrightText: 2025 Takuya Urakawa (@hsgw 5z6p.com)
+# SPDX-License-Identifier: MIT
+
+"""
+次の文字の予測 (BASIC_PREDICTION) のベンチマーク
+
+bench_accel.py と同じ利用者モデルでサンプル文を BasicMode に入力し、
+1文字あたりのデテント数を予測あり/なし (加速あり/なし) で比較する
+予測表は host/corpus/train_en.txt から作ったもので、サンプル文は学習に使っていない
+
+使い方:
+    python3 host/bench_predict.py [corpus.txt]
+"""
+
+import os
+import sys
+
+HOST_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.join(os.path.dirname(HOST_DIR), 'circuitpython')
+sys.path.insert(0, HOST_DIR)
+
+from bench_accel import type_text, load_project  # noqa: E402
+
+
+def main(argv):
+    path = argv[0] if argv else os.path.join(HOST_DIR, 'corpus', 'sample_en.txt')
+    with open(path) as f:
+        text = f.read().lower()
+
+    saved_stdout = sys.stdout
+    sys.stdout = open(os.devnull, 'w')
+    try:
+        curves = load_project(PROJECT_DIR).ENCODER_ACCEL_CURVES
+        results = []
+        for accel in (False, True):
+            for prediction in (False, True):
+                result = type_text(text, curves if accel else {}, {'BASIC_PREDICTION': prediction})
+                results.append((accel, prediction, result))
+    finally:
+        sys.stdout.close()
+        sys.stdout = saved_stdout
+
+    print("corpus: %s (%d chars typed)" % (os.path.basename(path), results[0][2][1]))
+    print("%-6s %-11s %8s %14s" % ("accel", "prediction", "detents", "detents/char"))
+    status = 0
+    for accel, prediction, (detents, typed, keycodes) in results:
+        print("%-6s %-11s %8d %14.2f" % (
+            "on" if accel else "off", "on" if prediction else "off", detents, detents / typed))
+        if keycodes != results[0][2][2]:
+            print("error: typed output differs")
+            status = 1
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
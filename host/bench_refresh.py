@@ -0,0 +1,92 @@
+# SPDX-FileCopyrightText: 2025 Takuya Urakawa (@hsgw 5z6p.com)
+# SPDX-License-Identifier: MIT
+
+"""
+1クリックの回転 (detent) での表示の更新時間のベンチマーク（実機なし）
+
+host/bench_render.py と同じイベント列で基本・日本語・ユーティリティモードを動かし、
+同じ向きの1クリックの回転ごとに display.refresh() で送った SH1106 のページ数・バイト数と、
+refresh() にかかった時間（仮想時刻, I2C転送の時間）の平均と最大を
+I2Cクロック (I2C_FREQUENCY) ごとに、全ページ転送とページ単位の転送で比べる
+
+使い方:
+    python3 host/bench_refresh.py [--i2c-frequency HZ ...]
+"""
+
+import os
+import sys
+
+HOST_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HOST_DIR, 'sim'))
+sys.path.insert(0, HOST_DIR)
+
+from hostsim import SIM  # noqa: E402
+from adafruit_displayio_sh1106 import SH1106  # noqa: E402
+import bench_render  # noqa: E402
+
+METRICS = (
+    ('i2c_pages', 'pages'),
+    ('i2c_bytes', 'bytes'),
+    ('refresh_us', 'refresh'),
+)
+
+
+def measured_refresh(refresh):
+    """refresh() にかかった仮想時間を 'refresh_us' に数える"""
+    def wrapper(self, **kwargs):
+        start = SIM.clock()
+        result = refresh(self, **kwargs)
+        SIM.count('refresh_us', int((SIM.clock() - start) * 1000000))
+        return result
+    return wrapper
+
+
+def run(mode_name, frequency, page_refresh):
+    """
+    Returns:
+        list: 1クリックの回転ごとの {カウンタ名: 増えた数}
+    """
+    SH1106.page_refresh = page_refresh
+    saved_stdout = sys.stdout
+    sys.stdout = open(os.devnull, 'w')
+    try:
+        results = bench_render.run(mode_name, {'I2C_FREQUENCY': frequency}, METRICS)
+    finally:
+        sys.stdout.close()
+        sys.stdout = saved_stdout
+        SH1106.page_refresh = True
+    return results.get('detent', [])
+
+
+def main(argv):
+    frequencies = []
+    args = list(argv)
+    while args:
+        arg = args.pop(0)
+        if arg == '--i2c-frequency':
+            frequencies.append(int(args.pop(0)))
+        else:
+            print(__doc__)
+            return 2
+    if not frequencies:
+        frequencies = [100000, 400000]
+
+    SH1106.refresh = measured_refresh(SH1106.refresh)
+    print("single detent: SH1106 pages / bytes / refresh() time per detent (average, max)")
+    print("%-10s %-5s %-6s %4s %7s %8s %15s" % (
+        "mode", "I2C", "pages", "n", "pages", "bytes", "refresh ms"))
+    for mode_name in bench_render.SCRIPTS:
+        for frequency in frequencies:
+            for name, page_refresh in (('all', False), ('dirty', True)):
+                rows = run(mode_name, frequency, page_refresh)
+                averages = dict((key, sum(row[key] for row in rows) / len(rows)) for key, _ in METRICS)
+                worst = max(row['refresh_us'] for row in rows)
+                print("%-10s %-5s %-6s %4d %7.2f %8.1f %7.2f/%6.2f" % (
+                    mode_name, "%dk" % (frequency // 1000), name, len(rows),
+                    averages['i2c_pages'], averages['i2c_bytes'],
+                    averages['refresh_us'] / 1000, worst / 1000))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,257 @@
+# SPDX-FileCopyrightText: 2025 Takuya Urakawa (@hsgw 5z6p.com)
+# SPDX-License-Identifier: MIT
+
+"""
+表示の描画コストのベンチマーク（回帰チェック付き）
+
+基本・日本語・ユーティリティモードに決まったイベント列 (SCRIPTS) を1つずつ渡し、
+イベントごとに host/sim の displayio / adafruit_display_text スタブのカウンタ
+（Label の text 代入、レイアウト、Bitmap の確保、Group への追加・削除、TileGrid の書き込み、
+フレーム数、I2C で送った SH1106 のページ数とバイト数）がいくつ増えたかを、イベントの種類別に平均する
+
+イベントの種類:
+    detent    同じ向き（または最初）の1クリックの回転
+    reversal  直前の回転と逆向きの回転
+    single / double / long_press
+
+結果は host/baselines/render.txt の基準値と比べ、1つでも基準値を超えたら終了コード1にする
+描画を減らす変更をしたときは --update で基準値を書き直してコミットする
+
+使い方:
+    python3 host/bench_render.py [--set KEY=VALUE ...] [--tolerance PCT] [--update]
+"""
+
+import os
+import sys
+
+HOST_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.join(os.path.dirname(HOST_DIR), 'circuitpython')
+BASELINE_PATH = os.path.join(HOST_DIR, 'baselines', 'render.txt')
+sys.path.insert(0, os.path.join(HOST_DIR, 'sim'))
+
+from hostsim import SIM, load_project, use_sim_time  # noqa: E402
+from replay_trace import MODES  # noqa: E402
+
+# (カウンタ名, 表の見出し)
+METRICS = (
+    ('label_text_sets', 'text'),
+    ('label_layouts', 'layout'),
+    ('bitmap_allocs', 'bitmap'),
+    ('group_mutations', 'group'),
+    ('tilegrid_writes', 'tile'),
+    ('frames', 'frames'),
+    ('i2c_pages', 'pages'),
+    ('i2c_bytes', 'i2c B'),
+)
+
+
+def _rotations(delta, count):
+    return [('rotation', delta)] * count
+
+
+# モード -> (先に入っておくモード, イベント列)
+SCRIPTS = {
+    'Basic': (None,
+              _rotations(1, 12) + _rotations(-1, 6) + [('single', 0)]
+              + _rotations(1, 4) + [('double', 0)] + _rotations(-1, 3)
+              + _rotations(1, 3) + [('single', 0)]),
+    'Japanese': (None,
+                 _rotations(1, 8) + [('single', 0)] + _rotations(-1, 5) + [('single', 0)]
+                 + _rotations(1, 3) + [('double', 0)] + _rotations(-1, 2)
+                 + _rotations(1, 2) + [('single', 0)]),
+    # 逆回転・回さずにクリックは前のモードに戻るので、メニューの中だけで逆回転する
+    'Utility': ('Basic',
+                _rotations(1, 6) + [('single', 0)] + [('long_press', 0)]
+                + _rotations(1, 4) + _rotations(-1, 3)),
+}
+
+# 1イベントのあとに描画を待つ時間（秒）と回数（フレーム間隔を必ず空ける）
+SETTLE_TIME = 0.05
+SETTLE_STEPS = 2
+
+
+def event_kinds(events):
+    """イベント列を detent / reversal / single ... に分類する"""
+    kinds = []
+    last_direction = 0
+    for kind, value in events:
+        if kind == 'rotation':
+            direction = 1 if value > 0 else -1
+            kinds.append('reversal' if last_direction == -direction else 'detent')
+            last_direction = direction
+        else:
+            kinds.append(kind)
+            last_direction = 0
+    return kinds
+
+
+def event_counts(events):
+    counts = {}
+    for kind in event_kinds(events):
+        counts[kind] = counts.get(kind, 0) + 1
+    return counts
+
+
+def run(mode_name, config, metrics=METRICS):
+    """
+    Args:
+        metrics: 数えるカウンタ (METRICS と同じ形)
+
+    Returns:
+        dict: {イベントの種類: [{カウンタ名: 増えた数}, ...]}
+    """
+    SIM.reset(cpu_scale=0)
+    use_sim_time()
+    try:
+        project_config = load_project(PROJECT_DIR, config)
+        import board
+        import busio
+        import i2cdisplaybus
+        from adafruit_displayio_sh1106 import SH1106
+        from adafruit_hid.keyboard import Keyboard
+        import usb_hid
+        from mode_manager import ModeManager
+        from render_scheduler import RenderScheduler
+
+        i2c = busio.I2C(board.SCL, board.SDA, frequency=project_config.I2C_FREQUENCY)
+        display = SH1106(i2cdisplaybus.I2CDisplayBus(i2c, device_address=0x3C),
+                         width=project_config.DISPLAY_WIDTH, height=project_config.DISPLAY_HEIGHT)
+        manager = ModeManager(display, Keyboard(usb_hid.devices))
+        scheduler = None
+        if project_config.DISPLAY_FPS:
+            scheduler = RenderScheduler(display, manager.render, project_config.DISPLAY_FPS)
+            manager.render_scheduler = scheduler
+        for name, module_name, class_name in MODES:
+            manager.register_mode(name, module_name, class_name)
+
+        def settle():
+            for _ in range(SETTLE_STEPS):
+                SIM.advance(SETTLE_TIME)
+                SIM.now()  # 自動リフレッシュ
+                if scheduler:
+                    scheduler.service()
+
+        first_mode, events = SCRIPTS[mode_name]
+        if first_mode:
+            manager.set_mode(first_mode)
+        manager.set_mode(mode_name)
+        settle()
+
+        results = {}
+        for kind, (event, value) in zip(event_kinds(events), events):
+            before = dict(SIM.counters)
+            manager.post(event, value)
+            manager.dispatch()
+            settle()
+            results.setdefault(kind, []).append(
+                dict((name, SIM.counters.get(name, 0) - before.get(name, 0)) for name, _ in metrics))
+        return results
+    finally:
+        use_sim_time(False)
+
+
+def averages(results):
+    """
+    Returns:
+        dict: {イベントの種類: {カウンタ名: 1イベントあたりの平均}}
+    """
+    table = {}
+    for kind, rows in results.items():
+        table[kind] = dict((name, sum(row[name] for row in rows) / len(rows)) for name in rows[0])
+    return table
+
+
+def load_baselines(path):
+    """
+    書式 (1行1値, '#' 以降はコメント):
+        <モード名> <イベントの種類> <カウンタ名> <1イベントあたりの平均>
+
+    Returns:
+        dict: {(モード名, イベントの種類, カウンタ名): 値}
+    """
+    baselines = {}
+    if not os.path.exists(path):
+        return baselines
+    with open(path) as f:
+        for line in f:
+            line = line.split('#', 1)[0].strip()
+            if not line:
+                continue
+            mode, kind, name, value = line.split()
+            baselines[(mode, kind, name)] = float(value)
+    return baselines
+
+
+def write_baselines(path, tables):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write("# host/bench_render.py の基準値 (python3 host/bench_render.py --update で更新)\n")
+        f.write("# <モード名> <イベントの種類> <カウンタ名> <1イベントあたりの平均>\n")
+        for mode_name, table in tables:
+            for kind in sorted(table):
+                for name, _ in METRICS:
+                    f.write("%s %s %s %.3f\n" % (mode_name, kind, name, table[kind][name]))
+
+
+def main(argv):
+    config = {}
+    tolerance = 0.0
+    update = False
+    args = list(argv)
+    while args:
+        arg = args.pop(0)
+        if arg == '--set':
+            key, value = args.pop(0).split('=', 1)
+            config[key] = eval(value)
+        elif arg == '--tolerance':
+            tolerance = float(args.pop(0)) / 100
+        elif arg == '--update':
+            update = True
+        else:
+            print(__doc__)
+            return 2
+
+    saved_stdout = sys.stdout
+    sys.stdout = open(os.devnull, 'w')
+    try:
+        tables = [(mode_name, averages(run(mode_name, config))) for mode_name in SCRIPTS]
+    finally:
+        sys.stdout.close()
+        sys.stdout = saved_stdout
+
+    if update:
+        write_baselines(BASELINE_PATH, tables)
+        print("baselines written to %s" % os.path.relpath(BASELINE_PATH))
+    baselines = load_baselines(BASELINE_PATH)
+
+    print("rendering cost per event (average, '!' = above baseline, '-' = below)")
+    print("%-10s %-10s %4s" % ("mode", "event", "n") + "".join("%9s" % title for _, title in METRICS))
+    regressions = []
+    for mode_name, table in tables:
+        counts = event_counts(SCRIPTS[mode_name][1])
+        for kind in sorted(table):
+            cells = []
+            for name, _ in METRICS:
+                value = table[kind][name]
+                baseline = baselines.get((mode_name, kind, name))
+                mark = ' '
+                if baseline is None:
+                    mark = '?'
+                elif value > baseline * (1 + tolerance) + 0.0005:
+                    mark = '!'
+                    regressions.append((mode_name, kind, name, baseline, value))
+                elif value < baseline - 0.0005:
+                    mark = '-'
+                cells.append("%8.2f%s" % (value, mark))
+            print("%-10s %-10s %4d" % (mode_name, kind, counts[kind]) + "".join(cells))
+
+    if regressions:
+        print()
+        for mode_name, kind, name, baseline, value in regressions:
+            print("error: %s %s %s: %.3f > baseline %.3f" % (mode_name, kind, name, value, baseline))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,134 @@
+# SPDX-FileCopyrightText: 2025 Takuya Urakawa (@hsgw 5z6p.com)
+# SPDX-License-Identifier: MIT
+
+"""
+ローマ字辞書のベンチマーク（実機なし）
+
+日本語モードでサンプル文を1文字ずつ入力し、候補が目的の語になったらクリックで確定したとして
+- 1イベントあたりの辞書の読み込み回数・検索時間 (ホストCPU時間 x --cpu-scale)
+  同じ文字が続くところ (kk, nn など) はダブルクリックで2文字まとめて入力したとして、別に数える
+- ダイヤルで選んだ文字数と、候補の確定で入力された文字数
+を表示する。実機のフラッシュ(FAT)からの読み込み時間は含まない
+
+使い方:
+    python3 host/bench_romaji.py [--cpu-scale N] [corpus.txt]
+"""
+
+import os
+import re
+import sys
+import time
+import tracemalloc
+
+HOST_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.join(os.path.dirname(HOST_DIR), 'circuitpython')
+sys.path.insert(0, os.path.join(HOST_DIR, 'sim'))
+
+from hostsim import SIM, load_project, percentile  # noqa: E402
+
+
+def make_mode():
+    load_project(PROJECT_DIR)
+    from adafruit_hid.keyboard import Keyboard
+    import usb_hid
+    from modes.japanese_mode import JapaneseMode
+    return JapaneseMode(Keyboard(usb_hid.devices))
+
+
+def timed(events, func):
+    """辞書のメソッドを包んで、呼び出しの時間をイベントごとに足す"""
+    def wrapper(*args):
+        start = time.perf_counter()
+        result = func(*args)
+        events[-1][1] += time.perf_counter() - start
+        return result
+    return wrapper
+
+
+def run(text):
+    """
+    Returns:
+        tuple: (イベントごとの [読み込み回数, 検索時間[秒], 入力した文字数],
+                ダイヤルで選んだ文字数, 確定回数, 確定で入力された文字数)
+    """
+    SIM.reset(cpu_scale=0)
+    mode = make_mode()
+    mode.on_enter(reset=True)
+    dictionary = mode.dictionary
+    events = []
+    dictionary.child = timed(events, dictionary.child)
+    dictionary.candidates = timed(events, dictionary.candidates)
+
+    dialed = commits = committed_chars = 0
+    for token in re.findall(r'[a-z-]+|[^a-z-]', text):
+        typed = 0
+        while typed < len(token):
+            if mode.candidates and token == mode.get_state('word') + mode.candidates[0]:
+                committed_chars += len(mode.candidates[0])
+                commits += 1
+                mode.handle_single_click()
+                break
+            # 同じ文字が続くときはダブルクリック (2文字をまとめて入力)
+            count = 2 if token[typed + 1:typed + 2] == token[typed] else 1
+            events.append([dictionary.reads, 0.0, count])
+            mode._type(token[typed] * count)
+            events[-1][0] = dictionary.reads - events[-1][0]
+            typed += count
+            dialed += count
+    return events, dialed, commits, committed_chars
+
+
+def dictionary_ram():
+    """辞書オブジェクトを作るのに確保したバイト数 (CPython)"""
+    import romaji_dict
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    dictionary = romaji_dict.RomajiDict()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    dictionary.close()
+    return used
+
+
+def main(argv):
+    cpu_scale = 1.0
+    args = list(argv)
+    if args[:1] == ['--cpu-scale']:
+        cpu_scale = float(args[1])
+        args = args[2:]
+    path = args[0] if args else os.path.join(HOST_DIR, 'corpus', 'sample_ja.txt')
+    with open(path) as f:
+        text = f.read().lower()
+
+    saved_stdout = sys.stdout
+    sys.stdout = open(os.devnull, 'w')
+    try:
+        run(text)  # 1回目はホストのキャッシュが温まっていないので捨てる
+        events, dialed, commits, committed_chars = run(text)
+        ram = dictionary_ram()
+    finally:
+        sys.stdout.close()
+        sys.stdout = saved_stdout
+    from config import ROMAJI_LOOKUP_BUDGET_MS
+
+    size = os.path.getsize(os.path.join(PROJECT_DIR, 'romaji.bin'))
+    times = [t * cpu_scale * 1000 for _, t, _ in events]
+    reads = [r for r, _, _ in events]
+    doubles = [r for r, _, count in events if count == 2]
+    print("corpus: %s (%d chars), romaji.bin %d bytes on flash, %d bytes RAM (CPython)"
+          % (os.path.basename(path), len(text), size, ram))
+    print("lookup per event: reads max %d avg %.2f, time p50 %.3f ms p99 %.3f ms max %.3f ms"
+          " (cpu-scale %.1f, budget %d ms)"
+          % (max(reads), sum(reads) / len(reads), percentile(times, 50), percentile(times, 99),
+             max(times), cpu_scale, ROMAJI_LOOKUP_BUDGET_MS))
+    if doubles:
+        print("double-click events: %d, reads max %d avg %.2f"
+              % (len(doubles), max(doubles), sum(doubles) / len(doubles)))
+    total = dialed + committed_chars
+    print("chars dialed %d, candidate commits %d (%d chars, %.1f%% of %d)"
+          % (dialed, commits, committed_chars, committed_chars * 100 / total, total))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
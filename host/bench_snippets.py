@@ -0,0 +1,196 @@
+# SPDX-FileCopyrightText: 2025 Takuya Urakawa (@hsgw 5z6p.com)
+# SPDX-License-Identifier: MIT
+
+"""
+スニペット送信のベンチマーク
+
+サンプル文を繰り返した大きなスニペット（キー操作 {CTRL+V} などと {{ を含む）を
+一時ファイルに書き、code.py のメインループでスニペットモードから送信する
+- 目次の作成時間
+- 1回の update() の最大時間（USBのポーリング間隔ごとに1レポート, この間は入力を処理できない）
+- 1回の update() で確保するメモリの最大 (tracemalloc, ホストのファイルバッファを含む。スニペットの大きさによらないこと)
+- キー/秒
+記録したレポートをホスト側の入力として復元し、スニペットと一致するかも確かめる
+
+使い方:
+    python3 host/bench_snippets.py [--repeat N] [--cpu-scale N] [--set NAME=VALUE ...] [corpus.txt]
+"""
+
+import os
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+
+HOST_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.join(os.path.dirname(HOST_DIR), 'circuitpython')
+sys.path.insert(0, os.path.join(HOST_DIR, 'sim'))
+
+from hostsim import SIM, run_code  # noqa: E402
+
+CHORD = re.compile(r'\{\{|\{([^{}]+)\}|[^{]+')
+# 本文に混ぜるキー操作 (チャンクの境目をまたぐ位置にも入るように数行ごと)
+CHORDS = ('{ENTER}', '{CTRL+V}', '{{', '{CTRL+SHIFT+T}', '{TAB}')
+
+# 2番目のスニペット (large) を選んでクリック
+TRACE = [(0.5, 'enc', 1), (1.0, 'press', 0), (1.05, 'release', 0)]
+TAIL = 3600
+
+
+def make_file(path, text, repeat):
+    """スニペットファイルを書く（大きなスニペットは2番目）"""
+    lines = text.strip().split('\n')
+    body = []
+    for i in range(repeat):
+        for j, line in enumerate(lines):
+            body.append(line + CHORDS[(i + j) % len(CHORDS)])
+    with open(path, 'w') as f:
+        f.write("# benchmark\n[small]\nhello{ENTER}\n[large]\n")
+        f.write('\n'.join(body) + '\n\n')
+        f.write("[last]\nbye\n")
+
+
+def expected_tokens(body, lookup, parse_chord, modifier_bit):
+    """スニペットの本文から、ホストが受け取るはずの (modifier, keycode) の列を作る"""
+    tokens = []
+    for match in CHORD.finditer(body):
+        if match.group(0) == '{{':
+            tokens.append(lookup('{'))
+        elif match.group(1):
+            modifier = keycode = 0
+            for key in parse_chord(match.group(1)):
+                if modifier_bit(key):
+                    modifier |= modifier_bit(key)
+                else:
+                    keycode = key
+            tokens.append((keycode, modifier))
+        else:
+            tokens.extend(lookup(char) for char in match.group(0) if lookup(char))
+    return tokens
+
+
+def snippet_tokens(path, entry):
+    """run() のあとで、目次の entry のスニペットをホストが受け取るはずの列にする"""
+    import snippets
+    from adafruit_hid.keycode import Keycode
+    from keyboard_layout import get_layout
+    _, offset, length = entry
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        body = f.read(length).decode('ascii')
+    return expected_tokens(body, get_layout().lookup, snippets.parse_chord, Keycode.modifier_bit)
+
+
+def received_tokens(reports):
+    """レポート列から、新しく押されたキーを (keycode, modifier) の列にする"""
+    tokens = []
+    held = set()
+    for report in reports:
+        keys = set(k for k in report[2:] if k)
+        for keycode in keys - held:
+            tokens.append((keycode, report[0]))
+        held = keys
+    return tokens
+
+
+def run(path, config, cpu_scale, record=True):
+    """
+    code.py を INITIAL_MODE = 'Snippets' で動かし、大きなスニペットを選んでクリックする
+
+    Args:
+        record: Falseならレポートを記録せず、update() ごとのメモリ確保量を測る
+    """
+    result = {'updates': 0, 'max_update': 0.0, 'max_alloc': 0}
+
+    def setup():
+        import mode_manager
+        import snippets
+        original = mode_manager.ModeManager.update
+
+        def update(manager):
+            stream = manager.current_mode.stream
+            start = SIM.clock()
+            if stream and not record:
+                tracemalloc.reset_peak()
+                before = tracemalloc.get_traced_memory()[0]
+            updated = original(manager)
+            if stream and updated:
+                result['updates'] += 1
+                result['max_update'] = max(result['max_update'], SIM.clock() - start)
+                if not record:
+                    result['max_alloc'] = max(
+                        result['max_alloc'], tracemalloc.get_traced_memory()[1] - before)
+            if stream and manager.current_mode.stream is None:
+                result['status'] = manager.current_mode.get_state('status')
+                SIM.stop()
+            return updated
+        mode_manager.ModeManager.update = update
+
+        start = time.perf_counter()
+        snippet_file = snippets.get_snippets()
+        result['scan_ms'] = (time.perf_counter() - start) * 1000
+        result['entries'] = snippet_file.entries
+        if not record:
+            SIM.hid_report = lambda report: None
+            tracemalloc.start()
+
+    config = dict(config, SNIPPETS_FILE=path, INITIAL_MODE='Snippets')
+    try:
+        g = run_code(PROJECT_DIR, TRACE, config, cpu_scale=cpu_scale, tail=TAIL, setup=setup)
+    finally:
+        if not record:
+            tracemalloc.stop()
+            del SIM.hid_report
+    # HID_REPORT_DELAY で send_report の中の time.sleep で待った回数 (async版は QueuedKeyboard の先)
+    keyboard = getattr(g['keyboard'], 'keyboard', g['keyboard'])
+    result['blocking_waits'] = getattr(keyboard._keyboard_device, 'waits', 0)
+    result['reports'] = [report for _, report, _, _ in SIM.reports]
+    result['times'] = [t for t, _, _, _ in SIM.reports]
+    result['duration'] = SIM.reports[-1][0] - SIM.reports[0][0] + SIM.hid_interval if SIM.reports else 0
+    return result
+
+
+def main(argv):
+    repeat = 20
+    cpu_scale = 0
+    config = {}
+    while argv[:1] and argv[0].startswith('--'):
+        if argv[0] == '--repeat':
+            repeat = int(argv[1])
+        elif argv[0] == '--cpu-scale':
+            cpu_scale = float(argv[1])
+        elif argv[0] == '--set':
+            name, _, value = argv[1].partition('=')
+            config[name] = eval(value)
+        argv = argv[2:]
+    corpus = argv[0] if argv else os.path.join(HOST_DIR, 'corpus', 'sample_en.txt')
+    with open(corpus) as f:
+        text = f.read()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'snippets.txt')
+        make_file(path, text, repeat)
+        file_size = os.path.getsize(path)
+        result = run(path, config, cpu_scale)
+        memory = run(path, config, cpu_scale, record=False)
+
+        name, _, length = result['entries'][1]
+        expected = snippet_tokens(path, result['entries'][1])
+
+    received = received_tokens(result['reports'])
+    print("file   : %d bytes, %d snippets (index %.2f ms)" % (
+        file_size, len(result['entries']), result['scan_ms']))
+    print("snippet: %r %d bytes, %d keys, %d reports, status %r" % (
+        name, length, len(expected), len(result['reports']), result.get('status')))
+    print("updates: %d (max %.1f ms per update, max %d bytes allocated per update)" % (
+        result['updates'], result['max_update'] * 1000, memory['max_alloc']))
+    print("speed  : %.2f s, %.0f keys/s" % (result['duration'], len(expected) / result['duration']))
+    if received != expected:
+        print("error: received keys differ from the snippet")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
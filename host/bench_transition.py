@@ -0,0 +1,129 @@
+# SPDX-FileCopyrightText: 2025 Takuya Urakawa (@hsgw 5z6p.com)
+# SPDX-License-Identifier: MIT
+
+"""
+モード切り替えのベンチマーク（実機なし）
+
+host/sim のスタブ上で code.py を動かし、日本語モード -> (長押し) ユーティリティモード ->
+(クリック) 日本語モード の往復を繰り返して、切り替え1回あたりの
+- 所要時間 (set_mode の開始から新しいモードのフレームの転送が終わるまで)
+- 切り替え中に転送された途中のフレーム数
+- Label / Bitmap の作成数と、tracemalloc で測ったメモリ確保量 (CPython のバイト数)
+を表示する
+
+使い方:
+    python3 host/bench_transition.py [--cpu-scale N] [--set KEY=VALUE ...]
+"""
+
+import os
+import sys
+import tracemalloc
+
+HOST_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.join(os.path.dirname(HOST_DIR), 'circuitpython')
+sys.path.insert(0, os.path.join(HOST_DIR, 'sim'))
+
+from hostsim import SIM, run_code, percentile  # noqa: E402
+
+ROUND_TRIPS = 10
+
+
+def make_trace():
+    """長押し (0.7秒) でユーティリティへ、回さずにクリックで日本語モードに戻るのを繰り返す"""
+    trace = []
+    t = 1.0
+    for _ in range(ROUND_TRIPS):
+        trace += [(t, 'press', None), (t + 0.7, 'release', None)]
+        t += 1.5
+        trace += [(t, 'press', None), (t + 0.06, 'release', None)]
+        t += 1.5
+    return trace
+
+
+def run(config, cpu_scale):
+    """
+    Returns:
+        list: 切り替えごとの (モード名, 所要時間ms, 途中のフレーム数, Label作成数, Bitmap作成数, 確保バイト数)
+    """
+    transitions = []
+
+    def setup():
+        import mode_manager
+        set_mode = mode_manager.ModeManager.set_mode
+
+        def measured_set_mode(self, mode_name, reset=True):
+            counters = dict(SIM.counters)
+            frames = len(SIM.frame_times)
+            start = SIM.clock()
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            set_mode(self, mode_name, reset)
+            allocated = tracemalloc.get_traced_memory()[1] - before
+            transitions.append([mode_name, start, frames, SIM.clock(), counters, allocated])
+        mode_manager.ModeManager.set_mode = measured_set_mode
+
+    config = dict(config)
+    tracemalloc.start()
+    try:
+        run_code(PROJECT_DIR, make_trace(), config, cpu_scale=cpu_scale, setup=setup)
+    finally:
+        tracemalloc.stop()
+
+    results = []
+    for index, (mode_name, start, frames, end, counters, allocated) in enumerate(transitions):
+        if index == 0:
+            continue  # 起動時の初期モード
+        after = SIM.counters if index == len(transitions) - 1 else transitions[index + 1][4]
+        # set_mode が終わったあとの最初のフレームで切り替えが見える
+        shown = [t for t in SIM.frame_times[frames:] if t >= end]
+        intermediate = sum(1 for t in SIM.frame_times[frames:] if t < end)
+        latency = (shown[0] - start) * 1000 if shown else None
+        results.append((
+            mode_name, latency, intermediate,
+            after.get('labels_created', 0) - counters.get('labels_created', 0),
+            after.get('bitmap_allocs', 0) - counters.get('bitmap_allocs', 0),
+            allocated,
+        ))
+    return results
+
+
+def print_table(results):
+    """モードごとに、初めて入ったとき (first) と2回目以降 (again) を分けて平均を表示"""
+    groups = {}
+    for row in results:
+        kind = 'again' if any(key[0] == row[0] for key in groups) else 'first'
+        groups.setdefault((row[0], kind), []).append(row)
+    print("%-10s %-6s %4s %9s %9s %11s %7s %8s %11s" % (
+        "to mode", "entry", "n", "p50 ms", "max ms", "mid frames", "labels", "bitmaps", "peak bytes"))
+    for (mode_name, kind), rows in sorted(groups.items()):
+        latencies = [r[1] for r in rows if r[1] is not None]
+        print("%-10s %-6s %4d %9.1f %9.1f %11.1f %7.1f %8.1f %11d" % (
+            mode_name, kind, len(rows), percentile(latencies, 50), max(latencies),
+            sum(r[2] for r in rows) / len(rows),
+            sum(r[3] for r in rows) / len(rows),
+            sum(r[4] for r in rows) / len(rows),
+            sum(r[5] for r in rows) // len(rows)))
+
+
+def main(argv):
+    cpu_scale = 1.0
+    config = {'INITIAL_MODE': 'Japanese'}
+    args = list(argv)
+    while args:
+        arg = args.pop(0)
+        if arg == '--cpu-scale':
+            cpu_scale = float(args.pop(0))
+        elif arg == '--set':
+            key, value = args.pop(0).split('=', 1)
+            config[key] = eval(value)
+        else:
+            print(__doc__)
+            return 2
+    print("%d round trips Japanese <-> Utility, cpu-scale %.1f (averages per transition)"
+          % (ROUND_TRIPS, cpu_scale))
+    print_table(run(config, cpu_scale))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
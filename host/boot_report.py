@@ -0,0 +1,92 @@
+# SPDX-FileCopyrightText: 2025 Takuya Urakawa (@hsgw 5z6p.com)
+# SPDX-License-Identifier: MIT
+
+"""
+起動プロファイルのレポート（実機なし）
+
+host/sim のスタブ上で BOOT_PROFILE='console' として code.py を起動し、
+最初のエンコーダ入力を受け付けるまでのフェーズごとの時間と使用メモリを表示する
+(実機で BOOT_PROFILE を設定したときと同じ形式)
+
+- 時間はホストCPUの処理時間に --cpu-scale を掛けた仮想時間（I2C転送などのスタブの待ち時間を含む）
+- free/used は tracemalloc で測った CPython のメモリ量で、実機のRAMとは値が違う
+  （どのフェーズでメモリが増えるかの比較用）
+- config.py の値を上書きするためにシミュレータが先に config (と board) を読み込むので、
+  ホストでは import board / import config はほぼ0になる（実機では code.py で読み込む時間）
+
+使い方:
+    python3 host/boot_report.py [--cpu-scale N] [--set KEY=VALUE ...]
+"""
+
+import gc
+import os
+import sys
+import tracemalloc
+
+HOST_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.join(os.path.dirname(HOST_DIR), 'circuitpython')
+sys.path.insert(0, os.path.join(HOST_DIR, 'sim'))
+
+from hostsim import SIM, run_code  # noqa: E402
+
+# tracemalloc の使用量をこの大きさのヒープから引いて gc.mem_free() の代わりにする
+HOST_HEAP_BYTES = 64 * 1024 * 1024
+
+# 起動中からエンコーダを回し続ける利用者（code.py は起動時に position を0に戻すので、
+# それまでの回転は入力にならない）。最初の入力を受け付けたら終了する
+TRACE = [(i * 0.005, 'enc', 1) for i in range(1, 120 * 200)]
+
+
+def stop_at_first_input(profilers):
+    """BootProfiler.finish() が呼ばれたら、プロファイラを profilers に入れてシミュレーションを止める"""
+    import boot_profile
+    finish = boot_profile.BootProfiler.finish
+
+    def finish_and_stop(self, *args):
+        finish(self, *args)
+        profilers.append(self)
+        SIM.stop()
+    boot_profile.BootProfiler.finish = finish_and_stop
+
+
+def boot_report(config, cpu_scale):
+    """
+    Returns:
+        list: レポートの各行
+    """
+    config = dict(config)
+    config['BOOT_PROFILE'] = 'console'
+    profilers = []
+    tracemalloc.start()
+    gc.mem_free = lambda: HOST_HEAP_BYTES - tracemalloc.get_traced_memory()[0]
+    try:
+        run_code(PROJECT_DIR, TRACE, config, cpu_scale=cpu_scale,
+                 setup=lambda: stop_at_first_input(profilers))
+    finally:
+        del gc.mem_free
+        tracemalloc.stop()
+    return profilers[0].report_lines()
+
+
+def main(argv):
+    cpu_scale = 1.0
+    config = {}
+    args = list(argv)
+    while args:
+        arg = args.pop(0)
+        if arg == '--cpu-scale':
+            cpu_scale = float(args.pop(0))
+        elif arg == '--set':
+            key, value = args.pop(0).split('=', 1)
+            config[key] = eval(value)
+        else:
+            print(__doc__)
+            return 2
+    for line in boot_report(config, cpu_scale):
+        print(line)
+    print("(host: cpu-scale %.1f, free/used are CPython bytes via tracemalloc)" % cpu_scale)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
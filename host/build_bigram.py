@@ -0,0 +1,75 @@
+# SPDX-FileCopyrightText: 2025 Takuya Urakawa (@hsgw 5z6p.com)
+# SPDX-License-Identifier: MIT
+
+"""
+次の文字の予測表 (バイグラム) のコンパイラ
+
+host/corpus/train_en.txt (小文字にして数える) から circuitpython/bigram.bin を作る
+.bin は文字コード 0-127 ごとに、次に来やすい文字を多い順に NEXT_CHARS 個
+各 (次の文字コード, 重み) の2バイト、計 128 x NEXT_CHARS x 2 バイト
+重みはその文字のあとに来た回数の割合 (1-255)。次の文字コードが 0 なら以降はなし
+
+使い方:
+    python3 host/build_bigram.py [--check] [corpus.txt ...]
+
+--check は .bin がコーパスと一致しているかだけを確かめる
+"""
+
+import os
+import sys
+
+HOST_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CORPUS = os.path.join(HOST_DIR, 'corpus', 'train_en.txt')
+OUTPUT = os.path.join(os.path.dirname(HOST_DIR), 'circuitpython', 'bigram.bin')
+
+NEXT_CHARS = 4
+
+
+def count_bigrams(paths):
+    counts = {}
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            text = f.read().lower()
+        for prev, char in zip(text, text[1:]):
+            if ord(prev) < 128 and 0 < ord(char) < 128:
+                following = counts.setdefault(prev, {})
+                following[char] = following.get(char, 0) + 1
+    return counts
+
+
+def compile_bigram(counts):
+    """
+    Returns:
+        bytes: 128 x NEXT_CHARS x 2 バイトの表
+    """
+    table = bytearray(128 * NEXT_CHARS * 2)
+    for prev, following in counts.items():
+        total = sum(following.values())
+        # 多い順、同じ回数なら文字コード順
+        ranked = sorted(following.items(), key=lambda item: (-item[1], item[0]))[:NEXT_CHARS]
+        base = ord(prev) * NEXT_CHARS * 2
+        for i, (char, count) in enumerate(ranked):
+            table[base + i * 2] = ord(char)
+            table[base + i * 2 + 1] = max(1, min(255, round(255 * count / total)))
+    return bytes(table)
+
+
+def main(argv):
+    check = '--check' in argv
+    paths = [arg for arg in argv if arg != '--check'] or [DEFAULT_CORPUS]
+    counts = count_bigrams(paths)
+    table = compile_bigram(counts)
+    chars = sum(1 for code in range(128) if table[code * NEXT_CHARS * 2])
+    if check:
+        with open(OUTPUT, 'rb') as f:
+            ok = f.read() == table
+        print("%d chars, %d bytes %s" % (chars, len(table), "ok" if ok else "OUT OF DATE"))
+        return 0 if ok else 1
+    with open(OUTPUT, 'wb') as f:
+        f.write(table)
+    print("%d chars, %d bytes -> %s" % (chars, len(table), os.path.relpath(OUTPUT)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
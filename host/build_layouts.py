@@ -0,0 +1,104 @@
+# SPDX-FileCopyrightText: 2025 Takuya Urakawa (@hsgw 5z6p.com)
+# SPDX-License-Identifier: MIT
+
+"""
+キーボードレイアウト表のコンパイラ
+
+host/layouts/*.txt を circuitpython/layouts/*.bin に変換する
+.bin は文字コード 0-255 ごとに (keycode, modifier) の2バイト、計512バイト
+(keycode が 0 の文字はマッピングなし)
+
+.txt の書式 (1行1文字, # で始まる行はコメント):
+    <文字> <Keycode名> [SHIFT] [ALTGR]
+    文字は1文字そのまま、または 0xNN (空白・'#'・改行など)
+    Keycode に名前のないキー (JISの ろ/¥ キーなど) は 0xNN で書く
+
+使い方:
+    python3 host/build_layouts.py [--check]
+
+--check は .bin が .txt と一致しているかだけを確かめる
+"""
+
+import os
+import sys
+
+HOST_DIR = os.path.dirname(os.path.abspath(__file__))
+SOURCE_DIR = os.path.join(HOST_DIR, 'layouts')
+OUTPUT_DIR = os.path.join(os.path.dirname(HOST_DIR), 'circuitpython', 'layouts')
+sys.path.insert(0, os.path.join(HOST_DIR, 'sim'))
+
+from adafruit_hid.keycode import Keycode  # noqa: E402
+
+MODIFIERS = {
+    'SHIFT': Keycode.modifier_bit(Keycode.SHIFT),
+    'ALTGR': Keycode.modifier_bit(Keycode.RIGHT_ALT),
+}
+
+
+def parse_char(token):
+    if len(token) > 2 and token.startswith('0x'):
+        return int(token, 16)
+    if len(token) != 1:
+        raise ValueError("bad character %r" % token)
+    return ord(token)
+
+
+def parse_keycode(token):
+    if token.startswith('0x'):
+        return int(token, 16)
+    return getattr(Keycode, token)
+
+
+def compile_layout(path):
+    """
+    Returns:
+        bytes: 512バイトの表
+    """
+    table = bytearray(512)
+    with open(path, encoding='utf-8') as f:
+        for number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            try:
+                tokens = line.split()
+                code = parse_char(tokens[0])
+                if code > 255:
+                    raise ValueError("character out of range")
+                keycode = parse_keycode(tokens[1])
+                modifier = 0
+                for name in tokens[2:]:
+                    modifier |= MODIFIERS[name]
+            except (IndexError, ValueError, AttributeError, KeyError) as e:
+                raise SystemExit("%s:%d: %s: %s" % (path, number, e, line))
+            if table[code * 2]:
+                raise SystemExit("%s:%d: duplicate character: %s" % (path, number, line))
+            table[code * 2] = keycode
+            table[code * 2 + 1] = modifier
+    return bytes(table)
+
+
+def main(argv):
+    check = '--check' in argv
+    status = 0
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    for name in sorted(os.listdir(SOURCE_DIR)):
+        if not name.endswith('.txt'):
+            continue
+        table = compile_layout(os.path.join(SOURCE_DIR, name))
+        output = os.path.join(OUTPUT_DIR, name[:-4] + '.bin')
+        mapped = sum(1 for code in range(256) if table[code * 2])
+        if check:
+            with open(output, 'rb') as f:
+                ok = f.read() == table
+            print("%-8s %3d chars %s" % (name[:-4], mapped, "ok" if ok else "OUT OF DATE"))
+            status |= not ok
+        else:
+            with open(output, 'wb') as f:
+                f.write(table)
+            print("%-8s %3d chars -> %s" % (name[:-4], mapped, os.path.relpath(output)))
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
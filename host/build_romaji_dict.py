@@ -0,0 +1,133 @@
+# SPDX-FileCopyrightText: 2025 Takuya Urakawa (@hsgw 5z6p.com)
+# SPDX-License-Identifier: MIT
+
+"""
+ローマ字辞書のコンパイラ
+
+host/dict/romaji.txt (1行1語, 上ほど優先) を circuitpython/romaji.bin のトライ木に変換する
+実機では romaji_dict.py がこのファイルを開いたまま、必要なノードだけを読む
+
+.bin の形式 (数値はリトルエンディアン):
+    ヘッダ 8バイト:
+        'RMJ1', ノード数 (u16), 子ノードの最大数 (u8), 候補リストの最大バイト数 (u8)
+    ノード 8バイト x ノード数 (幅優先順, 0番がルート, 兄弟は連続して文字順):
+        文字 (u8), 子ノード数 (u8), 最初の子ノード番号 (u16),
+        候補リストの位置 (u16, 候補領域の先頭から, 0xFFFF なら候補なし),
+        フラグ (u8, bit0: ここまでで1語), 予備 (u8)
+    候補領域:
+        候補数 (u8), 候補ごとに 長さ (u8) + ノードより後ろの文字列
+        (そのノードより長い語を優先度順に最大 CANDIDATES 個)
+
+使い方:
+    python3 host/build_romaji_dict.py [--check]
+
+--check は .bin が .txt と一致しているかだけを確かめる
+"""
+
+import os
+import struct
+import sys
+
+HOST_DIR = os.path.dirname(os.path.abspath(__file__))
+SOURCE = os.path.join(HOST_DIR, 'dict', 'romaji.txt')
+OUTPUT = os.path.join(os.path.dirname(HOST_DIR), 'circuitpython', 'romaji.bin')
+
+CANDIDATES = 3  # ノードごとの候補数
+MAX_WORD = 20  # 1語の最大文字数
+WORD_CHARS = 'abcdefghijklmnopqrstuvwxyz-'
+NO_CANDIDATES = 0xFFFF
+FLAG_WORD = 1
+
+
+class Node:
+    def __init__(self, char):
+        self.char = char
+        self.children = {}
+        self.words = []  # この下で終わる語 (優先度順, ノードより長いもの)
+        self.is_word = False
+        self.index = 0
+
+
+def read_words(path):
+    words = []
+    seen = set()
+    with open(path, encoding='utf-8') as f:
+        for number, line in enumerate(f, 1):
+            word = line.strip()
+            if not word or word.startswith('#'):
+                continue
+            if len(word) > MAX_WORD or any(c not in WORD_CHARS for c in word):
+                raise SystemExit("%s:%d: bad word: %s" % (path, number, word))
+            if word in seen:
+                raise SystemExit("%s:%d: duplicate word: %s" % (path, number, word))
+            seen.add(word)
+            words.append(word)
+    return words
+
+
+def compile_dict(words):
+    """
+    Returns:
+        bytes: .bin の内容
+    """
+    root = Node(0)
+    for word in words:
+        node = root
+        for depth, char in enumerate(word):
+            if len(node.words) < CANDIDATES:
+                node.words.append(word[depth:])
+            node = node.children.setdefault(char, Node(char))
+        node.is_word = True
+
+    # 幅優先で番号を付ける (兄弟が連続するように)
+    order = [root]
+    for node in order:
+        for char in sorted(node.children):
+            child = node.children[char]
+            child.index = len(order)
+            order.append(child)
+    if len(order) >= NO_CANDIDATES:
+        raise SystemExit("too many nodes: %d" % len(order))
+
+    candidates = bytearray()
+    nodes = bytearray()
+    for node in order:
+        if node.words:
+            offset = len(candidates)
+            candidates.append(len(node.words))
+            for suffix in node.words:
+                candidates.append(len(suffix))
+                candidates += suffix.encode('ascii')
+        else:
+            offset = NO_CANDIDATES
+        children = sorted(node.children.values(), key=lambda n: n.char)
+        nodes += struct.pack(
+            '<BBHHBB', ord(node.char) if node.char else 0, len(children),
+            children[0].index if children else 0, offset,
+            FLAG_WORD if node.is_word else 0, 0)
+    if len(candidates) >= NO_CANDIDATES:
+        raise SystemExit("candidate area too large: %d bytes" % len(candidates))
+
+    max_children = max(len(node.children) for node in order)
+    max_list = 1 + CANDIDATES * (1 + MAX_WORD)
+    header = b'RMJ1' + struct.pack('<HBB', len(order), max_children, max_list)
+    return header + bytes(nodes) + bytes(candidates)
+
+
+def main(argv):
+    words = read_words(SOURCE)
+    data = compile_dict(words)
+    nodes = struct.unpack_from('<H', data, 4)[0]
+    if '--check' in argv:
+        with open(OUTPUT, 'rb') as f:
+            ok = f.read() == data
+        print("%d words, %d nodes, %d bytes %s" % (len(words), nodes, len(data), "ok" if ok else "OUT OF DATE"))
+        return 0 if ok else 1
+    with open(OUTPUT, 'wb') as f:
+        f.write(data)
+    print("%d words, %d nodes, %d bytes -> %s" % (len(words), nodes, len(data), os.path.relpath(OUTPUT)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,222 @@
+# SPDX-FileCopyrightText: 2025 Takuya Urakawa (@hsgw 5z6p.com)
+# SPDX-License-Identifier: MIT
+
+"""
+入力トレースの再生
+
+実機の 'Trace' メニューで書き出した入力トレース (trace_recorder.py の形式) を
+ModeManager と実際のモードに、記録した時刻どおりに（仮想時計で）渡し、
+イベントごとに送信されたキーと処理時間を表示する
+誤入力の報告の再現や、実際の使い方でのプロファイルに使う
+
+- イベントを記録したモードと再生中のモードが違うとき（リングバッファが一周していたときなど）は
+  そのモードに切り替えて続ける（モードの状態はリセットされる）
+- 処理時間はホストCPUの処理時間に --cpu-scale を掛けたもの
+- --record <入力.trace> は host/traces の入力トレースで code.py を動かしながら記録し、
+  書き出したトレースを再生して、送信したキーが一致するかを確かめる
+
+使い方:
+    python3 host/replay_trace.py input_trace.txt [--cpu-scale N] [--set NAME=VALUE ...] [--summary]
+    python3 host/replay_trace.py --record host/traces/japanese.trace [--set NAME=VALUE ...]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+HOST_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.join(os.path.dirname(HOST_DIR), 'circuitpython')
+sys.path.insert(0, os.path.join(HOST_DIR, 'sim'))
+
+from hostsim import SIM, load_project, load_trace, run_code, use_sim_time, percentile  # noqa: E402
+
+# code.py と同じモードの登録 (モード名, モジュール名, クラス名)
+MODES = (
+    ("Basic", "modes.basic_mode", "BasicMode"),
+    ("Utility", "modes.utility_mode", "UtilityMode"),
+    ("Japanese", "modes.japanese_mode", "JapaneseMode"),
+    ("Snippets", "modes.snippet_mode", "SnippetMode"),
+    ("Trace", "modes.trace_mode", "TraceMode"),
+)
+
+
+def load_input_trace(path):
+    """
+    Returns:
+        list: [(時刻秒 (最初のイベントから), モード名, 種類, 値), ...]
+    """
+    events = []
+    with open(path) as f:
+        for line in f:
+            line = line.split('#', 1)[0].strip()
+            if not line:
+                continue
+            parts = line.split()
+            value = int(parts[3]) if len(parts) > 3 else 0
+            events.append((int(parts[0]), parts[1], parts[2], value))
+    if not events:
+        return []
+    start = events[0][0]
+    return [((t - start) / 1000000000, mode, kind, value) for t, mode, kind, value in events]
+
+
+class KeyDecoder:
+    """HIDレポートから押されたキーを文字（レイアウトにないキーは {CTRL+V} の形）にする"""
+
+    def __init__(self):
+        from adafruit_hid.keycode import Keycode
+        from keyboard_layout import get_layout
+        self.chars = {}
+        layout = get_layout()
+        for code in list(range(32, 127)) + [9, 10]:
+            key = layout.lookup(chr(code))
+            if key and key not in self.chars:
+                self.chars[key] = chr(code)
+        self.names = {}
+        for name in dir(Keycode):
+            value = getattr(Keycode, name)
+            if name.isupper() and isinstance(value, int) and value not in self.names:
+                self.names[value] = name
+        self.modifiers = [(Keycode.modifier_bit(code), self.names[code])
+                          for code in (Keycode.CONTROL, Keycode.SHIFT, Keycode.ALT, Keycode.GUI)]
+        self.held = set()
+
+    def decode(self, reports):
+        typed = []
+        for report in reports:
+            keys = set(k for k in report[2:] if k)
+            for keycode in sorted(keys - self.held):
+                char = self.chars.get((keycode, report[0]))
+                if char is None:
+                    names = [name for bit, name in self.modifiers if report[0] & bit]
+                    char = '{%s}' % '+'.join(names + [self.names.get(keycode, hex(keycode))])
+                typed.append(char)
+            self.held = keys
+        return ''.join(typed)
+
+
+def replay(events, config, cpu_scale=1.0):
+    """
+    Returns:
+        list: [(時刻秒, モード名, 種類, 値, 送信したキー, 処理時間[秒], 再生中のモード名), ...]
+    """
+    SIM.reset(cpu_scale=0)
+    use_sim_time()
+    try:
+        load_project(PROJECT_DIR, config)
+        from adafruit_hid.keyboard import Keyboard
+        import usb_hid
+        from mode_manager import ModeManager
+
+        manager = ModeManager(None, Keyboard(usb_hid.devices))
+        for name, module_name, class_name in MODES:
+            manager.register_mode(name, module_name, class_name)
+        decoder = KeyDecoder()
+        results = []
+        for t, mode, kind, value in events:
+            SIM.advance(t - SIM.clock())
+            # スニペットの送信などの続き
+            while manager.update():
+                SIM.advance(0.01)
+            replay_mode = manager.current_mode.name if manager.current_mode else None
+            if replay_mode != mode:
+                manager.set_mode(mode)
+            first = len(SIM.reports)
+            start = time.perf_counter()
+            manager.post(kind, value)
+            manager.dispatch()
+            elapsed = (time.perf_counter() - start) * cpu_scale
+            keys = decoder.decode([report for _, report, _, _ in SIM.reports[first:]])
+            results.append((t, mode, kind, value, keys, elapsed, replay_mode))
+        return results
+    finally:
+        use_sim_time(False)
+
+
+def record(input_trace, config):
+    """
+    host/traces の入力トレースで code.py を動かして入力トレースを記録する
+
+    Returns:
+        tuple: (書き出した入力トレースのパス, 送信したキー)
+    """
+    path = os.path.join(tempfile.mkdtemp(), 'input_trace.txt')
+    config = dict(config, TRACE_RECORDER_SIZE=4096, TRACE_RECORDER_PATH=path)
+    g = run_code(PROJECT_DIR, load_trace(input_trace), config, cpu_scale=0)
+    keys = KeyDecoder().decode([report for _, report, _, _ in SIM.reports])
+    g['mode_manager'].recorder.dump()
+    return path, keys
+
+
+def print_results(results, cpu_scale, summary):
+    if not summary:
+        print("%10s %-10s %-10s %5s %10s  %s" % ("time ms", "mode", "event", "value", "us", "keys"))
+        for t, mode, kind, value, keys, elapsed, replay_mode in results:
+            note = "" if replay_mode in (mode, None) else "  # was in %s" % replay_mode
+            print("%10.1f %-10s %-10s %5s %10.1f  %r%s" % (
+                t * 1000, mode, kind, value if kind == 'rotation' else '', elapsed * 1000000, keys, note))
+        print()
+    print("typed: %r" % ''.join(result[4] for result in results))
+    print("processing time per event (host CPU x %g)" % cpu_scale)
+    print("%-10s %-10s %6s %9s %9s %9s" % ("mode", "event", "n", "p50 us", "p99 us", "max us"))
+    groups = {}
+    for _, mode, kind, _, _, elapsed, _ in results:
+        groups.setdefault((mode, kind), []).append(elapsed * 1000000)
+    for (mode, kind), times in sorted(groups.items()):
+        print("%-10s %-10s %6d %9.1f %9.1f %9.1f" % (
+            mode, kind, len(times), percentile(times, 50), percentile(times, 99), max(times)))
+
+
+def main(argv):
+    cpu_scale = 1.0
+    config = {}
+    summary = False
+    input_trace = None
+    while argv[:1] and argv[0].startswith('--'):
+        if argv[0] == '--summary':
+            summary = True
+            argv = argv[1:]
+            continue
+        if argv[0] == '--cpu-scale':
+            cpu_scale = float(argv[1])
+        elif argv[0] == '--set':
+            name, _, value = argv[1].partition('=')
+            config[name] = eval(value)
+        elif argv[0] == '--record':
+            input_trace = argv[1]
+        else:
+            print(__doc__)
+            return 2
+        argv = argv[2:]
+    if not input_trace and not argv:
+        print(__doc__)
+        return 2
+
+    saved_stdout = sys.stdout
+    sys.stdout = open(os.devnull, 'w')
+    try:
+        if input_trace:
+            path, recorded_keys = record(input_trace, config)
+        else:
+            path = argv[0]
+        events = load_input_trace(path)
+        results = replay(events, config, cpu_scale)
+    finally:
+        sys.stdout.close()
+        sys.stdout = saved_stdout
+
+    print("trace: %s (%d events)" % (input_trace or path, len(events)))
+    print_results(results, cpu_scale, summary or bool(input_trace))
+    if input_trace:
+        replayed_keys = ''.join(result[4] for result in results)
+        if replayed_keys != recorded_keys:
+            print("error: replayed keys differ from the recording")
+            print("recorded: %r" % recorded_keys)
+            return 1
+        print("replay matches the recording (%d keys)" % len(recorded_keys))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
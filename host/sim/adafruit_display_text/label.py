@@ -0,0 +1,100 @@
+# SPDX-FileCopyrightText: 2025 Takuya Urakawa (@hsgw 5z6p.com)
+# SPDX-License-Identifier: MIT
+
+"""
+adafruit_display_text.label スタブ
+本物と同じく text / scale の代入ごとにレイアウトをやり直したものとして数える
+"""
+
+import displayio
+from hostsim import SIM
+
+
+class Label(displayio.Group):
+    """テキストラベル"""
+
+    def __init__(self, font, *, text="", color=0xFFFFFF, background_color=None,
+                 scale=1, anchor_point=None, anchored_position=None, **kwargs):
+        super().__init__(scale=1)
+        SIM.count('labels_created')
+        self.font = font
+        self._text = text
+        self._color = color
+        self.background_color = background_color
+        self._label_scale = scale
+        self._anchor_point = anchor_point or (0, 0)
+        self._anchored_position = anchored_position
+        self._layout()
+
+    def _layout(self):
+        SIM.count('label_layouts')
+        self._changed('label_writes')
+
+    @property
+    def bounding_box(self):
+        w, h = self.font.get_bounding_box()
+        return (0, 0, w * len(self._text), h)
+
+    def _regions(self, ox, oy, scale, regions):
+        if self._hidden:
+            return
+        w, h = self.bounding_box[2:]
+        w *= self._label_scale
+        h *= self._label_scale
+        if self._anchored_position is not None:
+            x0 = self._anchored_position[0] - self._anchor_point[0] * w
+            y0 = self._anchored_position[1] - self._anchor_point[1] * h
+        else:
+            # 本物の Label は y がテキストの縦の中央
+            x0 = self._x
+            y0 = self._y - h // 2
+        area = None
+        if w:
+            area = (ox + x0 * scale, oy + y0 * scale, ox + (x0 + w) * scale, oy + (y0 + h) * scale)
+        regions[id(self)] = (area, self._version)
+
+    @property
+    def text(self):
+        return self._text
+
+    @text.setter
+    def text(self, new_text):
+        SIM.count('label_text_sets')
+        self._text = new_text
+        self._layout()
+
+    @property
+    def color(self):
+        return self._color
+
+    @color.setter
+    def color(self, new_color):
+        self._color = new_color
+        self._changed('label_writes')
+
+    @property
+    def scale(self):
+        return self._label_scale
+
+    @scale.setter
+    def scale(self, new_scale):
+        self._label_scale = new_scale
+        self._layout()
+
+    @property
+    def anchor_point(self):
+        return self._anchor_point
+
+    @anchor_point.setter
+    def anchor_point(self, value):
+        self._anchor_point = value
+        self._changed('label_writes')
+
+    @property
+    def anchored_position(self):
+        return self._anchored_position
+
+    @anchored_position.setter
+    def anchored_position(self, value):
+        self._anchored_position = value
+        self._changed('label_writes')
@@ -0,0 +1,108 @@
+# SPDX-FileCopyrightText: 2025 Takuya Urakawa (@hsgw 5z6p.com)
+# SPDX-License-Identifier: MIT
+
+"""
+adafruit_displayio_sh1106 スタブ
+表示ツリーが変わるとフレームを転送したものとして I2C 時間を仮想時刻に加算する
+本物の displayio と同じく変わった範囲だけを転送する。SH1106 は8行ずつのページ単位で書くので、
+前のフレームから範囲か内容が変わった要素の前後の範囲にかかるページだけを送る
+（root_group を替えたときは全ページ）
+"""
+
+from hostsim import SIM
+
+
+class SH1106:
+    """128x64 SH1106 (I2C)"""
+
+    # False なら変更があるたびに全ページを送る（ページ単位の転送と比べる用）
+    page_refresh = True
+
+    def __init__(self, bus, *, width=128, height=64, colstart=0, rotation=0,
+                 auto_refresh=True, **kwargs):
+        self.bus = bus
+        self.width = width
+        self.height = height
+        self.colstart = colstart
+        self.rotation = rotation
+        self.auto_refresh = auto_refresh
+        self.brightness = 1.0
+        self._root = None
+        self._dirty = False
+        self._full = True  # 次のフレームは全ページを送る
+        self._regions = {}  # 前のフレームの各要素の範囲 (displayio._Node._regions)
+        self._next_frame = 0.0
+        SIM.display = self
+
+    # --- SIM から呼ばれる ---
+
+    def is_shown(self, node):
+        while node is not None:
+            if node is self._root:
+                return True
+            node = node._parent
+        return False
+
+    def mark_dirty(self):
+        self._dirty = True
+
+    def background(self, now):
+        """自動リフレッシュ（CircuitPython のバックグラウンド処理に相当, 60fps上限）"""
+        if self.auto_refresh and self._dirty and now >= self._next_frame:
+            self._next_frame = now + 1 / 60
+            self._push_frame()
+
+    def _dirty_pages(self):
+        """前のフレームから変わったページの集合"""
+        regions = {}
+        if self._root is not None:
+            self._root._regions(0, 0, 1, regions)
+        previous = self._regions
+        self._regions = regions
+        if self._full or not self.page_refresh:
+            self._full = False
+            return set(range(SIM.PAGES))
+        pages = set()
+        for key in set(previous) | set(regions):
+            old = previous.get(key, (None, None))
+            new = regions.get(key, (None, None))
+            if old == new:
+                continue
+            for area in (old[0], new[0]):
+                if area is None:
+                    continue
+                x0, y0, x1, y1 = area
+                if x1 <= 0 or x0 >= self.width:
+                    continue
+                top = max(0, int(y0)) // 8
+                bottom = min(self.height, int(y1 + 0.999)) - 1
+                pages.update(range(top, bottom // 8 + 1))
+        return pages
+
+    def _push_frame(self):
+        self._dirty = False
+        pages = self._dirty_pages()
+        if not pages:
+            return
+        SIM.count('frames')
+        SIM.count('i2c_pages', len(pages))
+        SIM.i2c_transfer(len(pages) * SIM.PAGE_BYTES, self.bus.i2c.frequency)
+        SIM.frame_times.append(SIM.clock())
+
+    # --- displayio.Display 互換 API ---
+
+    @property
+    def root_group(self):
+        return self._root
+
+    @root_group.setter
+    def root_group(self, group):
+        self._root = group
+        self._dirty = True
+        self._full = True
+        SIM.count('root_group_swaps')
+
+    def refresh(self, *, target_frames_per_second=None, minimum_frames_per_second=0):
+        if self._dirty:
+            self._push_frame()
+        return True
@@ -0,0 +1,28 @@
+# SPDX-FileCopyrightText: 2025 Takuya Urakawa (@hsgw 5z6p.com)
+# SPDX-License-Identifier: MIT
+
+"""
+alarm スタブ
+light_sleep_until_alarms() はアラームのピンにつながった入力（トレースの回転・スイッチ押下）まで
+仮想時刻を進める
+"""
+
+from hostsim import SIM
+from alarm import pin  # noqa: F401
+
+# 入力からライトスリープを抜けてコードが動き出すまでの時間（仮定, 秒）
+WAKE_TIME = 0.001
+
+wake_alarm = None
+
+
+def light_sleep_until_alarms(*alarms):
+    """アラームのどれかが起きるまで眠り、起こしたアラームを返す"""
+    global wake_alarm
+    by_kind = {}
+    for a in alarms:
+        by_kind.setdefault(SIM.pin_kinds.get(a.pin), a)
+    SIM.count('light_sleeps')
+    kind = SIM.sleep_until_input(by_kind, WAKE_TIME)
+    wake_alarm = by_kind[kind]
+    return wake_alarm
@@ -0,0 +1,18 @@
+# SPDX-FileCopyrightText: 2025 Takuya Urakawa (@hsgw 5z6p.com)
+# SPDX-License-Identifier: MIT
+
+"""alarm.pin スタブ"""
+
+from hostsim import SIM
+
+
+class PinAlarm:
+    """ピンの変化で起きるアラーム（本物と同じく使用中のピンには作れない）"""
+
+    def __init__(self, pin, value, edge=False, pull=False):
+        if pin in SIM.claimed_pins:
+            raise ValueError("%r in use" % pin)
+        self.pin = pin
+        self.value = value
+        self.edge = edge
+        self.pull = pull
@@ -0,0 +1,38 @@
+# SPDX-FileCopyrightText: 2025 Takuya Urakawa (@hsgw 5z6p.com)
+# SPDX-License-Identifier: MIT
+
+"""board スタブ (XIAO RP2040 のピン名)"""
+
+
+class Pin:
+    """ピン（名前だけを持つ）"""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return 'board.' + self.name
+
+
+D0 = Pin('D0')
+D1 = Pin('D1')
+D2 = Pin('D2')
+D3 = Pin('D3')
+D4 = SDA = Pin('D4')
+D5 = SCL = Pin('D5')
+D6 = TX = Pin('D6')
+D7 = RX = Pin('D7')
+D8 = SCK = Pin('D8')
+D9 = MISO = Pin('D9')
+D10 = MOSI = Pin('D10')
+
+_i2c = None
+
+
+def I2C():
+    """既定の I2C バス（CircuitPython と同じく 100kHz）"""
+    global _i2c
+    if _i2c is None:
+        import busio
+        _i2c = busio.I2C(SCL, SDA)
+    return _i2c
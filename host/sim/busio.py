@@ -0,0 +1,16 @@
+# SPDX-FileCopyrightText: 2025 Takuya Urakawa (@hsgw 5z6p.com)
+# SPDX-License-Identifier: MIT
+
+"""busio スタブ"""
+
+
+class I2C:
+    """I2C バス（転送時間の計算用にクロックだけを持つ）"""
+
+    def __init__(self, scl, sda, frequency=100000, timeout=255):
+        self.scl = scl
+        self.sda = sda
+        self.frequency = frequency
+
+    def deinit(self):
+        pass
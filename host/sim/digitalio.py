@@ -0,0 +1,40 @@
+# SPDX-FileCopyrightText: 2025 Takuya Urakawa (@hsgw 5z6p.com)
+# SPDX-License-Identifier: MIT
+
+"""digitalio スタブ（入力はトレースのスイッチ状態を返す）"""
+
+from hostsim import SIM
+
+
+class Direction:
+    INPUT = 'input'
+    OUTPUT = 'output'
+
+
+class Pull:
+    UP = 'up'
+    DOWN = 'down'
+
+
+class DigitalInOut:
+    """スイッチ入力。プルアップ前提で押下中は False"""
+
+    def __init__(self, pin):
+        self.pin = pin
+        self.direction = Direction.INPUT
+        self.pull = None
+        self._value = True
+        SIM.claim_pin(pin, 'switch')
+
+    @property
+    def value(self):
+        if self.direction == Direction.INPUT:
+            return not SIM.read_switch()
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        self._value = value
+
+    def deinit(self):
+        SIM.release_pin(self.pin)
@@ -0,0 +1,227 @@
+# SPDX-FileCopyrightText: 2025 Takuya Urakawa (@hsgw 5z6p.com)
+# SPDX-License-Identifier: MIT
+
+"""
+displayio スタブ
+描画はせず、表示ツリーへの書き込み回数を SIM.counters に数える
+表示中のツリーが変更されると接続中のディスプレイを dirty にする
+ディスプレイは各要素の画面上の範囲 (_regions) を前のフレームと比べて、変わった範囲だけを転送する
+"""
+
+from hostsim import SIM
+
+
+def release_displays():
+    SIM.display = None
+
+
+class _Node:
+    """表示ツリーの要素"""
+
+    def __init__(self, x=0, y=0):
+        self._parent = None
+        self._x = x
+        self._y = y
+        self._hidden = False
+        self._version = 0  # 内容を変えるたびに増やす（同じ範囲のまま中身が変わったのを見つける）
+
+    def _changed(self, counter):
+        SIM.count(counter)
+        self._version += 1
+        display = SIM.display
+        if display is not None and display.is_shown(self):
+            display.mark_dirty()
+            # CircuitPython はバイトコードの実行中にもバックグラウンド処理（自動リフレッシュ）を行う
+            display.background(SIM.clock())
+
+    @property
+    def x(self):
+        return self._x
+
+    @x.setter
+    def x(self, value):
+        self._x = value
+        self._changed('group_writes')
+
+    @property
+    def y(self):
+        return self._y
+
+    @y.setter
+    def y(self, value):
+        self._y = value
+        self._changed('group_writes')
+
+    @property
+    def hidden(self):
+        return self._hidden
+
+    @hidden.setter
+    def hidden(self, value):
+        self._hidden = value
+        self._changed('group_writes')
+
+    def _regions(self, ox, oy, scale, regions):
+        """
+        表示される範囲を regions に追加する
+
+        Args:
+            ox, oy: 親の原点の画面上の位置
+            scale: 親の倍率
+            regions: {id(要素): ((x0, y0, x1, y1) または None, 版)}
+        """
+        regions[id(self)] = (None, self._version)
+
+
+class Group(_Node):
+    """子要素のリストを持つグループ"""
+
+    def __init__(self, *, scale=1, x=0, y=0):
+        super().__init__(x, y)
+        self._group_scale = scale  # サブクラス (GlyphSlot など) の属性と重ならない名前にする
+        self._children = []
+
+    @property
+    def scale(self):
+        return self._group_scale
+
+    @scale.setter
+    def scale(self, value):
+        self._group_scale = value
+        self._changed('group_writes')
+
+    def append(self, layer):
+        self.insert(len(self._children), layer)
+
+    def insert(self, index, layer):
+        if layer._parent is not None:
+            raise ValueError("Layer already in a group")
+        self._children.insert(index, layer)
+        layer._parent = self
+        self._changed('group_mutations')
+
+    def remove(self, layer):
+        self._children.remove(layer)
+        layer._parent = None
+        self._changed('group_mutations')
+
+    def pop(self, index=-1):
+        layer = self._children.pop(index)
+        layer._parent = None
+        self._changed('group_mutations')
+        return layer
+
+    def _regions(self, ox, oy, scale, regions):
+        if self._hidden:
+            return
+        ox += self._x * scale
+        oy += self._y * scale
+        scale *= self._group_scale
+        for layer in self._children:
+            layer._regions(ox, oy, scale, regions)
+
+    def index(self, layer):
+        return self._children.index(layer)
+
+    def __len__(self):
+        return len(self._children)
+
+    def __getitem__(self, index):
+        return self._children[index]
+
+    def __contains__(self, layer):
+        return layer in self._children
+
+
+class Bitmap:
+    """値を1次元リストで保持するビットマップ"""
+
+    def __init__(self, width, height, value_count):
+        self.width = width
+        self.height = height
+        self.value_count = value_count
+        self._data = bytearray(width * height)
+        SIM.count('bitmap_allocs')
+
+    def _index(self, index):
+        if isinstance(index, tuple):
+            return index[0] + index[1] * self.width
+        return index
+
+    def __getitem__(self, index):
+        return self._data[self._index(index)]
+
+    def __setitem__(self, index, value):
+        self._data[self._index(index)] = value
+
+    def fill(self, value):
+        for i in range(len(self._data)):
+            self._data[i] = value
+
+
+class Palette:
+    def __init__(self, color_count):
+        self._colors = [0] * color_count
+        self._transparent = set()
+
+    def __len__(self):
+        return len(self._colors)
+
+    def __getitem__(self, index):
+        return self._colors[index]
+
+    def __setitem__(self, index, value):
+        self._colors[index] = value
+
+    def make_transparent(self, index):
+        self._transparent.add(index)
+
+    def make_opaque(self, index):
+        self._transparent.discard(index)
+
+
+class TileGrid(_Node):
+    """ビットマップのタイルを並べて表示する"""
+
+    def __init__(self, bitmap, *, pixel_shader, width=1, height=1,
+                 tile_width=None, tile_height=None, default_tile=0, x=0, y=0):
+        super().__init__(x, y)
+        self._bitmap = bitmap
+        self.pixel_shader = pixel_shader
+        self.width = width
+        self.height = height
+        self.tile_width = tile_width or bitmap.width
+        self.tile_height = tile_height or bitmap.height
+        self._tiles = [default_tile] * (width * height)
+
+    @property
+    def bitmap(self):
+        return self._bitmap
+
+    @bitmap.setter
+    def bitmap(self, new_bitmap):
+        if (new_bitmap.width != self._bitmap.width
+                or new_bitmap.height != self._bitmap.height):
+            raise ValueError("New bitmap must be same size as old bitmap")
+        self._bitmap = new_bitmap
+        self._changed('tilegrid_writes')
+
+    def __getitem__(self, index):
+        if isinstance(index, tuple):
+            index = index[0] + index[1] * self.width
+        return self._tiles[index]
+
+    def __setitem__(self, index, value):
+        if isinstance(index, tuple):
+            index = index[0] + index[1] * self.width
+        self._tiles[index] = value
+        self._changed('tilegrid_writes')
+
+    def _regions(self, ox, oy, scale, regions):
+        if self._hidden:
+            return
+        x0 = ox + self._x * scale
+        y0 = oy + self._y * scale
+        area = (x0, y0, x0 + self.width * self.tile_width * scale,
+                y0 + self.height * self.tile_height * scale)
+        regions[id(self)] = (area, self._version)
@@ -0,0 +1,407 @@
+# SPDX-FileCopyrightText: 2025 Takuya Urakawa (@hsgw 5z6p.com)
+# SPDX-License-Identifier: MIT
+
+"""
+ホスト実行用シミュレータ
+仮想時計・入力トレース・HIDレポート記録・表示カウンタをまとめて保持する
+board / rotaryio / usb_hid / displayio などのスタブはすべて SIM を参照する
+
+Linux の CPython と MicroPython unix port の両方で動くように
+標準ライブラリは sys と time だけを使う
+（asyncio版メインループを仮想時計で動かすのは CPython のみ）
+"""
+
+import sys
+import time as _real_time
+
+try:
+    _perf = _real_time.perf_counter
+except AttributeError:  # MicroPython
+    def _perf():
+        return _real_time.ticks_us() / 1000000
+
+
+class TraceEnd(Exception):
+    """トレースを最後まで再生した（メインループを抜けるための例外）"""
+
+
+def load_trace(path):
+    """
+    入力トレースを読み込む
+
+    書式 (1行1イベント, '#' 以降はコメント):
+        <時刻ms> enc <delta>   エンコーダ回転
+        <時刻ms> press         スイッチ押下
+        <時刻ms> release       スイッチ解放
+
+    Returns:
+        list: [(時刻秒, 種類, 値), ...] (時刻順)
+    """
+    events = []
+    with open(path) as f:
+        for line in f:
+            line = line.split('#', 1)[0].strip()
+            if not line:
+                continue
+            parts = line.split()
+            t = float(parts[0]) / 1000
+            kind = parts[1]
+            value = int(parts[2]) if len(parts) > 2 else 0
+            events.append((t, kind, value))
+    events.sort(key=lambda e: e[0])
+    return events
+
+
+class Simulator:
+    """仮想時計とスタブ間で共有する状態"""
+
+    # SH1106 1ページ分の転送: コマンド3バイト + データ128バイト (+ 制御バイト)
+    PAGE_BYTES = 3 + 128 + 2
+    PAGES = 8
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self, trace=(), cpu_scale=1.0, tail=1.0, hid_interval=0.008):
+        """
+        シミュレーションを初期化
+
+        Args:
+            trace: load_trace() の結果
+            cpu_scale: 実処理時間を仮想時間に換算する倍率 (0なら処理時間を無視)
+            tail: 最後のイベントから終了までの猶予（秒）
+            hid_interval: USB HID のポーリング間隔（秒）
+        """
+        self.trace = list(trace)
+        self.cpu_scale = cpu_scale
+        self.hid_interval = hid_interval
+        self.end_time = (self.trace[-1][0] if self.trace else 0) + tail
+
+        self._offset = 0.0
+        self._real0 = _perf()
+        self._next_event = 0
+
+        # 入力状態
+        self.encoder_count = 0
+        self.switch_pressed = False
+        self._pending_encoder = []
+        self._pending_switch = []
+        self.last_cause = None  # (時刻, 種類) 最後にコードが読んだ入力
+        self.pin_kinds = {}  # ピン -> 'enc' / 'switch' (rotaryio などのスタブが登録)
+        self.claimed_pins = set()  # 使用中のピン
+        self.sleep_time = 0.0  # ライトスリープしていた時間の合計（秒）
+
+        # 出力記録
+        self.reports = []  # (時刻, report bytes, 原因(時刻, 種類), モード名)
+        self._hid_free_at = 0.0
+        self.mode_probe = None
+
+        # 表示
+        self.display = None
+        self.counters = {}
+        self.frame_times = []  # フレームの転送が終わった時刻
+
+    # --- 時計 ---
+
+    def clock(self):
+        """仮想時刻（秒）。バックグラウンド処理は進めない"""
+        return self._offset + (_perf() - self._real0) * self.cpu_scale
+
+    def now(self):
+        """仮想時刻（秒）。呼ぶたびにバックグラウンド処理も進める"""
+        t = self.clock()
+        self._apply_inputs(t)
+        if self.display is not None:
+            self.display.background(t)
+        return t
+
+    def advance(self, seconds):
+        """仮想時刻を進める（ブロッキング処理の所要時間を加算する）"""
+        if seconds > 0:
+            self._offset += seconds
+
+    def sleep(self, seconds):
+        """time.sleep() の代わり。実際には待たずに仮想時刻だけ進める"""
+        self.advance(seconds)
+        if self.now() > self.end_time:
+            raise TraceEnd()
+
+    def stop(self):
+        """トレースの途中で実行を終える（次の sleep で TraceEnd）"""
+        self.end_time = self.now()
+
+    # --- 入力 ---
+
+    def _apply_inputs(self, t):
+        trace = self.trace
+        while self._next_event < len(trace) and trace[self._next_event][0] <= t:
+            event = trace[self._next_event]
+            self._next_event += 1
+            if event[1] == 'enc':
+                self.encoder_count += event[2]
+                self._pending_encoder.append(event)
+            elif event[1] == 'press':
+                self.switch_pressed = True
+                self._pending_switch.append(event)
+            elif event[1] == 'release':
+                self.switch_pressed = False
+                self._pending_switch.append(event)
+
+    def read_encoder(self):
+        """エンコーダのカウントを読む（読んだ時点でイベントを消費済みとする）"""
+        self.now()
+        if self._pending_encoder:
+            self.last_cause = (self._pending_encoder[-1][0], 'rotation')
+            self._pending_encoder = []
+        return self.encoder_count
+
+    def read_switch(self):
+        """スイッチの押下状態を読む"""
+        self.now()
+        if self._pending_switch:
+            self.last_cause = (self._pending_switch[-1][0], 'click')
+            self._pending_switch = []
+        return self.switch_pressed
+
+    def take_switch_events(self):
+        """
+        未処理のスイッチ操作を取り出す (keypad スタブ用)
+
+        Returns:
+            list: [(時刻秒, pressed), ...]
+        """
+        self.now()
+        events = [(t, kind == 'press') for t, kind, _ in self._pending_switch]
+        if events:
+            self.last_cause = (events[-1][0], 'click')
+            self._pending_switch = []
+        return events
+
+    def claim_pin(self, pin, kind):
+        """入力のスタブがピンを使い始めた"""
+        self.pin_kinds[pin] = kind
+        self.claimed_pins.add(pin)
+
+    def release_pin(self, pin):
+        """入力のスタブがピンを解放した (deinit)"""
+        self.claimed_pins.discard(pin)
+
+    def sleep_until_input(self, kinds, wake_time):
+        """
+        種類が kinds ('enc' / 'switch') の次の入力まで仮想時刻を進める (alarm スタブ用)
+        スイッチは押下でだけ起きる。入力がなければトレースの終わりまで眠って TraceEnd
+
+        Args:
+            kinds: 起きる入力の種類
+            wake_time: 入力から起きてコードが動き出すまでの時間（秒）
+
+        Returns:
+            str: 起こした入力の種類
+        """
+        start = self.now()
+        for t, kind, _ in self.trace[self._next_event:]:
+            kind = {'enc': 'enc', 'press': 'switch'}.get(kind)
+            if kind in kinds and t + wake_time <= self.end_time:
+                self.advance(max(0, t + wake_time - start))
+                self.sleep_time += self.clock() - start
+                self.now()
+                return kind
+        self.sleep_time += self.end_time - start
+        self.sleep(self.end_time - start + 0.001)
+
+    # --- HID ---
+
+    def hid_report(self, report):
+        """HIDレポートを記録する。ホストのポーリング間隔より速くは送れない"""
+        t = self.now()
+        if t < self._hid_free_at:
+            self.advance(self._hid_free_at - t)
+            t = self._hid_free_at
+        self._hid_free_at = t + self.hid_interval
+        mode = self.mode_probe() if self.mode_probe else None
+        self.reports.append((t, bytes(report), self.last_cause, mode))
+
+    # --- 表示 ---
+
+    def count(self, name, n=1):
+        """表示まわりのカウンタを加算"""
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def i2c_transfer(self, num_bytes, frequency):
+        """I2C転送の所要時間（1バイト9ビット）を仮想時刻に加算"""
+        self.count('i2c_bytes', num_bytes)
+        self.advance(num_bytes * 9 / frequency)
+
+
+SIM = Simulator()
+
+
+class _SimTime:
+    """time モジュールの代わり（仮想時計を返す）"""
+
+    def monotonic(self):
+        return SIM.now()
+
+    def monotonic_ns(self):
+        return int(SIM.now() * 1000000000)
+
+    def sleep(self, seconds):
+        SIM.sleep(seconds)
+
+    def __getattr__(self, name):
+        return getattr(_real_time, name)
+
+
+def use_sim_time(enable=True):
+    """
+    time モジュールを仮想時計に差し替える（run_code を通さずにモードを動かすツール用）
+    プロジェクトのモジュールは time を読み込んだときのものを使うので、load_project より前に呼ぶ
+
+    Args:
+        enable: False なら元の time モジュールに戻す
+    """
+    if enable:
+        sys.modules['time'] = _SimTime()
+    else:
+        sys.modules['time'] = _real_time
+
+
+def _sim_event_loop_policy():
+    """
+    asyncio を仮想時計で動かすイベントループポリシー (CPython のみ)
+    待ち時間は実際には待たず仮想時刻を進める
+    """
+    try:
+        import asyncio
+        import selectors
+    except ImportError:
+        return None
+
+    class SimSelector(selectors.DefaultSelector):
+        ended = False
+
+        def select(self, timeout=None):
+            if not self.ended:
+                if timeout is None or SIM.now() > SIM.end_time:
+                    self.ended = True
+                    raise TraceEnd()
+                SIM.advance(timeout)
+            return super().select(0)
+
+    class SimEventLoop(asyncio.SelectorEventLoop):
+        def time(self):
+            return SIM.now()
+
+    class SimPolicy(asyncio.DefaultEventLoopPolicy):
+        def new_event_loop(self):
+            return SimEventLoop(SimSelector())
+
+    return SimPolicy()
+
+
+def _project_modules(project_dir):
+    names = []
+    for name, module in list(sys.modules.items()):
+        path = getattr(module, '__file__', None) or ''
+        if path.startswith(project_dir):
+            names.append(name)
+    return names
+
+
+def load_project(project_dir, config=None):
+    """
+    circuitpython ディレクトリのモジュールを読み込み直して config を上書きする
+    (code.py を通さずにモードなどを直接動かすベンチマーク用)
+
+    Args:
+        project_dir: circuitpython ディレクトリの絶対パス
+        config: config モジュールの上書き {'INITIAL_MODE': 'Basic', ...}
+
+    Returns:
+        module: config モジュール
+    """
+    # 前回読み込んだプロジェクトのモジュールを破棄
+    for name in _project_modules(project_dir):
+        del sys.modules[name]
+    if project_dir not in sys.path:
+        sys.path.insert(0, project_dir)
+    import config as project_config
+    for key, value in (config or {}).items():
+        setattr(project_config, key, value)
+    return project_config
+
+
+def run_code(project_dir, trace, config=None, cpu_scale=1.0, tail=1.0, quiet=True, setup=None):
+    """
+    circuitpython/code.py をスタブ上でトレースが終わるまで実行する
+
+    Args:
+        project_dir: circuitpython ディレクトリの絶対パス
+        trace: load_trace() の結果
+        config: config モジュールの上書き {'INITIAL_MODE': 'Basic', ...}
+        cpu_scale: Simulator.reset() を参照
+        tail: Simulator.reset() を参照
+        quiet: print 出力を捨てる
+        setup: プロジェクトのモジュールを読み込んだあと code.py の実行前に呼ぶ関数
+
+    Returns:
+        dict: code.py のグローバル変数
+    """
+    # asyncio のインポートは仮想時刻に含めない
+    policy = _sim_event_loop_policy()
+    SIM.reset(trace, cpu_scale=cpu_scale, tail=tail)
+
+    saved_time = sys.modules.get('time')
+    saved_stdout = sys.stdout
+    if policy is not None:
+        import asyncio
+        saved_policy = asyncio.get_event_loop_policy()
+        asyncio.set_event_loop_policy(policy)
+    sys.modules['time'] = _SimTime()
+    g = {'__name__': '__main__'}
+    try:
+        load_project(project_dir, config)
+
+        def probe():
+            manager = g.get('mode_manager')
+            if manager is not None and manager.current_mode is not None:
+                return manager.current_mode.name
+            return None
+        SIM.mode_probe = probe
+        if setup:
+            setup()
+
+        with open(project_dir + '/code.py') as f:
+            source = f.read()
+        if quiet:
+            sys.stdout = _NullWriter()
+        try:
+            exec(source, g)
+        except TraceEnd:
+            pass
+    finally:
+        sys.stdout = saved_stdout
+        if policy is not None:
+            asyncio.set_event_loop_policy(saved_policy)
+        if saved_time is not None:
+            sys.modules['time'] = saved_time
+        else:
+            del sys.modules['time']
+    return g
+
+
+class _NullWriter:
+    def write(self, s):
+        return len(s)
+
+    def flush(self):
+        pass
+
+
+def percentile(values, p):
+    """最近傍法のパーセンタイル"""
+    if not values:
+        return None
+    values = sorted(values)
+    index = int(round(p / 100 * (len(values) - 1)))
+    return values[index]
@@ -0,0 +1,12 @@
+# SPDX-FileCopyrightText: 2025 Takuya Urakawa (@hsgw 5z6p.com)
+# SPDX-License-Identifier: MIT
+
+"""i2cdisplaybus スタブ"""
+
+
+class I2CDisplayBus:
+    """I2C 接続のディスプレイバス"""
+
+    def __init__(self, i2c_bus, *, device_address, reset=None):
+        self.i2c = i2c_bus
+        self.device_address = device_address
@@ -0,0 +1,84 @@
+# SPDX-FileCopyrightText: 2025 Takuya Urakawa (@hsgw 5z6p.com)
+# SPDX-License-Identifier: MIT
+
+"""
+keypad スタブ
+トレースのスイッチ操作をスキャン間隔ごとのイベントとしてキューに積む
+タイムスタンプは本物と同じく検出したスキャンの ticks_ms
+"""
+
+from hostsim import SIM
+
+_TICKS_MAX = (1 << 29) - 1
+
+
+class Event:
+    def __init__(self, key_number=0, pressed=True):
+        self.key_number = key_number
+        self.pressed = pressed
+        self.timestamp = 0
+
+    @property
+    def released(self):
+        return not self.pressed
+
+
+class EventQueue:
+    def __init__(self, interval):
+        self.interval = interval
+        self.overflowed = False
+        self._queue = []  # (検出時刻秒, pressed)
+
+    def _collect(self):
+        now = SIM.now()
+        for t, pressed in SIM.take_switch_events():
+            # 次のスキャンで検出される
+            scan = (int(t / self.interval) + 1) * self.interval
+            self._queue.append((scan, pressed))
+        return now
+
+    def _pop(self):
+        now = self._collect()
+        if self._queue and self._queue[0][0] <= now:
+            return self._queue.pop(0)
+        return None
+
+    def get(self):
+        item = self._pop()
+        if item is None:
+            return None
+        event = Event(0, item[1])
+        event.timestamp = int(item[0] * 1000) & _TICKS_MAX
+        return event
+
+    def get_into(self, event):
+        item = self._pop()
+        if item is None:
+            return False
+        event.key_number = 0
+        event.pressed = item[1]
+        event.timestamp = int(item[0] * 1000) & _TICKS_MAX
+        return True
+
+    def clear(self):
+        self._collect()
+        self._queue = []
+
+    def __len__(self):
+        now = self._collect()
+        return len([item for item in self._queue if item[0] <= now])
+
+
+class Keys:
+    """1つ以上のキー（ここではトレースのスイッチ1つ）"""
+
+    def __init__(self, pins, *, value_when_pressed, pull=True, interval=0.02, max_events=64):
+        self.pins = pins
+        self.key_count = len(pins)
+        self.events = EventQueue(interval)
+        for pin in pins:
+            SIM.claim_pin(pin, 'switch')
+
+    def deinit(self):
+        for pin in self.pins:
+            SIM.release_pin(pin)
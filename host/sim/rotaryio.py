@@ -0,0 +1,30 @@
+# SPDX-FileCopyrightText: 2025 Takuya Urakawa (@hsgw 5z6p.com)
+# SPDX-License-Identifier: MIT
+
+"""rotaryio スタブ（トレースの回転を返す）"""
+
+from hostsim import SIM
+
+
+class IncrementalEncoder:
+    """トレースに従って position が変化するエンコーダ"""
+
+    def __init__(self, pin_a, pin_b, divisor=4):
+        self.pin_a = pin_a
+        self.pin_b = pin_b
+        self.divisor = divisor
+        self._base = SIM.encoder_count
+        SIM.claim_pin(pin_a, 'enc')
+        SIM.claim_pin(pin_b, 'enc')
+
+    @property
+    def position(self):
+        return SIM.read_encoder() - self._base
+
+    @position.setter
+    def position(self, value):
+        self._base = SIM.read_encoder() - value
+
+    def deinit(self):
+        SIM.release_pin(self.pin_a)
+        SIM.release_pin(self.pin_b)
@@ -0,0 +1,12 @@
+# SPDX-FileCopyrightText: 2025 Takuya Urakawa (@hsgw 5z6p.com)
+# SPDX-License-Identifier: MIT
+
+"""supervisor スタブ（仮想時計の ticks_ms）"""
+
+from hostsim import SIM
+
+_TICKS_MAX = (1 << 29) - 1
+
+
+def ticks_ms():
+    return int(SIM.now() * 1000) & _TICKS_MAX
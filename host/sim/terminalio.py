@@ -0,0 +1,48 @@
+# SPDX-FileCopyrightText: 2025 Takuya Urakawa (@hsgw 5z6p.com)
+# SPDX-License-Identifier: MIT
+
+"""terminalio スタブ（6x12 の組み込みフォント）"""
+
+import displayio
+
+
+class Glyph:
+    def __init__(self, bitmap, tile_index, width, height, dx, dy, shift_x, shift_y):
+        self.bitmap = bitmap
+        self.tile_index = tile_index
+        self.width = width
+        self.height = height
+        self.dx = dx
+        self.dy = dy
+        self.shift_x = shift_x
+        self.shift_y = shift_y
+
+
+class BuiltinFont:
+    """ASCII 0x20-0x7E のグリフを横一列に並べたフォント"""
+
+    WIDTH = 6
+    HEIGHT = 12
+
+    def __init__(self):
+        count = 0x7F - 0x20
+        self.bitmap = displayio.Bitmap(self.WIDTH * count, self.HEIGHT, 2)
+        # 実フォントは持たないので文字コードから決まる模様で代用
+        for index in range(count):
+            code = index + 0x20
+            for y in range(1, self.HEIGHT - 2):
+                for x in range(self.WIDTH - 1):
+                    if (code >> ((x + y) % 7)) & 1:
+                        self.bitmap[index * self.WIDTH + x, y] = 1
+
+    def get_bounding_box(self):
+        return (self.WIDTH, self.HEIGHT)
+
+    def get_glyph(self, codepoint):
+        if codepoint < 0x20 or codepoint > 0x7E:
+            return None
+        return Glyph(self.bitmap, codepoint - 0x20, self.WIDTH, self.HEIGHT,
+                     0, 0, self.WIDTH, 0)
+
+
+FONT = BuiltinFont()
@@ -0,0 +1,26 @@
+# SPDX-FileCopyrightText: 2025 Takuya Urakawa (@hsgw 5z6p.com)
+# SPDX-License-Identifier: MIT
+
+"""usb_hid スタブ（送信したレポートを SIM に記録する）"""
+
+from hostsim import SIM
+
+
+class Device:
+    """HIDデバイス"""
+
+    def __init__(self, usage_page, usage, report_length):
+        self.usage_page = usage_page
+        self.usage = usage
+        self.report_length = report_length
+
+    def send_report(self, report, report_id=None):
+        if self.usage_page == 0x01 and self.usage == 0x06:
+            SIM.hid_report(report)
+
+
+Device.KEYBOARD = Device(0x01, 0x06, 8)
+Device.MOUSE = Device(0x01, 0x02, 4)
+Device.CONSUMER_CONTROL = Device(0x0C, 0x01, 2)
+
+devices = [Device.KEYBOARD, Device.MOUSE, Device.CONSUMER_CONTROL]